@@ -0,0 +1,65 @@
+"""
+Measure the CPU cost of HTTP trace logging with TRACE disabled and enabled.
+
+Compares the former eager f-string trace lines with the lazy helpers in src.http_client.trace
+on a large list response and a create payload.
+
+Usage:
+    uv run python benchmarks/trace_overhead.py [--size BYTES] [--iterations N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from src.http_client.client import HttpResponse
+from src.http_client.trace import trace_data, trace_response
+
+
+def build_response(size: int) -> HttpResponse:
+    models = []
+    while sum(len(json.dumps(m)) for m in models) < size:
+        models.append({"model_name": f"model-{len(models)}", "litellm_params": {"model": "openai/gpt-4", "api_base": "https://example.com"},
+                       "model_info": {"id": str(len(models)), "created_by": "benchmark"}})
+    return HttpResponse(200, {}, json.dumps({"data": models}).encode(), {}, "http://litellm/model/info")
+
+
+def eager(response: HttpResponse, payload: dict):
+    logger.trace(f"List models response: {response.status_code} - {response.text}")
+    logger.trace(f"Creating model with data: {json.dumps(payload, indent=2)}")
+
+
+def lazy(response: HttpResponse, payload: dict):
+    trace_response("List models", response)
+    trace_data("Creating model with data", payload)
+
+
+def measure(level: str, response: HttpResponse, payload: dict, iterations: int):
+    logger.remove()
+    logger.add(lambda _: None, level=level)
+    for name, fn in (("eager f-string", eager), ("lazy helper", lazy)):
+        seconds = timeit.timeit(lambda: fn(response, payload), number=iterations)
+        print(f"{level:<6} {name:<15} {seconds / iterations * 1e6:12.2f} us/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000, help="approximate response body size in bytes")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    response = build_response(args.size)
+    payload = json.loads(response.content)["data"][0]
+    print(f"Response body: {len(response.content)} bytes, {args.iterations} iterations")
+
+    measure("DEBUG", response, payload, args.iterations)
+    measure("TRACE", response, payload, max(1, args.iterations // 10))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,21 @@ from loguru import logger
 import kopf
 from src.kube.module import KubeModule
 from src.lock_manager import LockModule
+from src.http_client.breaker import CircuitBreaker
+from src.http_client.client import HttpClientModule, SessionRegistry
+from prometheus_client import start_http_server
 import os
 import importlib
 from src.logging_interceptor.handler import setup_logging
 
 setup_logging()
 
-injector = Injector([KubeModule(), LockModule()])
+injector = Injector([KubeModule(), LockModule(), HttpClientModule()])
 
 default_plugins = [
     "litellm_key",
     "litellm_model",
+    "litellm_model_set",
     "litellm_team",
     "n8n_admin_user",
     "n8n_api_key",
@@ -32,6 +36,10 @@ def startup_fn(settings: kopf.OperatorSettings, **kwargs):
     logger.info("Starting llm-operator...")
     logger.debug(f"Operator Settings: {settings}")
 
+    metrics_port = int(os.getenv("LLM_OPERATOR_METRICS_PORT", "8081"))
+    logger.info(f"Exposing metrics on port {metrics_port}")
+    start_http_server(metrics_port)
+
     plugins_env = os.getenv("LLM_OPERATOR_PLUGINS", "")
     if not plugins_env:
         plugins_env = ",".join(default_plugins)
@@ -51,6 +59,12 @@ def startup_fn(settings: kopf.OperatorSettings, **kwargs):
         except Exception as e:
             logger.error(f"Failed to load plugin '{plugin_name}': {e}")
 
+@kopf.on.cleanup()
+async def cleanup_fn(**kwargs):
+    logger.info("Closing pooled HTTP sessions...")
+    injector.get(CircuitBreaker).close()
+    await injector.get(SessionRegistry).close()
+
 if __name__ == "__main__":
     logger.error("Do not run this file directly, use `kopf run main.py` instead.")
     exit(1)
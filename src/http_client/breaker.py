@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from src.http_client.metrics import HTTP_CIRCUIT_REJECTED, HTTP_CIRCUIT_STATE
+
+
+class CircuitOpenException(Exception):
+    """Raised instead of sending a request to an upstream host whose circuit is open."""
+    pass
+
+
+class CircuitState:
+    """Circuit state constants, values are exported as the state gauge"""
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class HostBreaker:
+    """
+    Circuit breaker for a single upstream host.
+
+    Consecutive failures open the circuit. While open, requests are rejected and a single
+    background probe of the host's health endpoint runs every probe interval; the circuit is
+    half-open while that probe is in flight and closes again once it succeeds.
+    """
+
+    def __init__(self, host: str, failure_threshold: int, probe_interval: float):
+        self.host = host
+        self.failure_threshold = max(1, failure_threshold)
+        self.probe_interval = probe_interval
+        self.probe_path = "/"
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+        HTTP_CIRCUIT_STATE.labels(host=host).set(self.state)
+
+    def _set_state(self, state: int):
+        self.state = state
+        HTTP_CIRCUIT_STATE.labels(host=self.host).set(state)
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is due, used as retry delay by handlers."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.probe_interval - time.monotonic())
+
+    def check(self, what: str):
+        """Raise CircuitOpenException if requests to this host must not be sent."""
+        if self.state != CircuitState.CLOSED:
+            HTTP_CIRCUIT_REJECTED.labels(host=self.host).inc()
+            raise CircuitOpenException(f"Circuit for {self.host} is open, not sending {what}")
+
+    def record_success(self):
+        self.failures = 0
+
+    def record_failure(self, probe: Callable[["HostBreaker"], Awaitable[bool]]):
+        """Count a failed request and open the circuit once the threshold is reached."""
+        self.failures += 1
+        if self.state == CircuitState.CLOSED and self.failures >= self.failure_threshold:
+            logger.warning(f"Opening circuit for {self.host} after {self.failures} consecutive failures")
+            self._set_state(CircuitState.OPEN)
+            self.opened_at = time.monotonic()
+            self._probe_task = asyncio.create_task(self._probe_loop(probe))
+
+    async def _probe_loop(self, probe: Callable[["HostBreaker"], Awaitable[bool]]):
+        """Probe the host until it is healthy again, then close the circuit."""
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            self._set_state(CircuitState.HALF_OPEN)
+            try:
+                healthy = await probe(self)
+            except Exception as e:
+                logger.debug(f"Health probe of {self.host}{self.probe_path} failed: {e}")
+                healthy = False
+
+            if healthy:
+                logger.info(f"Health probe of {self.host} succeeded, closing circuit")
+                self.failures = 0
+                self.opened_at = None
+                self._set_state(CircuitState.CLOSED)
+                return
+
+            self.opened_at = time.monotonic()
+            self._set_state(CircuitState.OPEN)
+
+    def cancel(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+
+
+class CircuitBreaker:
+    """
+    Registry of per-host circuit breakers consulted by the shared HTTP client.
+
+    Environment Variables:
+    - HTTP_BREAKER_FAILURES: Consecutive failed requests that open a host's circuit (default: 5)
+    - HTTP_BREAKER_PROBE_INTERVAL: Seconds between health probes of an open circuit (default: 10)
+    """
+
+    def __init__(self):
+        self.failure_threshold = int(os.getenv("HTTP_BREAKER_FAILURES", "5"))
+        self.probe_interval = float(os.getenv("HTTP_BREAKER_PROBE_INTERVAL", "10"))
+
+        self._breakers: Dict[str, HostBreaker] = {}
+
+        logger.info(f"CircuitBreaker initialized with failure_threshold={self.failure_threshold}, probe_interval={self.probe_interval}")
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the scheme://host:port part of a URL, used as breaker key."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def for_host(self, url: str) -> HostBreaker:
+        """Get or create the breaker for the host of the given URL."""
+        host = self.host_key(url)
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = HostBreaker(host, self.failure_threshold, self.probe_interval)
+            self._breakers[host] = breaker
+        return breaker
+
+    def is_closed(self, url: str) -> bool:
+        """Whether requests to the host of the given URL are currently let through."""
+        return self.for_host(url).state == CircuitState.CLOSED
+
+    def close(self):
+        """Stop all background probes."""
+        for breaker in self._breakers.values():
+            breaker.cancel()
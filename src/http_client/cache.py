@@ -0,0 +1,67 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from loguru import logger
+
+from src.http_client.metrics import HTTP_CACHE_EVICTIONS, HTTP_CACHE_HITS, HTTP_CACHE_MISSES
+
+
+class ResponseCache:
+    """
+    Bounded TTL cache of upstream list responses, keyed by (host, path and query, auth identity).
+
+    Entries are evicted least recently used first once the cache is full. Any write the operator sends
+    to a host drops all of that host's entries, so a manager always sees its own changes.
+
+    Environment Variables:
+    - HTTP_CACHE_TTL: Seconds a cached list response stays valid, 0 disables the cache (default: 30)
+    - HTTP_CACHE_MAXSIZE: Maximum number of cached responses (default: 256)
+    """
+
+    def __init__(self):
+        self.ttl = float(os.getenv("HTTP_CACHE_TTL", "30"))
+        self.maxsize = int(os.getenv("HTTP_CACHE_MAXSIZE", "256"))
+
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+
+        logger.info(f"ResponseCache initialized with ttl={self.ttl}, maxsize={self.maxsize}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, host: str, target: str, identity: str) -> Optional[Any]:
+        """Return the cached response, or None if missing or expired."""
+        if not self.enabled:
+            return None
+
+        key = (host, target, identity)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            HTTP_CACHE_MISSES.labels(host=host).inc()
+            return None
+
+        self._entries.move_to_end(key)
+        HTTP_CACHE_HITS.labels(host=host).inc()
+        return entry[1]
+
+    def put(self, host: str, target: str, identity: str, response: Any):
+        """Store a response, evicting the least recently used entries beyond maxsize."""
+        if not self.enabled:
+            return
+
+        key = (host, target, identity)
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            (evicted_host, _, _), _ = self._entries.popitem(last=False)
+            HTTP_CACHE_EVICTIONS.labels(host=evicted_host).inc()
+
+    def invalidate(self, host: str):
+        """Drop all cached responses of a host."""
+        for key in [key for key in self._entries if key[0] == host]:
+            del self._entries[key]
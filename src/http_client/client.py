@@ -0,0 +1,442 @@
+import asyncio
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+from urllib.parse import urlencode, urlsplit
+
+import aiohttp
+from injector import Module, provider, singleton, inject
+from loguru import logger
+
+from src.http_client.breaker import CircuitBreaker, HostBreaker
+from src.http_client.cache import ResponseCache
+from src.http_client.deadline import Deadline
+from src.http_client.jsonstream import JsonArrayScanner, JsonStreamException
+from src.http_client.limiter import RateLimiter
+from src.http_client.metrics import HTTP_POOL_HITS, HTTP_POOL_MISSES
+from src.http_client.retry import RetryPolicy
+from src.http_client.singleflight import SingleFlight, auth_identity
+
+
+class HttpClientException(Exception):
+    """Raised when an upstream request fails at the transport level (connection error, timeout)."""
+    pass
+
+
+class HttpResponse:
+    """Fully buffered upstream response exposing the subset of the `requests.Response` API the managers use."""
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes, cookies: Dict[str, str], url: str,
+                 matches: Optional[List[Any]] = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.cookies = cookies
+        self.url = url
+        # Array elements found by HttpClient.search_json; the body itself is not kept in that case
+        self.matches = matches
+        self._json = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """Parsed JSON body; parsed once and shared by every caller of a coalesced request, so treat it as read-only."""
+        if self._json is None:
+            self._json = json.loads(self.content)
+        return self._json
+
+
+class SessionRegistry:
+    """
+    Host-keyed registry of pooled, keep-alive aiohttp sessions shared by all managers.
+
+    Sessions are bound to the operator's event loop and created lazily on first use.
+
+    Environment Variables:
+    - HTTP_POOL_MAXSIZE: Maximum concurrent connections per upstream host (default: 20)
+    - HTTP_KEEPALIVE: Keep idle connections open for reuse (default: true)
+    - HTTP_KEEPALIVE_TIMEOUT: Seconds an idle connection is kept in the pool (default: 60)
+    - HTTP_DEFAULT_TIMEOUT: Total timeout in seconds for requests without an explicit timeout (default: 30)
+    """
+
+    def __init__(self):
+        self.pool_maxsize = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+        self.keepalive = os.getenv("HTTP_KEEPALIVE", "true").lower() == "true"
+        self.keepalive_timeout = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+        self.default_timeout = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
+
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+        logger.info(f"SessionRegistry initialized with pool_maxsize={self.pool_maxsize}, keepalive={self.keepalive}")
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the scheme://host:port part of a URL, used as pool key."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create a session with its own keep-alive connection pool."""
+        if self.keepalive:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, keepalive_timeout=self.keepalive_timeout)
+        else:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, force_close=True)
+        # Sessions are shared across CRs and credentials, so never persist cookies (e.g. n8n-auth) between requests
+        return aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=self.default_timeout),
+        )
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """Get or create the pooled session for the host of the given URL."""
+        host = self.host_key(url)
+        session = self._sessions.get(host)
+        if session is not None and not session.closed:
+            HTTP_POOL_HITS.labels(host=host).inc()
+            return session
+
+        HTTP_POOL_MISSES.labels(host=host).inc()
+        logger.debug(f"Creating pooled HTTP session for {host}")
+        session = self._new_session()
+        self._sessions[host] = session
+        return session
+
+    async def close(self):
+        """Close all pooled sessions."""
+        sessions, self._sessions = self._sessions, {}
+        for host, session in sessions.items():
+            logger.debug(f"Closing pooled HTTP session for {host}")
+            await session.close()
+
+
+@singleton
+class HttpClient:
+    """
+    Async replacement for module-level `requests` calls that routes through the pooled sessions.
+
+    Environment Variables:
+    - HTTP_STREAM_LOOKUPS: Let managers find single entries in large list responses by streaming the body
+      with search_json instead of parsing it whole (default: false)
+    """
+
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    @inject
+    def __init__(self, registry: SessionRegistry, limiter: RateLimiter, breaker: CircuitBreaker,
+                 retry_policy: RetryPolicy, single_flight: SingleFlight, cache: ResponseCache):
+        self.registry = registry
+        self.limiter = limiter
+        self.breaker = breaker
+        self.retry_policy = retry_policy
+        self.single_flight = single_flight
+        self.cache = cache
+        self.stream_lookups = os.getenv("HTTP_STREAM_LOOKUPS", "false").lower() == "true"
+
+    def with_probe(self, probe_path: str) -> "ProbedHttpClient":
+        """Return a view of this client whose hosts are health-probed on probe_path while their circuit is open."""
+        return ProbedHttpClient(self, probe_path)
+
+    def available(self, url: str) -> bool:
+        """Whether the circuit for the host of the given URL is closed."""
+        return self.breaker.is_closed(url)
+
+    async def _probe(self, host_breaker: HostBreaker) -> bool:
+        """Health probe used by an open circuit; any non-5xx answer counts as healthy."""
+        url = f"{host_breaker.host}{host_breaker.probe_path}"
+        session = self.registry.get_session(url)
+        async with self.limiter.for_host(url).slot():
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.registry.default_timeout)) as response:
+                return response.status < 500
+
+    async def request(self, method: str, url: str, timeout: Optional[float] = None,
+                      deadline: Optional[Deadline] = None, probe_path: Optional[str] = None, cached: bool = False,
+                      **kwargs) -> HttpResponse:
+        """
+        Send a request through the circuit breaker, rate limiter and pooled session of the URL's host.
+
+        Concurrent identical GETs share one round-trip and one response object, as do cached GETs,
+        so callers must not mutate parsed results. Idempotent methods are retried on transient failures according to the RetryPolicy.
+
+        Args:
+            method: HTTP method
+            url: Absolute upstream URL
+            timeout: Per-call timeout in seconds (default: HTTP_DEFAULT_TIMEOUT)
+            deadline: Reconcile deadline; the call gets at most its remaining budget
+            probe_path: Health endpoint to probe for this host while its circuit is open
+            cached: Serve this GET from the response cache; meant for list endpoints, invalidated by any write to the host
+            **kwargs: Passed through to aiohttp (headers, json, params, ...)
+
+        Raises:
+            CircuitOpenException: If the host's circuit is open
+            DeadlineExceededException: If the deadline runs out while queueing or waiting
+            HttpClientException: On connection errors and timeouts
+        """
+        host_breaker = self.breaker.for_host(url)
+        if probe_path is not None:
+            host_breaker.probe_path = probe_path
+
+        if method.upper() != "GET" or "json" in kwargs or "data" in kwargs:
+            self.single_flight.invalidate(host_breaker.host)
+            self.cache.invalidate(host_breaker.host)
+            return await self._request(host_breaker, method, url, timeout, deadline, **kwargs)
+
+        identity = auth_identity(kwargs.get("headers"))
+        parts = urlsplit(url)
+        target = f"{parts.path}?{parts.query}&{urlencode(sorted((kwargs.get('params') or {}).items()))}"
+        if cached:
+            response = self.cache.get(host_breaker.host, target, identity)
+            if response is not None:
+                return response
+
+        generation = self.single_flight.generation(host_breaker.host)
+        try:
+            response = await self.single_flight.do(
+                host_breaker.host, target, identity,
+                lambda: self._request(host_breaker, method, url, timeout, deadline, **kwargs),
+                max_wait=deadline.remaining() if deadline is not None else None,
+            )
+        except asyncio.TimeoutError as e:
+            if deadline is None:
+                raise
+            raise deadline.exceeded(f"waiting for shared {method} {url}") from e
+
+        # A write sent while the read was in flight may not be reflected in it
+        if cached and response.status_code == 200 and generation == self.single_flight.generation(host_breaker.host):
+            self.cache.put(host_breaker.host, target, identity, response)
+        return response
+
+    async def _request(self, host_breaker: HostBreaker, method: str, url: str, timeout: Optional[float],
+                       deadline: Optional[Deadline], **kwargs) -> HttpResponse:
+        """request() without coalescing."""
+        if not self.retry_policy.should_retry(method):
+            return await self._send(host_breaker, method, url, timeout, deadline, **kwargs)
+
+        async for attempt in self.retry_policy.retrying(host_breaker.host, HttpClientException, deadline):
+            with attempt:
+                response = await self._send(host_breaker, method, url, timeout, deadline, **kwargs)
+            if not attempt.retry_state.outcome.failed:
+                attempt.retry_state.set_result(response)
+        return response
+
+    async def search_json(self, url: str, array_key: Optional[str], predicate: Callable[[Any], bool], limit: int = 1,
+                          timeout: Optional[float] = None, deadline: Optional[Deadline] = None,
+                          probe_path: Optional[str] = None, **kwargs) -> HttpResponse:
+        """
+        GET a JSON list and return the first matching elements without parsing the whole body.
+
+        The body is decoded incrementally one array element at a time and the download stops as soon
+        as `limit` elements matched. Such lookups bypass the response cache and request coalescing.
+
+        Args:
+            url: Absolute upstream URL
+            array_key: Key of the list in the top-level object, or None if the body is a list
+            predicate: Called with each element, returns whether it matches
+            limit: Stop after this many matches
+            timeout: Per-call timeout in seconds (default: HTTP_DEFAULT_TIMEOUT)
+            deadline: Reconcile deadline; the call gets at most its remaining budget
+            probe_path: Health endpoint to probe for this host while its circuit is open
+            **kwargs: Passed through to aiohttp (headers, params, ...)
+
+        Returns:
+            HttpResponse whose `matches` holds the found elements on 200; other statuses carry the body as usual
+        """
+        host_breaker = self.breaker.for_host(url)
+        if probe_path is not None:
+            host_breaker.probe_path = probe_path
+
+        async def search(stream: aiohttp.StreamReader) -> List[Any]:
+            scanner = JsonArrayScanner(array_key)
+            matches = []
+            async for chunk in stream.iter_chunked(self.STREAM_CHUNK_SIZE):
+                for item in scanner.feed(chunk):
+                    if predicate(item):
+                        matches.append(item)
+                        if len(matches) >= limit:
+                            return matches
+                if scanner.done:
+                    return matches
+            scanner.close()
+            return matches
+
+        return await self._send(host_breaker, "GET", url, timeout, deadline, search=search, **kwargs)
+
+    async def stream_json_lines(self, method: str, url: str, on_item: Callable[[Any], Awaitable[None]],
+                                idle_timeout: Optional[float] = None, probe_path: Optional[str] = None,
+                                **kwargs) -> HttpResponse:
+        """
+        Send a request whose response is a stream of JSON lines and hand each line to on_item as it arrives.
+
+        Meant for long-running upstream operations reporting their progress, such as Ollama pulls. The request
+        has no total timeout unless one is given; idle_timeout aborts it when no data arrives for that long.
+        It is neither retried nor coalesced.
+
+        Args:
+            method: HTTP method
+            url: Absolute upstream URL
+            on_item: Awaited with each decoded line
+            idle_timeout: Maximum seconds between two reads
+            probe_path: Health endpoint to probe for this host while its circuit is open
+            **kwargs: Passed through to _send (timeout, deadline) and aiohttp (headers, json, params, ...)
+
+        Returns:
+            HttpResponse whose `matches` holds the last line on 200; other statuses carry the body as usual
+        """
+        host_breaker = self.breaker.for_host(url)
+        if probe_path is not None:
+            host_breaker.probe_path = probe_path
+        self.single_flight.invalidate(host_breaker.host)
+        self.cache.invalidate(host_breaker.host)
+
+        async def consume(stream: aiohttp.StreamReader) -> List[Any]:
+            last = []
+            async for line in stream:
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError as e:
+                    raise JsonStreamException(f"invalid JSON line: {e}") from e
+                await on_item(item)
+                last = [item]
+            return last
+
+        kwargs.setdefault("timeout", None)
+        kwargs.setdefault("deadline", None)
+        return await self._send(host_breaker, method, url, search=consume, idle_timeout=idle_timeout, **kwargs)
+
+    async def _send(self, host_breaker: HostBreaker, method: str, url: str, timeout: Optional[float],
+                    deadline: Optional[Deadline], search: Optional[Callable[[aiohttp.StreamReader], Awaitable[List[Any]]]] = None,
+                    idle_timeout: Optional[float] = None, **kwargs) -> HttpResponse:
+        """Single attempt of request(), or of search_json() and stream_json_lines() if a search is given."""
+        host_breaker.check(f"{method} {url}")
+
+        host_limiter = self.limiter.for_host(url)
+        try:
+            await host_limiter.acquire(max_wait=deadline.remaining() if deadline is not None else None)
+        except asyncio.TimeoutError as e:
+            raise deadline.exceeded(f"queueing {method} {url}") from e
+
+        try:
+            session = self.registry.get_session(url)
+            if timeout is None and idle_timeout is None:
+                timeout = self.registry.default_timeout
+            if deadline is not None:
+                timeout = deadline.timeout(f"{method} {url}", cap=timeout)
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout, sock_read=idle_timeout)
+
+            async with session.request(method, url, **kwargs) as response:
+                if search is not None and response.status == 200:
+                    content, matches = b"", await search(response.content)
+                else:
+                    content, matches = await response.read(), None
+                result = HttpResponse(
+                    status_code=response.status,
+                    headers=response.headers.copy(),
+                    content=content,
+                    cookies={name: morsel.value for name, morsel in response.cookies.items()},
+                    url=url,
+                    matches=matches,
+                )
+        except asyncio.TimeoutError as e:
+            if deadline is not None and deadline.expired:
+                raise deadline.exceeded(f"{method} {url}") from e
+            host_breaker.record_failure(self._probe)
+            raise HttpClientException(f"{method} {url} timed out") from e
+        except aiohttp.ClientError as e:
+            host_breaker.record_failure(self._probe)
+            raise HttpClientException(f"{method} {url} failed: {e}") from e
+        except JsonStreamException as e:
+            raise HttpClientException(f"{method} {url} returned an unreadable list: {e}") from e
+        finally:
+            host_limiter.release()
+
+        if result.status_code >= 500:
+            host_breaker.record_failure(self._probe)
+        else:
+            host_breaker.record_success()
+        return result
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+
+class ProbedHttpClient:
+    """HttpClient view that registers a manager's health endpoint as circuit breaker probe for the hosts it calls."""
+
+    def __init__(self, client: HttpClient, probe_path: str):
+        self.client = client
+        self.probe_path = probe_path
+
+    @property
+    def stream_lookups(self) -> bool:
+        return self.client.stream_lookups
+
+    def available(self, url: str) -> bool:
+        return self.client.available(url)
+
+    async def search_json(self, url: str, array_key: Optional[str], predicate: Callable[[Any], bool], **kwargs) -> HttpResponse:
+        return await self.client.search_json(url, array_key, predicate, probe_path=self.probe_path, **kwargs)
+
+    async def stream_json_lines(self, method: str, url: str, on_item: Callable[[Any], Awaitable[None]], **kwargs) -> HttpResponse:
+        return await self.client.stream_json_lines(method, url, on_item, probe_path=self.probe_path, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs) -> HttpResponse:
+        return await self.client.request(method, url, probe_path=self.probe_path, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+
+class HttpClientModule(Module):
+    """Dependency injection module for the shared HTTP client's session registry and request policies."""
+
+    @provider
+    @singleton
+    def provide_session_registry(self) -> SessionRegistry:
+        """Provide a singleton SessionRegistry instance."""
+        return SessionRegistry()
+
+    @provider
+    @singleton
+    def provide_rate_limiter(self) -> RateLimiter:
+        """Provide a singleton RateLimiter instance."""
+        return RateLimiter()
+
+    @provider
+    @singleton
+    def provide_circuit_breaker(self) -> CircuitBreaker:
+        """Provide a singleton CircuitBreaker instance."""
+        return CircuitBreaker()
+
+    @provider
+    @singleton
+    def provide_retry_policy(self) -> RetryPolicy:
+        """Provide a singleton RetryPolicy instance."""
+        return RetryPolicy()
+
+    @provider
+    @singleton
+    def provide_single_flight(self) -> SingleFlight:
+        """Provide a singleton SingleFlight instance."""
+        return SingleFlight()
+
+    @provider
+    @singleton
+    def provide_response_cache(self) -> ResponseCache:
+        """Provide a singleton ResponseCache instance."""
+        return ResponseCache()
@@ -0,0 +1,56 @@
+import os
+import time
+from typing import Optional
+
+from src.http_client.metrics import HTTP_DEADLINE_EXCEEDED
+
+
+class DeadlineExceededException(Exception):
+    """Raised when a reconcile's deadline budget is spent before an upstream call completes."""
+    pass
+
+
+class Deadline:
+    """
+    Time budget for a single reconcile, created at handler entry and passed down to every upstream call.
+
+    Environment Variables:
+    - LLM_OPERATOR_DEADLINE: Default budget in seconds for one handler run (default: 60)
+    - <PLUGIN>_DEADLINE: Per-plugin budget, e.g. LITELLM_MODEL_DEADLINE or OLLAMA_MODEL_DEADLINE
+    """
+
+    def __init__(self, budget: float, plugin: str = "default"):
+        self.budget = budget
+        self.plugin = plugin
+        self.expires_at = time.monotonic() + budget
+
+    @classmethod
+    def for_plugin(cls, plugin: str, default: Optional[float] = None) -> "Deadline":
+        """Create a deadline using the configured budget of the given plugin.
+
+        The plugin's own env var wins, then the plugin's code default, then LLM_OPERATOR_DEADLINE.
+        """
+        budget = os.getenv(f"{plugin.upper()}_DEADLINE")
+        if budget is None:
+            budget = default if default is not None else os.getenv("LLM_OPERATOR_DEADLINE", "60")
+        return cls(float(budget), plugin)
+
+    def remaining(self) -> float:
+        """Seconds left in the budget, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def exceeded(self, what: str) -> DeadlineExceededException:
+        """Count a deadline overrun and build the exception to raise for it."""
+        HTTP_DEADLINE_EXCEEDED.labels(plugin=self.plugin).inc()
+        return DeadlineExceededException(f"Deadline of {self.budget}s for {self.plugin} exceeded during {what}")
+
+    def timeout(self, what: str, cap: Optional[float] = None) -> float:
+        """Remaining budget to use as a request timeout, optionally capped by a per-call timeout."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded(what)
+        return min(remaining, cap) if cap is not None else remaining
@@ -0,0 +1,131 @@
+import codecs
+import json
+from typing import Any, Iterator, Optional
+
+
+class JsonStreamException(Exception):
+    """Raised when a streamed JSON body ends before the searched array is complete."""
+    pass
+
+
+class JsonArrayScanner:
+    """
+    Incremental parser yielding the elements of one JSON array from a body fed in chunks.
+
+    Only the array elements are decoded, one at a time; everything else in the body is skipped
+    without being materialized.
+
+    Args:
+        array_key: Key of the array in the top-level object, or None if the body itself is an array
+    """
+
+    def __init__(self, array_key: Optional[str] = None):
+        self.array_key = array_key
+        self.done = False
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+
+        # State used while looking for the array in the top-level object
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._expect_key = False
+        self._last_key: Optional[str] = None
+        self._after_colon = False
+
+    def feed(self, chunk: bytes) -> Iterator[Any]:
+        """Consume a chunk of the body and yield every array element completed by it."""
+        if self.done:
+            return
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(chunk)
+        self._pos = 0
+        if not self._in_array:
+            self._find_array()
+        if self._in_array:
+            yield from self._items()
+
+    def close(self):
+        """Signal the end of the body."""
+        if not self.done:
+            raise JsonStreamException(f"Body ended before the '{self.array_key}' array was complete")
+
+    def _find_array(self):
+        buf = self._buffer
+        i = self._pos
+        while i < len(buf):
+            c = buf[i]
+            i += 1
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._last_key = json.loads(buf[self._string_start:i])
+                        self._expect_key = False
+                continue
+            if c.isspace():
+                continue
+
+            after_colon, self._after_colon = self._after_colon, False
+            if c == '"':
+                self._in_string = True
+                self._string_start = i - 1
+            elif c in "{[":
+                if c == "[" and ((self.array_key is None and self._depth == 0)
+                                 or (self._depth == 1 and after_colon and self._last_key == self.array_key)):
+                    self._in_array = True
+                    self._pos = i
+                    return
+                self._depth += 1
+                self._expect_key = self._depth == 1 and c == "{"
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    # Top-level value finished without containing the array
+                    self.done = True
+                    return
+            elif self._depth == 1 and c == ":":
+                self._after_colon = True
+            elif self._depth == 1 and c == ",":
+                self._expect_key = True
+
+        if self._in_string:
+            # Rescan the unfinished string once the rest of it has arrived
+            self._pos = self._string_start
+            self._in_string = False
+            self._escaped = False
+        else:
+            self._pos = len(buf)
+
+    def _items(self) -> Iterator[Any]:
+        buf = self._buffer
+        while True:
+            while self._pos < len(buf) and (buf[self._pos].isspace() or buf[self._pos] == ","):
+                self._pos += 1
+            if self._pos >= len(buf):
+                return
+            if buf[self._pos] == "]":
+                self.done = True
+                return
+            try:
+                item, end = self._json.raw_decode(buf, self._pos)
+            except json.JSONDecodeError:
+                return
+            if buf[self._pos] not in '{["':
+                # A bare number or literal is only complete once the delimiter after it arrived,
+                # "2." may still continue as "2.5" in the next chunk
+                delimiter = end
+                while delimiter < len(buf) and buf[delimiter].isspace():
+                    delimiter += 1
+                if delimiter >= len(buf) or buf[delimiter] not in ",]":
+                    return
+            self._pos = end
+            yield item
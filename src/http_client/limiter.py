@@ -0,0 +1,151 @@
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from src.http_client.metrics import HTTP_IN_FLIGHT, HTTP_QUEUE_WAIT
+
+
+class HostLimiter:
+    """
+    Token bucket plus in-flight cap for a single upstream host.
+
+    The bucket is thread-safe so the same limiter serves the async HTTP managers and the
+    synchronous Uptime Kuma managers running in kopf's executor threads.
+    """
+
+    def __init__(self, host: str, rate: float, burst: int, max_in_flight: int):
+        self.host = host
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_in_flight = max(1, max_in_flight)
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._bucket_lock = threading.Lock()
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._sync_semaphore = threading.BoundedSemaphore(self.max_in_flight)
+
+    def _reserve(self) -> float:
+        """Take a token from the bucket and return how long the caller has to wait for it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def _refund(self):
+        """Give back a token that was reserved but not used."""
+        if self.rate <= 0:
+            return
+        with self._bucket_lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    async def acquire(self, max_wait: Optional[float] = None):
+        """
+        Wait for a free in-flight slot and a rate token.
+
+        Raises:
+            asyncio.TimeoutError: If both could not be obtained within max_wait seconds
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        started = time.monotonic()
+        await asyncio.wait_for(self._semaphore.acquire(), max_wait)
+        try:
+            wait = self._reserve()
+            if max_wait is not None and time.monotonic() - started + wait > max_wait:
+                self._refund()
+                raise asyncio.TimeoutError()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        HTTP_QUEUE_WAIT.labels(host=self.host).observe(time.monotonic() - started)
+        HTTP_IN_FLIGHT.labels(host=self.host).inc()
+
+    def release(self):
+        """Free the in-flight slot taken by acquire()."""
+        HTTP_IN_FLIGHT.labels(host=self.host).dec()
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self, max_wait: Optional[float] = None):
+        """Async context manager holding one in-flight slot for the duration of a request."""
+        await self.acquire(max_wait)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def slot_sync(self):
+        """Blocking variant of slot() for synchronous clients."""
+        started = time.monotonic()
+        self._sync_semaphore.acquire()
+        try:
+            wait = self._reserve()
+            if wait > 0:
+                time.sleep(wait)
+        except BaseException:
+            self._sync_semaphore.release()
+            raise
+
+        HTTP_QUEUE_WAIT.labels(host=self.host).observe(time.monotonic() - started)
+        HTTP_IN_FLIGHT.labels(host=self.host).inc()
+        try:
+            yield
+        finally:
+            HTTP_IN_FLIGHT.labels(host=self.host).dec()
+            self._sync_semaphore.release()
+
+
+class RateLimiter:
+    """
+    Registry of per-host limiters shared by every manager talking to an upstream.
+
+    Environment Variables:
+    - HTTP_RATE_LIMIT: Sustained requests per second per upstream host, 0 disables (default: 10)
+    - HTTP_RATE_BURST: Requests allowed in a burst before the rate applies (default: 20)
+    - HTTP_MAX_IN_FLIGHT: Maximum concurrent requests per upstream host (default: 10)
+    """
+
+    def __init__(self):
+        self.rate = float(os.getenv("HTTP_RATE_LIMIT", "10"))
+        self.burst = int(os.getenv("HTTP_RATE_BURST", "20"))
+        self.max_in_flight = int(os.getenv("HTTP_MAX_IN_FLIGHT", "10"))
+
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._limiters_lock = threading.Lock()
+
+        logger.info(f"RateLimiter initialized with rate={self.rate}/s, burst={self.burst}, max_in_flight={self.max_in_flight}")
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the scheme://host:port part of a URL, used as limiter key."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def for_host(self, url: str) -> HostLimiter:
+        """Get or create the limiter for the host of the given URL."""
+        host = self.host_key(url)
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = HostLimiter(host, self.rate, self.burst, self.max_in_flight)
+                self._limiters[host] = limiter
+            return limiter
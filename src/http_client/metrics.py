@@ -0,0 +1,78 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+HTTP_POOL_HITS = Counter(
+    "llm_operator_http_pool_hits_total",
+    "Upstream requests served by an already pooled session.",
+    ["host"],
+)
+HTTP_POOL_MISSES = Counter(
+    "llm_operator_http_pool_misses_total",
+    "Upstream requests that had to create a new pooled session.",
+    ["host"],
+)
+HTTP_DEADLINE_EXCEEDED = Counter(
+    "llm_operator_deadline_exceeded_total",
+    "Reconciles whose deadline budget ran out before an upstream call could complete.",
+    ["plugin"],
+)
+HTTP_QUEUE_WAIT = Histogram(
+    "llm_operator_http_queue_wait_seconds",
+    "Time upstream requests spent waiting for the per-host rate limiter.",
+    ["host"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "llm_operator_http_in_flight",
+    "Upstream requests currently in flight.",
+    ["host"],
+)
+HTTP_CIRCUIT_STATE = Gauge(
+    "llm_operator_circuit_state",
+    "Circuit breaker state per upstream host (0 closed, 1 open, 2 half-open).",
+    ["host"],
+)
+HTTP_CIRCUIT_REJECTED = Counter(
+    "llm_operator_circuit_rejected_total",
+    "Upstream requests rejected because the host's circuit was open.",
+    ["host"],
+)
+HTTP_RETRIES = Counter(
+    "llm_operator_http_retries_total",
+    "Idempotent upstream requests retried after a transient failure.",
+    ["host"],
+)
+HTTP_FLIGHTS = Counter(
+    "llm_operator_http_flights_total",
+    "Coalescable upstream GETs that were actually sent.",
+    ["host"],
+)
+HTTP_COALESCED = Counter(
+    "llm_operator_http_coalesced_total",
+    "Upstream GETs served by joining an identical request already in flight.",
+    ["host"],
+)
+HTTP_COALESCING_RATIO = Gauge(
+    "llm_operator_http_coalescing_ratio",
+    "Share of coalescable upstream GETs that joined an in-flight request.",
+    ["host"],
+)
+HTTP_CACHE_HITS = Counter(
+    "llm_operator_http_cache_hits_total",
+    "Upstream list GETs answered from the response cache.",
+    ["host"],
+)
+HTTP_CACHE_MISSES = Counter(
+    "llm_operator_http_cache_misses_total",
+    "Upstream list GETs not found in the response cache or expired.",
+    ["host"],
+)
+HTTP_CACHE_EVICTIONS = Counter(
+    "llm_operator_http_cache_evictions_total",
+    "Response cache entries evicted because the cache was full.",
+    ["host"],
+)
+RECONCILE_STEP_SECONDS = Histogram(
+    "llm_operator_reconcile_step_seconds",
+    "Duration of the individual steps of a reconcile pipeline.",
+    ["plugin", "step"],
+)
@@ -0,0 +1,104 @@
+import os
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from loguru import logger
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from src.http_client.deadline import Deadline
+from src.http_client.metrics import HTTP_RETRIES
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Parse a Retry-After header given either as delta-seconds or as HTTP date."""
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retry policy for idempotent upstream calls: exponential backoff with jitter, capped, honoring Retry-After.
+
+    Transport errors and 429/502/503/504 responses are retried. Once attempts are exhausted the last
+    response is returned (or the last error raised) so managers handle it exactly as before.
+
+    Environment Variables:
+    - HTTP_RETRY_ATTEMPTS: Total attempts per idempotent call, 1 disables retries (default: 3)
+    - HTTP_RETRY_INITIAL_WAIT: First backoff in seconds before jitter (default: 0.2)
+    - HTTP_RETRY_MAX_WAIT: Cap for a single backoff, including Retry-After, in seconds (default: 10)
+    - HTTP_RETRY_JITTER: Maximum random jitter added to each backoff in seconds (default: 0.2)
+    """
+
+    def __init__(self):
+        self.attempts = int(os.getenv("HTTP_RETRY_ATTEMPTS", "3"))
+        self.initial_wait = float(os.getenv("HTTP_RETRY_INITIAL_WAIT", "0.2"))
+        self.max_wait = float(os.getenv("HTTP_RETRY_MAX_WAIT", "10"))
+        self.jitter = float(os.getenv("HTTP_RETRY_JITTER", "0.2"))
+
+        self._backoff = wait_exponential_jitter(initial=self.initial_wait, max=self.max_wait, jitter=self.jitter)
+
+        logger.info(f"RetryPolicy initialized with attempts={self.attempts}, max_wait={self.max_wait}")
+
+    def should_retry(self, method: str) -> bool:
+        return self.attempts > 1 and method.upper() in IDEMPOTENT_METHODS
+
+    def _wait(self, retry_state: RetryCallState) -> float:
+        """Backoff for the next attempt; a Retry-After header on the last response takes precedence when longer."""
+        wait = self._backoff(retry_state)
+        outcome = retry_state.outcome
+        if outcome is not None and not outcome.failed:
+            retry_after = retry_after_seconds(outcome.result().headers)
+            if retry_after is not None:
+                wait = max(wait, retry_after)
+        return min(wait, self.max_wait)
+
+    def retrying(self, host: str, retry_on: type, deadline: Optional[Deadline] = None) -> AsyncRetrying:
+        """
+        Build the tenacity controller for one call.
+
+        Args:
+            host: Upstream host, used as metric label
+            retry_on: Exception type that marks a transient transport failure
+            deadline: Reconcile deadline; no retry is scheduled that would sleep past it
+        """
+        stop = stop_after_attempt(self.attempts)
+
+        def stop_at_deadline(retry_state: RetryCallState) -> bool:
+            if stop(retry_state):
+                return True
+            return deadline is not None and retry_state.upcoming_sleep >= deadline.remaining()
+
+        def before_sleep(retry_state: RetryCallState):
+            HTTP_RETRIES.labels(host=host).inc()
+            outcome = retry_state.outcome
+            reason = outcome.exception() if outcome.failed else f"status {outcome.result().status_code}"
+            logger.warning(f"Retrying request to {host} in {retry_state.upcoming_sleep:.2f}s "
+                           f"(attempt {retry_state.attempt_number}/{self.attempts}): {reason}")
+
+        return AsyncRetrying(
+            retry=retry_if_exception_type(retry_on) | retry_if_result(lambda r: r.status_code in RETRYABLE_STATUS_CODES),
+            wait=self._wait,
+            stop=stop_at_deadline,
+            before_sleep=before_sleep,
+            retry_error_callback=lambda retry_state: retry_state.outcome.result(),
+        )
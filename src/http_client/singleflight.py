@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import os
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from src.http_client.metrics import HTTP_COALESCED, HTTP_COALESCING_RATIO, HTTP_FLIGHTS
+
+
+def auth_identity(headers: Optional[Mapping[str, str]]) -> str:
+    """Digest of the credentials sent with a request, so callers with different keys never share a response."""
+    if not headers:
+        return ""
+    parts = [f"{name.lower()}={value}" for name, value in headers.items() if name.lower() in ("authorization", "cookie")]
+    if not parts:
+        return ""
+    return hashlib.sha256("\n".join(sorted(parts)).encode()).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical GETs into one upstream round-trip.
+
+    Requests are keyed by (host, path and query, auth identity). Any write to a host bumps that host's
+    generation, so a GET issued after a write never joins a read that started before it.
+
+    Environment Variables:
+    - HTTP_COALESCE: Share in-flight identical GETs between callers (default: true)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("HTTP_COALESCE", "true").lower() == "true"
+
+        self._flights: Dict[Tuple, asyncio.Task] = {}
+        self._generations: Dict[str, int] = {}
+        self._counts: Dict[str, Tuple[int, int]] = {}
+
+        logger.info(f"SingleFlight initialized with enabled={self.enabled}")
+
+    def invalidate(self, host: str):
+        """Mark that a write was sent to the host, so later reads start a new flight."""
+        self._generations[host] = self._generations.get(host, 0) + 1
+
+    def generation(self, host: str) -> int:
+        """Number of writes sent to the host so far."""
+        return self._generations.get(host, 0)
+
+    def _observe(self, host: str, joined: bool):
+        flights, coalesced = self._counts.get(host, (0, 0))
+        if joined:
+            coalesced += 1
+            HTTP_COALESCED.labels(host=host).inc()
+        else:
+            flights += 1
+            HTTP_FLIGHTS.labels(host=host).inc()
+        self._counts[host] = (flights, coalesced)
+        HTTP_COALESCING_RATIO.labels(host=host).set(coalesced / (flights + coalesced))
+
+    async def do(self, host: str, target: str, identity: str, fn: Callable[[], Awaitable[Any]],
+                 max_wait: Optional[float] = None) -> Any:
+        """
+        Run fn, or join the identical call already in flight.
+
+        The upstream call runs as its own task so a cancelled or timed-out caller does not abort it for others.
+
+        Args:
+            host: Upstream host
+            target: Path and query of the request
+            identity: Auth identity from auth_identity()
+            fn: Coroutine function performing the request
+            max_wait: Longest time this caller waits for the shared result
+
+        Raises:
+            asyncio.TimeoutError: If the result is not available within max_wait
+        """
+        if not self.enabled:
+            return await asyncio.wait_for(fn(), max_wait)
+
+        key = (host, target, identity, self.generation(host))
+        task = self._flights.get(key)
+        self._observe(host, joined=task is not None)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+
+            def done(finished: asyncio.Task):
+                if self._flights.get(key) is finished:
+                    del self._flights[key]
+                if not finished.cancelled():
+                    # Mark the error as retrieved even if every caller already gave up waiting
+                    finished.exception()
+
+            task.add_done_callback(done)
+        return await asyncio.wait_for(asyncio.shield(task), max_wait)
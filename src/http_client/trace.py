@@ -0,0 +1,52 @@
+import json
+import os
+from typing import Any
+
+from loguru import logger
+
+# Cap on the number of body bytes / serialized characters written per trace line
+HTTP_TRACE_MAX_BYTES = int(os.getenv("HTTP_TRACE_MAX_BYTES", "2048"))
+
+# Bound once so a disabled trace call costs a level check, not a fresh opt() logger per call
+_lazy_logger = logger.opt(lazy=True, depth=1)
+
+
+def _truncate(text: str, size: int) -> str:
+    if size <= HTTP_TRACE_MAX_BYTES:
+        return text
+    return f"{text}... ({size} bytes total)"
+
+
+def _body_preview(response) -> str:
+    if response.matches is not None:
+        return f"<streamed, {len(response.matches)} matches>"
+    content = response.content
+    return _truncate(content[:HTTP_TRACE_MAX_BYTES].decode("utf-8", errors="replace"), len(content))
+
+
+def _data_preview(data: Any) -> str:
+    try:
+        text = json.dumps(data, indent=2, default=str)
+    except (TypeError, ValueError):
+        text = repr(data)
+    return _truncate(text[:HTTP_TRACE_MAX_BYTES], len(text))
+
+
+def trace_response(what: str, response):
+    """
+    Log an upstream response at TRACE level as `<what> response: <status> - <body>`.
+
+    The body is only decoded, capped at HTTP_TRACE_MAX_BYTES, when TRACE is enabled.
+    """
+    _lazy_logger.trace(
+        "{} response: {} - {}", lambda: what, lambda: response.status_code, lambda: _body_preview(response)
+    )
+
+
+def trace_data(what: str, data: Any):
+    """
+    Log a payload at TRACE level as `<what>: <indented JSON>`.
+
+    The payload is only serialized, capped at HTTP_TRACE_MAX_BYTES, when TRACE is enabled.
+    """
+    _lazy_logger.trace("{}: {}", lambda: what, lambda: _data_preview(data))
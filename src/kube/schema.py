@@ -0,0 +1,29 @@
+import json
+
+from kubernetes import client, utils
+from loguru import logger
+
+
+class SchemaUpdate:
+    """
+    Mixin for CRDs whose schema changes between operator versions.
+
+    kubecrd's install returns on 409 and leaves an existing CRD alone, so the API server would keep pruning
+    fields added since that CRD was installed. With this mixin an existing CRD gets the current schema in place.
+    """
+
+    @classmethod
+    def install(cls, k8s_client, exist_ok=True):
+        try:
+            super().install(k8s_client, exist_ok=False)
+        except utils.FailToCreateError as e:
+            code = json.loads(e.api_exceptions[0].body).get("code")
+            if code != 409 or not exist_ok:
+                raise
+
+            crd = cls.crd_schema_dict()
+            api = client.ApiextensionsV1Api(k8s_client)
+            existing = api.read_custom_resource_definition(crd["metadata"]["name"])
+            existing.spec.versions = crd["spec"]["versions"]
+            api.replace_custom_resource_definition(crd["metadata"]["name"], existing)
+            logger.info(f"Updated schema of existing CRD {crd['metadata']['name']}")
@@ -0,0 +1,27 @@
+from src.kube.schema import SchemaUpdate
+
+# Status fields written by the ReconcileScheduler
+RECONCILE_STATUS_SCHEMA = {
+    "reconcile_interval": {"type": "number", "description": "Current effective reconcile interval in seconds."},
+    "in_sync": {"type": "boolean", "description": "Whether the last reconcile found the resource in sync."},
+    "last_reconcile": {"type": "string", "description": "Time of the last reconcile."},
+}
+
+
+class ReconcileStatus(SchemaUpdate):
+    """
+    Mixin for CRDs whose periodic reconcile records its state in .status.
+
+    kubecrd only generates a spec schema, so anything written to .status would be pruned. Through SchemaUpdate
+    the status schema also reaches clusters that installed an older version of the CRD. CRDs with status
+    fields of their own list their schemas in __status_fields__.
+    """
+
+    __status_fields__ = {}
+
+    @classmethod
+    def crd_schema_dict(cls):
+        crd = super().crd_schema_dict()
+        properties = crd["spec"]["versions"][0]["schema"]["openAPIV3Schema"]["properties"]
+        properties["status"] = {"type": "object", "properties": {**RECONCILE_STATUS_SCHEMA, **cls.__status_fields__}}
+        return crd
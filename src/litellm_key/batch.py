@@ -0,0 +1,67 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.http_client.deadline import Deadline
+
+# Sends one batch: (litellm_host, litellm_api_key, aliases, deadline) -> error message per alias, None on success
+SendBatch = Callable[[str, str, List[str], Optional[Deadline]], Awaitable[Dict[str, Optional[str]]]]
+
+
+class KeyDeleteBatcher:
+    """
+    Collects key deletions submitted within a short window into one /key/delete request per host and credential.
+
+    Every submitter waits for and receives the result for its own alias.
+    """
+
+    def __init__(self, send: SendBatch, window: float, max_size: int):
+        self.send = send
+        self.window = window
+        self.max_size = max(1, max_size)
+
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, asyncio.Future, Optional[Deadline]]]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+
+    async def submit(self, litellm_host: str, litellm_api_key: str, key_alias: str, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """Queue the deletion of a key and return its error message, None if it was deleted."""
+        if self.window <= 0:
+            return (await self.send(litellm_host, litellm_api_key, [key_alias], deadline)).get(key_alias)
+
+        loop = asyncio.get_running_loop()
+        batch_key = (litellm_host, litellm_api_key)
+        future = loop.create_future()
+        batch = self._pending.setdefault(batch_key, [])
+        batch.append((key_alias, future, deadline))
+
+        if len(batch) >= self.max_size:
+            self._flush(batch_key)
+        elif batch_key not in self._timers:
+            self._timers[batch_key] = loop.call_later(self.window, self._flush, batch_key)
+        return await future
+
+    def _flush(self, batch_key: Tuple[str, str]):
+        timer = self._timers.pop(batch_key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(batch_key, [])
+        if batch:
+            asyncio.get_running_loop().create_task(self._send(batch_key, batch))
+
+    async def _send(self, batch_key: Tuple[str, str], batch: List[Tuple[str, asyncio.Future, Optional[Deadline]]]):
+        litellm_host, litellm_api_key = batch_key
+        aliases = list(dict.fromkeys(alias for alias, _, _ in batch))
+        # The batch may run as long as its most patient submitter allows
+        deadlines = [deadline for _, _, deadline in batch]
+        deadline = None if None in deadlines else max(deadlines, key=lambda d: d.remaining())
+        logger.debug(f"Deleting {len(aliases)} keys on {litellm_host} in one batch")
+        try:
+            results = await self.send(litellm_host, litellm_api_key, aliases, deadline)
+            for alias, future, _ in batch:
+                if not future.done():
+                    future.set_result(results.get(alias))
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
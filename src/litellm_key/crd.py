@@ -1,8 +1,11 @@
 import kubecrd
 from dataclasses import dataclass, field
+from typing import Dict, List
+
+from src.kube.schema import SchemaUpdate
 
 @dataclass
-class LiteLLMKey(kubecrd.KubeResourceBase):
+class LiteLLMKey(SchemaUpdate, kubecrd.KubeResourceBase):
     __group__ = 'ops.veitosiander.de'
     __version__ = 'v1'
 
@@ -14,3 +17,7 @@ class LiteLLMKey(kubecrd.KubeResourceBase):
     user_id: str
     team_id: str = field(default="", metadata={"description": "The ID of the team this key belongs to."})
     key_value: str = field(default="", metadata={"description": "The actual API key value."})
+    models: List[str] = field(default_factory=list, metadata={"description": "Models the key may access, empty for all models."})
+    key_metadata: Dict[str, str] = field(default_factory=dict, metadata={"description": "Metadata stored on the key."})
+    rotation: str = field(default="", metadata={"description": "Change this value to revoke the key and generate a new one."})
+    applied_rotation: str = field(default="", metadata={"description": "Value of rotation when the current key was generated."})
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from injector import singleton, inject
+from loguru import logger
+
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.singleflight import auth_identity
+
+
+class LiteLLMKeyIndexException(Exception):
+    pass
+
+
+class HostKeys:
+    """All keys of one LiteLLM proxy, indexed by hashed token and alias."""
+
+    def __init__(self):
+        self.fetched_at = time.monotonic()
+        self.by_token: Dict[str, Dict[str, Any]] = {}
+        self.by_alias: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self):
+        return len(self.by_token)
+
+    def add(self, key: Dict[str, Any]):
+        """Insert a key, or merge changed fields into the key with the same token."""
+        token = key.get("token")
+        if token is None:
+            return
+        previous = self.remove(token)
+        key = {**previous, **key} if previous else dict(key)
+        self.by_token[token] = key
+        if key.get("key_alias"):
+            self.by_alias[key["key_alias"]] = key
+
+    def remove(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.by_token.pop(token, None)
+        if key is None:
+            return None
+        if key.get("key_alias") and self.by_alias.get(key["key_alias"]) is key:
+            del self.by_alias[key["key_alias"]]
+        return key
+
+
+@singleton
+class KeyIndex:
+    """
+    Per-host index of LiteLLM keys by alias, shared by LiteLLMKey and LiteLLMTeam reconciles.
+
+    Keys generated, updated or deleted through the operator are applied to the index in place, so those
+    writes never force a new walk. /key/list is only walked to pick up keys changed outside the operator,
+    page by page with the pages after the first fetched concurrently, at most once per TTL for each
+    (host, credential).
+
+    Environment Variables:
+    - LITELLM_KEY_INDEX_TTL: Seconds an index is reused before it is walked again, 0 disables the index (default: 300)
+    - LITELLM_KEY_INDEX_PAGE_SIZE: Keys requested per /key/list page (default: 100)
+    - LITELLM_KEY_INDEX_CONCURRENCY: Pages fetched concurrently during a walk (default: 5)
+    """
+
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health/liveness")
+        self.ttl = float(os.getenv("LITELLM_KEY_INDEX_TTL", "300"))
+        self.page_size = int(os.getenv("LITELLM_KEY_INDEX_PAGE_SIZE", "100"))
+        self.concurrency = int(os.getenv("LITELLM_KEY_INDEX_CONCURRENCY", "5"))
+
+        self._indexes: Dict[Tuple[str, str], HostKeys] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def _key(litellm_host: str, litellm_api_key: str) -> Tuple[str, str]:
+        return litellm_host.rstrip("/"), auth_identity({"Authorization": f"Bearer {litellm_api_key}"})
+
+    async def _page(self, litellm_host: str, litellm_api_key: str, page: int, deadline: Optional[Deadline]) -> Dict[str, Any]:
+        response = await self.http.get(
+            url=f"{litellm_host}/key/list",
+            params={"return_full_object": "true", "include_team_keys": "true", "page": page, "size": self.page_size},
+            headers={"Authorization": f"Bearer {litellm_api_key}"},
+            deadline=deadline
+        )
+        if response.status_code != 200:
+            raise LiteLLMKeyIndexException(f"Failed to list keys on {litellm_host}: {response.status_code} - {response.text}")
+        return response.json()
+
+    async def _walk(self, litellm_host: str, litellm_api_key: str, deadline: Optional[Deadline]) -> HostKeys:
+        first = await self._page(litellm_host, litellm_api_key, 1, deadline)
+        pages = [first]
+        total_pages = int(first.get("total_pages") or 1)
+        if total_pages > 1:
+            semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+            async def fetch(page: int):
+                async with semaphore:
+                    return await self._page(litellm_host, litellm_api_key, page, deadline)
+
+            pages += await asyncio.gather(*[fetch(page) for page in range(2, total_pages + 1)])
+
+        index = HostKeys()
+        for page in pages:
+            for key in page.get("keys", []):
+                if isinstance(key, dict):
+                    index.add(key)
+        logger.debug(f"Indexed {len(index)} LiteLLM keys of {litellm_host} from {total_pages} pages")
+        return index
+
+    async def snapshot(self, litellm_host: str, litellm_api_key: str, deadline: Optional[Deadline] = None) -> HostKeys:
+        """Return the key index of a host, walking /key/list if it expired."""
+        key = self._key(litellm_host, litellm_api_key)
+        index = self._indexes.get(key)
+        if index is not None and time.monotonic() - index.fetched_at < self.ttl:
+            return index
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            index = self._indexes.get(key)
+            if index is not None and time.monotonic() - index.fetched_at < self.ttl:
+                return index
+            index = await self._walk(litellm_host, litellm_api_key, deadline)
+            self._indexes[key] = index
+            return index
+
+    async def get_by_alias(self, litellm_host: str, litellm_api_key: str, key_alias: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        return (await self.snapshot(litellm_host, litellm_api_key, deadline=deadline)).by_alias.get(key_alias)
+
+    def record(self, litellm_host: str, key: Dict[str, Any]):
+        """Apply a generated or updated key to every loaded index of the host; the secret value is never stored."""
+        key = {k: v for k, v in key.items() if k != "key"}
+        key.setdefault("token", key.get("token_id"))
+        for index_key in [k for k in self._indexes if k[0] == litellm_host.rstrip("/")]:
+            if key["token"] is None:
+                # Without the hashed token the key cannot be placed, walk the host again on the next lookup
+                del self._indexes[index_key]
+            else:
+                self._indexes[index_key].add(key)
+
+    def forget(self, litellm_host: str, key_alias: str):
+        """Drop a deleted key from every loaded index of the host."""
+        for (host, _), index in self._indexes.items():
+            if host == litellm_host.rstrip("/") and key_alias in index.by_alias:
+                index.remove(index.by_alias[key_alias]["token"])
@@ -1,44 +1,104 @@
-from injector import singleton
+import asyncio
+from injector import singleton, inject
 from loguru import logger
-import requests
 import os
+from typing import Any, Dict, List, Optional
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_response
+from src.litellm_key.batch import KeyDeleteBatcher
+from src.litellm_key.index import KeyIndex
 
 
 @singleton
 class KeyManagement:
-    def __init__(self):
-        pass
+    """
+    LiteLLM key lookups, generation, updates and revocation.
 
-    def ping(self, litellm_host: str):
-        return requests.get(url=f"{litellm_host}/health/liveness").status_code == 200
+    Deletions submitted within a short window are sent as one /key/delete per host. LiteLLM has no bulk
+    /key/generate, so generations are not batched, only bounded in how many run at a time.
 
-    def get_key_by_alias(self, litellm_host: str, litellm_api_key: str, key_alias: str):
-        rsp = requests.get(
+    Environment Variables:
+    - LITELLM_KEY_DELETE_BATCH_WINDOW: Seconds deletions are collected into one /key/delete, 0 disables batching (default: 0.05)
+    - LITELLM_KEY_DELETE_BATCH_SIZE: Maximum aliases per /key/delete (default: 100)
+    - LITELLM_KEY_GENERATE_CONCURRENCY: Maximum concurrent /key/generate requests (default: 10)
+    """
+
+    @inject
+    def __init__(self, http: HttpClient, index: KeyIndex):
+        self.http = http.with_probe("/health/liveness")
+        self.index = index
+        self.delete_batcher = KeyDeleteBatcher(
+            self.delete_keys,
+            window=float(os.getenv("LITELLM_KEY_DELETE_BATCH_WINDOW", "0.05")),
+            max_size=int(os.getenv("LITELLM_KEY_DELETE_BATCH_SIZE", "100")),
+        )
+        self.generate_slots = asyncio.Semaphore(int(os.getenv("LITELLM_KEY_GENERATE_CONCURRENCY", "10")))
+
+    async def ping(self, litellm_host: str, deadline: Optional[Deadline] = None):
+        return (await self.http.get(url=f"{litellm_host}/health/liveness", deadline=deadline)).status_code == 200
+
+    async def get_key_by_alias(self, litellm_host: str, litellm_api_key: str, key_alias: str, deadline: Optional[Deadline] = None):
+        if self.index.enabled:
+            return await self.index.get_by_alias(litellm_host, litellm_api_key, key_alias, deadline=deadline)
+
+        if self.http.stream_lookups:
+            rsp = await self.http.search_json(
+                f"{litellm_host}/key/list?key_alias={key_alias}&return_full_object=true&include_team_keys=true",
+                "keys",
+                lambda key: isinstance(key, dict) and key.get("key_alias") == key_alias,
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                deadline=deadline
+            )
+            if rsp.status_code == 200 and rsp.matches:
+                return rsp.matches[0]
+            return None
+
+        rsp = await self.http.get(
             url=f"{litellm_host}/key/list?key_alias={key_alias}&return_full_object=true&include_team_keys=true",
-            headers={"Authorization": f"Bearer {litellm_api_key}"}
+            headers={"Authorization": f"Bearer {litellm_api_key}"},
+            deadline=deadline
         )
 
-        logger.trace(f"Response from LiteLLM: {rsp.status_code} - {rsp.text}")
+        trace_response("Key list", rsp)
         rsp_json = rsp.json()
         if rsp.status_code == 200 and "keys" in rsp_json and len(rsp_json["keys"]) > 0:
             return rsp_json["keys"][0]
 
         return None
 
-    def delete_key(self, litellm_host: str, litellm_api_key: str, key_alias):
-        del_rsp = requests.post(
+    async def delete_key(self, litellm_host: str, litellm_api_key: str, key_alias, deadline: Optional[Deadline] = None):
+        error = await self.delete_batcher.submit(litellm_host, litellm_api_key, key_alias, deadline=deadline)
+        if error is not None:
+            logger.error(f"Failed to delete existing key: {error}")
+            raise ValueError(f"Failed to delete existing key: {error}")
+        logger.info(f"Deleted existing key with alias {key_alias}")
+
+    async def delete_keys(self, litellm_host: str, litellm_api_key: str, key_aliases: List[str], deadline: Optional[Deadline] = None) -> Dict[str, Optional[str]]:
+        """Delete keys by alias in one request. Returns the error message per alias, None for deleted ones."""
+        del_rsp = await self.http.post(
             url=f"{litellm_host}/key/delete",
             headers={"Authorization": f"Bearer {litellm_api_key}"},
-            json={"key_aliases": [key_alias]}
+            json={"key_aliases": list(key_aliases)},
+            deadline=deadline
         )
+        trace_response("Delete keys", del_rsp)
 
         if del_rsp.status_code == 200:
-            logger.info(f"Deleted existing key with alias {key_alias}")
-        else:
-            logger.error(f"Failed to delete existing key: {del_rsp.status_code} - {del_rsp.text}")
-            raise ValueError(f"Failed to delete existing key: {del_rsp.status_code} - {del_rsp.text}")
+            for key_alias in key_aliases:
+                self.index.forget(litellm_host, key_alias)
+            return {key_alias: None for key_alias in key_aliases}
+        if len(key_aliases) == 1:
+            return {key_aliases[0]: f"{del_rsp.status_code} - {del_rsp.text}"}
+
+        # LiteLLM rejects the whole batch if one alias fails, find out which
+        logger.warning(f"Batch deletion of {len(key_aliases)} keys failed ({del_rsp.status_code}), deleting them one by one")
+        results = {}
+        for result in await asyncio.gather(*[self.delete_keys(litellm_host, litellm_api_key, [a], deadline=deadline) for a in key_aliases]):
+            results.update(result)
+        return results
 
-    def generate_key(self, litellm_host: str, litellm_api_key: str, user_id: str, key_alias: str, key_name: str, team_id: str, models=None):
+    async def generate_key(self, litellm_host: str, litellm_api_key: str, user_id: str, key_alias: str, key_name: str, team_id: str, models=None, metadata=None, deadline: Optional[Deadline] = None):
         if models is None:
             models = []
 
@@ -53,18 +113,55 @@ class KeyManagement:
         }
         if team_id and team_id != "":
             data["team_id"] = team_id
+        if metadata:
+            data["metadata"] = dict(metadata)
 
-        rsp = requests.post(
-            url=f"{litellm_host}/key/generate",
-            headers={"Authorization": f"Bearer {litellm_api_key}"},
-            json=data
-        )
-        logger.trace(f"Response from LiteLLM: {rsp.status_code} - {rsp.text}")
+        async with self.generate_slots:
+            rsp = await self.http.post(
+                url=f"{litellm_host}/key/generate",
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                json=data,
+                deadline=deadline
+            )
+        trace_response("Generate key", rsp)
 
         rsp_json = rsp.json()
-        logger.trace(f"Response JSON: {rsp_json}")
         if rsp.status_code != 200:
             logger.error(f"Failed to generate key: {rsp.status_code} - {rsp.text}")
             raise ValueError(f"Failed to generate key: {rsp.status_code} - {rsp.text}")
 
-        return rsp_json["key"]
\ No newline at end of file
+        self.index.record(litellm_host, rsp_json)
+        return rsp_json["key"]
+
+    @staticmethod
+    def key_changes(key: Dict[str, Any], user_id: str, team_id: str, models: List[str], metadata: Dict[str, str]) -> Dict[str, Any]:
+        """Mutable fields of an existing key that differ from the desired ones, as a /key/update payload."""
+        changes = {}
+        if (key.get("user_id") or "") != (user_id or ""):
+            changes["user_id"] = user_id
+        if (key.get("team_id") or "") != (team_id or ""):
+            changes["team_id"] = team_id or None
+        if sorted(key.get("models") or []) != sorted(models or []):
+            changes["models"] = list(models or [])
+        existing_metadata = key.get("metadata") or {}
+        if any(existing_metadata.get(k) != v for k, v in (metadata or {}).items()):
+            # LiteLLM replaces metadata as a whole, keep the keys it added itself
+            changes["metadata"] = {**existing_metadata, **metadata}
+        return changes
+
+    async def update_key(self, litellm_host: str, litellm_api_key: str, token: str, changes: Dict[str, Any], deadline: Optional[Deadline] = None):
+        """Update mutable fields of an existing key in place, keeping its secret value."""
+        rsp = await self.http.post(
+            url=f"{litellm_host}/key/update",
+            headers={"Authorization": f"Bearer {litellm_api_key}"},
+            json={"key": token, **changes},
+            deadline=deadline
+        )
+        trace_response("Update key", rsp)
+
+        if rsp.status_code != 200:
+            logger.error(f"Failed to update key: {rsp.status_code} - {rsp.text}")
+            raise ValueError(f"Failed to update key: {rsp.status_code} - {rsp.text}")
+
+        self.index.record(litellm_host, {"token": token, **changes})
+        logger.info(f"Updated key fields {', '.join(changes)}")
@@ -2,10 +2,11 @@ from injector import Injector
 from kubernetes.client import ApiClient
 from loguru import logger
 import kopf
-import kr8s
+import kr8s.asyncio
 
 from src.litellm_key.crd import LiteLLMKey
 from src.litellm_key.manager import KeyManagement
+from src.http_client.deadline import Deadline
 
 injector: Injector = None
 api: ApiClient = None
@@ -19,12 +20,13 @@ def register_handlers(inj: Injector):
 
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "LiteLLMKey")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, **kwargs):
     litellm_key_management = injector.get(KeyManagement)
+    deadline = Deadline.for_plugin("litellm_key")
 
     logger.info(f"Deleting LiteLLM resource: {namespace}/{name} with spec: {spec}")
     try:
-        litellm_key_management.delete_key(spec["litellm_host"], spec["litellm_api_key"], spec['key_alias'])
+        await litellm_key_management.delete_key(spec["litellm_host"], spec["litellm_api_key"], spec['key_alias'], deadline=deadline)
         logger.info(f"LiteLLMKey {namespace}/{name} deleted successfully.")
     except Exception as e:
         logger.error(f"Failed to delete key with alias {spec['key_alias']}: {e}")
@@ -33,32 +35,51 @@ def delete_fn(spec, name, namespace, **kwargs):
 
 @kopf.on.update("ops.veitosiander.de", "v1", "LiteLLMKey")
 @kopf.on.create("ops.veitosiander.de", "v1", "LiteLLMKey")
-def create_fn(spec, name, namespace, **kwargs):
+async def create_fn(spec, name, namespace, **kwargs):
     litellm_key_management = injector.get(KeyManagement)
+    deadline = Deadline.for_plugin("litellm_key")
 
     logger.info(f"Creating LiteLLM resource: {namespace}/{name} with spec: {spec}")
 
-    cr = list(kr8s.get("LiteLLMKey.ops.veitosiander.de", name, namespace=namespace))[0]
+    cr = [cr async for cr in kr8s.asyncio.get("LiteLLMKey.ops.veitosiander.de", name, namespace=namespace)][0]
     logger.info(f"Fetched CR: {cr}")
 
     try:
-        key = litellm_key_management.get_key_by_alias(spec["litellm_host"], spec["litellm_api_key"], spec['key_alias'])
+        key = await litellm_key_management.get_key_by_alias(spec["litellm_host"], spec["litellm_api_key"], spec['key_alias'], deadline=deadline)
+        rotate = spec.get('rotation', "") != spec.get('applied_rotation', "")
+
+        # The secret of an existing key cannot be read back, so it is only kept if the CR already holds it
+        if key is not None and spec.get('key_value') and not rotate:
+            changes = litellm_key_management.key_changes(
+                key, spec['user_id'], spec.get('team_id', ""), list(spec.get('models') or []), dict(spec.get('key_metadata') or {})
+            )
+            if changes:
+                logger.info(f"Updating key with alias {spec['key_alias']} in place: {', '.join(changes)}")
+                await litellm_key_management.update_key(spec["litellm_host"], spec["litellm_api_key"], key["token"], changes, deadline=deadline)
+            else:
+                logger.info(f"Key with alias {spec['key_alias']} is up to date. Nothing to do...")
+            return {"status": "created"}
+
         if key is not None:
             logger.warning(
-                f"Key for host {spec['litellm_host']} alias {spec['key_alias']} already exists for user {spec['user_id']}. Deleting key...")
-            litellm_key_management.delete_key(spec["litellm_host"], spec["litellm_api_key"], spec['key_alias'])
+                f"Key for host {spec['litellm_host']} alias {spec['key_alias']} already exists for user {spec['user_id']}"
+                f"{' and rotation was requested' if rotate else ' but its value is unknown'}. Deleting key...")
+            await litellm_key_management.delete_key(spec["litellm_host"], spec["litellm_api_key"], spec['key_alias'], deadline=deadline)
 
         logger.info(f"Generating new key for user {spec['user_id']} with alias {spec['key_alias']}...")
-        key = litellm_key_management.generate_key(
+        key = await litellm_key_management.generate_key(
             spec["litellm_host"],
             spec["litellm_api_key"],
             user_id=spec['user_id'],
             team_id=spec.get('team_id', ""),
             key_alias=spec['key_alias'],
             key_name=spec["key_name"],
+            models=list(spec.get('models') or []),
+            metadata=dict(spec.get('key_metadata') or {}),
+            deadline=deadline,
         )
         logger.info(f"Generated key for {namespace}/{name}, updating CRD...")
-        cr.patch({"spec": {"key_value": key}})
+        await cr.patch({"spec": {"key_value": key, "applied_rotation": spec.get('rotation', "")}})
 
         logger.info(f"LiteLLMKey {namespace}/{name} created successfully.")
     except Exception as e:
@@ -2,6 +2,8 @@ import kubecrd
 from dataclasses import dataclass, field
 from typing import List
 
+from src.kube.status import ReconcileStatus
+
 @dataclass
 class LiteLLMParams(kubecrd.KubeResourceBase):
     input_cost_per_token: float = 0
@@ -58,7 +60,7 @@ class LiteLLMModelInfo(kubecrd.KubeResourceBase):
     team_public_model_name: str = field(default=None)
 
 @dataclass
-class LiteLLMModel(kubecrd.KubeResourceBase):
+class LiteLLMModel(ReconcileStatus, kubecrd.KubeResourceBase):
     __group__ = "ops.veitosiander.de"
     __version__ = "v1"
 
@@ -70,3 +72,5 @@ class LiteLLMModel(kubecrd.KubeResourceBase):
     model_info: LiteLLMModelInfo = field(metadata={"description": "Information about the model."})
 
     is_installed: bool = field(default=False, metadata={"description": "Indicates if the model is installed."})
+    model_id: str = field(default=None, metadata={"description": "LiteLLM ID of the model created for this resource, used for direct lookups."})
+    spec_hash: str = field(default=None, metadata={"description": "Fingerprint of model_name, litellm_params and model_info last pushed to LiteLLM."})
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from injector import singleton, inject
+from loguru import logger
+
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.singleflight import auth_identity
+
+
+class LiteLLMModelInventoryException(Exception):
+    pass
+
+
+class HostInventory:
+    """Snapshot of one LiteLLM proxy's /model/info, indexed by model_name and model_info.id."""
+
+    def __init__(self, models: list):
+        self.fetched_at = time.monotonic()
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        for model in models:
+            if model.get("model_name") is not None:
+                self.by_name.setdefault(model["model_name"], model)
+            model_id = (model.get("model_info") or {}).get("id")
+            if model_id is not None:
+                self.by_id[model_id] = model
+
+    def __len__(self):
+        return len(self.by_id) or len(self.by_name)
+
+
+@singleton
+class ModelInventory:
+    """
+    Per-host inventory of LiteLLM models shared by all LiteLLMModel reconciles.
+
+    /model/info is downloaded at most once per TTL for each (host, credential) and every lookup is a
+    dictionary access against that snapshot. Concurrent refreshes of the same host wait for one download.
+
+    Environment Variables:
+    - LITELLM_MODEL_INVENTORY_TTL: Seconds a snapshot is reused (default: LLM_OPERATOR_RECONCILE_INTERVAL or 600)
+    """
+
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health/liveness")
+        self.ttl = float(os.getenv("LITELLM_MODEL_INVENTORY_TTL", os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", "600")))
+
+        self._snapshots: Dict[Tuple[str, str], HostInventory] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    @staticmethod
+    def _key(litellm_host: str, litellm_api_key: str) -> Tuple[str, str]:
+        return litellm_host.rstrip("/"), auth_identity({"Authorization": f"Bearer {litellm_api_key}"})
+
+    async def snapshot(self, litellm_host: str, litellm_api_key: str, deadline: Optional[Deadline] = None) -> HostInventory:
+        """Return the current inventory of a host, downloading /model/info if the snapshot expired."""
+        key = self._key(litellm_host, litellm_api_key)
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and time.monotonic() - snapshot.fetched_at < self.ttl:
+            return snapshot
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another reconcile may have refreshed it while we waited
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and time.monotonic() - snapshot.fetched_at < self.ttl:
+                return snapshot
+
+            response = await self.http.get(
+                url=f"{litellm_host}/model/info",
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                deadline=deadline
+            )
+            if response.status_code != 200:
+                raise LiteLLMModelInventoryException(f"Failed to list models on {litellm_host}: {response.status_code} - {response.text}")
+
+            snapshot = HostInventory(response.json().get("data", []))
+            self._snapshots[key] = snapshot
+            logger.debug(f"Refreshed LiteLLM model inventory of {litellm_host}: {len(snapshot)} models")
+            return snapshot
+
+    async def get_by_name(self, litellm_host: str, litellm_api_key: str, model_name: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """Look up a model by model_name."""
+        return (await self.snapshot(litellm_host, litellm_api_key, deadline=deadline)).by_name.get(model_name)
+
+    async def get_by_id(self, litellm_host: str, litellm_api_key: str, model_id: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """Look up a model by model_info.id."""
+        return (await self.snapshot(litellm_host, litellm_api_key, deadline=deadline)).by_id.get(model_id)
+
+    def invalidate(self, litellm_host: str):
+        """Drop all snapshots of a host after the operator changed its models."""
+        host = litellm_host.rstrip("/")
+        for key in [key for key in self._snapshots if key[0] == host]:
+            del self._snapshots[key]
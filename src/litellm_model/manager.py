@@ -1,76 +1,181 @@
+import hashlib
 import json
 from datetime import timezone, datetime
 
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 import os
 from typing import Dict, Optional, Any
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_data, trace_response
 
 class LiteLLMModelException(Exception):
     pass
 
+# model_info fields written by LiteLLM or the operator, not by the user
+_MANAGED_MODEL_INFO = {"id", "db_model", "created_at", "created_by", "updated_at", "updated_by"}
+
+
+def _normalize(value: Any) -> Any:
+    """Drop unset values so defaults filled in by the CRD schema do not change a fingerprint."""
+    if isinstance(value, dict):
+        normalized = {k: _normalize(v) for k, v in value.items()}
+        return {k: v for k, v in normalized.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def model_fingerprint(spec: Dict[str, Any]) -> str:
+    """Fingerprint of the parts of a LiteLLMModel spec that are pushed to LiteLLM."""
+    model_info = {k: v for k, v in (spec.get("model_info") or {}).items() if k not in _MANAGED_MODEL_INFO}
+    desired = _normalize({
+        "model_name": spec.get("model_name"),
+        "litellm_params": dict(spec.get("litellm_params") or {}),
+        "model_info": model_info,
+    })
+    return hashlib.sha256(json.dumps(desired, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def model_payload(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a LiteLLMModel spec sent to LiteLLM, without the operator's bookkeeping fields."""
+    return {
+        "model_name": spec["model_name"],
+        "litellm_params": dict(spec.get("litellm_params") or {}),
+        "model_info": dict(spec.get("model_info") or {}),
+    }
+
+
+def created_model_id(result: Optional[Dict[str, Any]]) -> Optional[str]:
+    """ID of a model from the response of /model/new."""
+    if not result:
+        return None
+    return result.get("model_id") or (result.get("model_info") or {}).get("id")
+
+
 @singleton
 class ModelManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health/liveness")
+
+    async def ping(self, litellm_host, deadline: Optional[Deadline] = None):
+        return (await self.http.get(url=f"{litellm_host}/health/liveness", deadline=deadline)).status_code == 200
+
+    async def get_model(self, litellm_host, litellm_api_key, model_id: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get model information by ID, in the same shape as a /model/info list entry.
 
-    def ping(self, litellm_host):
-        return requests.get(url=f"{litellm_host}/health/liveness").status_code == 200
+        Returns None only if LiteLLM answered that the model does not exist.
 
-    def get_model(self, litellm_host, litellm_api_key, model_id: str) -> Optional[Dict[str, Any]]:
-        """Get model information by ID."""
+        Raises:
+            LiteLLMModelException: If the lookup failed, e.g. on a 5xx, a timeout or an open circuit
+        """
         try:
-            response = requests.get(
-                url=f"{litellm_host}/models/{model_id}",
-                headers={"Authorization": f"Bearer {litellm_api_key}"}
+            response = await self.http.get(
+                url=f"{litellm_host}/model/info",
+                params={"litellm_model_id": model_id},
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                deadline=deadline
             )
-            
-            logger.trace(f"Get model response: {response.status_code} - {response.text}")
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                logger.info(f"Model with ID {model_id} not found: {response.status_code} - {response.text}")
-                return None
-            else:
-                logger.error(f"Failed to get model {model_id}: {response.status_code} - {response.text}")
-                return None
-                
         except Exception as e:
             logger.error(f"Exception while getting model {model_id}: {e}")
+            raise LiteLLMModelException(f"Exception while getting model {model_id}: {e}") from e
+
+        trace_response("Get model", response)
+
+        if response.status_code == 200:
+            for model in response.json().get("data", []):
+                if model.get("model_info", {}).get("id") == model_id:
+                    return model
+            logger.info(f"Model with ID {model_id} not found")
+            return None
+        elif response.status_code in (400, 404):
+            logger.info(f"Model with ID {model_id} not found: {response.status_code} - {response.text}")
             return None
+        else:
+            logger.error(f"Failed to get model {model_id}: {response.status_code} - {response.text}")
+            raise LiteLLMModelException(f"Failed to get model {model_id}: {response.status_code} - {response.text}")
+
+    async def find_model(self, litellm_host, litellm_api_key, model_id: Optional[str], model_name: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a model by its stored ID, falling back to the name scan when the ID is missing or stale.
+
+        Raises:
+            LiteLLMModelException: If a lookup failed, so callers never take a failed lookup for a missing model
+        """
+        if model_id:
+            model = await self.get_model(litellm_host, litellm_api_key, model_id, deadline=deadline)
+            if model is not None:
+                return model
+            logger.info(f"Stored model ID {model_id} of {model_name} is stale, looking the model up by name")
+        return await self.get_model_by_name(litellm_host, litellm_api_key, model_name, deadline=deadline)
+
+    async def get_model_by_name(self, litellm_host, litellm_api_key, model_name: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get model information by name.
+
+        Raises:
+            LiteLLMModelException: If /model/info could not be listed
+        """
+        if self.http.stream_lookups:
+            return await self._find_model_by_name(litellm_host, litellm_api_key, model_name, deadline=deadline)
 
-    def get_model_by_name(self, litellm_host, litellm_api_key, model_name: str) -> Optional[Dict[str, Any]]:
-        """Get model information by name."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{litellm_host}/model/info",
-                headers={"Authorization": f"Bearer {litellm_api_key}"}
+                cached=True,
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                deadline=deadline
             )
-            
-            logger.trace(f"List models response: {response.status_code} - {response.text}")
-            
-            if response.status_code == 200:
-                models_data = response.json()
-                # Look for model with matching name
-                if "data" in models_data:
-                    for model in models_data["data"]:
-                        if model.get("id") == model_name or model.get("model_name") == model_name:
-                            return model
-                logger.info(f"Model with name {model_name} not found")
-                return None
-            else:
-                logger.error(f"Failed to list models: {response.status_code} - {response.text}")
-                return None
-                
         except Exception as e:
             logger.error(f"Exception while getting model by name {model_name}: {e}")
+            raise LiteLLMModelException(f"Exception while getting model by name {model_name}: {e}") from e
+
+        trace_response("List models", response)
+
+        if response.status_code == 200:
+            models_data = response.json()
+            # Look for model with matching name
+            if "data" in models_data:
+                for model in models_data["data"]:
+                    if model.get("id") == model_name or model.get("model_name") == model_name:
+                        return model
+            logger.info(f"Model with name {model_name} not found")
             return None
+        else:
+            logger.error(f"Failed to list models: {response.status_code} - {response.text}")
+            raise LiteLLMModelException(f"Failed to list models: {response.status_code} - {response.text}")
 
-    def create_model(self, litellm_host, litellm_api_key, model_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def _find_model_by_name(self, litellm_host, litellm_api_key, model_name: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """Streaming variant of get_model_by_name that stops reading /model/info at the first match."""
+        try:
+            response = await self.http.search_json(
+                f"{litellm_host}/model/info",
+                "data",
+                lambda model: model.get("id") == model_name or model.get("model_name") == model_name,
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                deadline=deadline
+            )
+        except Exception as e:
+            logger.error(f"Exception while getting model by name {model_name}: {e}")
+            raise LiteLLMModelException(f"Exception while getting model by name {model_name}: {e}") from e
+
+        if response.status_code == 200:
+            if response.matches:
+                return response.matches[0]
+            logger.info(f"Model with name {model_name} not found")
+            return None
+        else:
+            logger.error(f"Failed to list models: {response.status_code} - {response.text}")
+            raise LiteLLMModelException(f"Failed to list models: {response.status_code} - {response.text}")
+
+    async def create_model(self, litellm_host, litellm_api_key, model_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Create a new model."""
         model_data = dict(model_data)
+        # Fill in defaults on a copy, never on the caller's spec
+        model_data["model_info"] = dict(model_data.get("model_info") or {})
         if not model_data["model_info"].get("created_at"):
             model_data["model_info"]["created_at"] = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
         if not model_data["model_info"].get("updated_at"):
@@ -82,14 +187,15 @@ class ModelManagement:
         model_data.pop('litellm_api_key', None)
 
         try:
-            logger.trace(f"Creating model with data: {json.dumps(model_data, indent=2)}")
-            response = requests.post(
+            trace_data("Creating model with data", model_data)
+            response = await self.http.post(
                 url=f"{litellm_host}/model/new",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json=model_data
+                json=model_data,
+                deadline=deadline
             )
             
-            logger.trace(f"Create model response: {response.status_code} - {response.text}")
+            trace_response("Create model", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully created model {model_data.get('model_name')}")
@@ -102,20 +208,21 @@ class ModelManagement:
             logger.error(f"Exception while creating model: {e}")
             raise
 
-    def update_model(self, litellm_host, litellm_api_key, model_id: str, model_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        model_data.pop('litellm_host', None)
-        model_data.pop('litellm_api_key', None)
+    async def update_model(self, litellm_host, litellm_api_key, model_id: str, model_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Update an existing model."""
+        model_data = {k: v for k, v in model_data.items() if k not in ('litellm_host', 'litellm_api_key')}
+        # LiteLLM finds the deployment to update by model_info.id
+        model_data["model_info"] = {**(model_data.get("model_info") or {}), "id": model_id}
         try:
-            model_data["id"] = model_id
             
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{litellm_host}/model/update",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json=dict(model_data)
+                json=dict(model_data),
+                deadline=deadline
             )
             
-            logger.trace(f"Update model response: {response.status_code} - {response.text}")
+            trace_response("Update model", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully updated model {model_id}")
@@ -128,29 +235,30 @@ class ModelManagement:
             logger.error(f"Exception while updating model {model_id}: {e}")
             raise LiteLLMModelException(f"Exception while updating model {model_id}: {e}")
 
-    def delete_model_by_name(self, litellm_host, litellm_api_key, model_name: str) -> bool:
-        model = self.get_model_by_name(litellm_host, litellm_api_key, model_name)
+    async def delete_model_by_name(self, litellm_host, litellm_api_key, model_name: str, model_id: Optional[str] = None, deadline: Optional[Deadline] = None) -> bool:
+        model = await self.find_model(litellm_host, litellm_api_key, model_id, model_name, deadline=deadline)
         if model is None:
             logger.info(f"Model with name {model_name} does not exist, nothing to delete.")
             return True
 
-        if model["model_info"].get("id") is None:
+        if model.get("model_info", {}).get("id") is None:
             logger.error(f"Model with name {model_name} has no ID, cannot delete.")
             raise LiteLLMModelException("Model has no ID, cannot delete.")
 
         logger.info(f"Deleting model {model_name} with ID {model["model_info"].get('id')} and data: {json.dumps(model, indent=2)}")
-        return self.delete_model(litellm_host, litellm_api_key, model["model_info"].get("id"))
+        return await self.delete_model(litellm_host, litellm_api_key, model["model_info"].get("id"), deadline=deadline)
 
-    def delete_model(self, litellm_host, litellm_api_key, model_id: str) -> bool:
+    async def delete_model(self, litellm_host, litellm_api_key, model_id: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a model by ID."""
         try:
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{litellm_host}/model/delete",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json={"id": model_id}
+                json={"id": model_id},
+                deadline=deadline
             )
             
-            logger.trace(f"Delete model response: {response.status_code} - {response.text}")
+            trace_response("Delete model", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully deleted model {model_id}")
@@ -162,3 +270,4 @@ class ModelManagement:
         except Exception as e:
             logger.error(f"Exception while deleting model {model_id}: {e}")
             raise
+
@@ -2,11 +2,14 @@ from injector import Injector
 from kubernetes.client import ApiClient
 from loguru import logger
 import kopf
-import kr8s
-import os
+import kr8s.asyncio
 
-from src.litellm_model.manager import ModelManagement
+from src.litellm_model.inventory import ModelInventory, LiteLLMModelInventoryException
+from src.litellm_model.manager import ModelManagement, LiteLLMModelException, created_model_id, model_fingerprint, model_payload
+from src.litellm_model.reconciler import HostReconciler
 from src.litellm_model.crd import LiteLLMModel
+from src.http_client.deadline import Deadline
+from src.scheduler import ReconcileScheduler
 
 injector: Injector = None
 api: ApiClient = None
@@ -18,62 +21,103 @@ def register_handlers(inj: Injector):
     logger.info("Registering LiteLLMModel handlers...")
     LiteLLMModel.install(api, exist_ok=True)
 
-@kopf.on.timer("ops.veitosiander.de", "v1", "LiteLLMModel", interval=os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", 600))
-def timer_fn(spec, name, namespace, **kwargs):
+@kopf.daemon("ops.veitosiander.de", "v1", "LiteLLMModel", cancellation_timeout=5.0)
+async def timer_fn(uid, name, namespace, stopped, **kwargs):
+    await injector.get(ReconcileScheduler).run("litellm_model", uid, stopped, lambda: reconcile_fn(name=name, namespace=namespace, **kwargs),
+                                               resource="LiteLLMModel.ops.veitosiander.de", name=name, namespace=namespace)
+
+
+async def reconcile_fn(spec, name, namespace, **kwargs):
+    """Recreate the model if it is missing. Returns whether it was in sync, None if it was not checked."""
     if not spec.get('is_installed', False):
         logger.warning(f"model not installed for {namespace}/{name}, skipping reconciliation.")
         return
 
-    logger.info("Pinging LiteLLM service...")
     model_management = injector.get(ModelManagement)
-    if not model_management.ping(spec['litellm_host']):
-        logger.error("Failed to ping LiteLLM service. Will retry in the next interval.")
+    inventory = injector.get(ModelInventory)
+    deadline = Deadline.for_plugin("litellm_model")
+    if not model_management.http.available(spec['litellm_host']):
+        logger.warning(f"Circuit for {spec['litellm_host']} is open, skipping reconciliation of {namespace}/{name} until it recovers.")
         return
 
+    reconciler = injector.get(HostReconciler)
+    if reconciler.enabled:
+        # The batched pass keeps its own cadence per host, this tick reports what the latest pass found
+        result = await reconciler.reconcile_host(spec['litellm_host'], spec['litellm_api_key'],
+                                                 Deadline.for_plugin("litellm_model_batch", default=reconciler.interval))
+        return False if result is None else result.in_sync(spec['model_name'])
+
     logger.info(f"Reconciling LiteLLMModel resource: {namespace}/{name} with spec: {spec}")
-    cr = list(kr8s.get("LiteLLMModel.ops.veitosiander.de", name, namespace=namespace))[0]
+    try:
+        model = None
+        if spec.get('model_id'):
+            model = await inventory.get_by_id(spec['litellm_host'], spec['litellm_api_key'], spec['model_id'], deadline=deadline)
+        if model is None:
+            model = await inventory.get_by_name(spec['litellm_host'], spec['litellm_api_key'], spec['model_name'], deadline=deadline)
+    except LiteLLMModelInventoryException as e:
+        logger.error(f"Failed to load model inventory for {namespace}/{name}: {e}")
+        return False
+    if model is None and spec.get('model_id'):
+        # The snapshot may predate the model, confirm the miss before recreating it
+        try:
+            model = await model_management.get_model(spec['litellm_host'], spec['litellm_api_key'], spec['model_id'], deadline=deadline)
+        except LiteLLMModelException as e:
+            logger.error(f"Could not confirm that model {spec['model_name']} of {namespace}/{name} is missing, retrying on the next tick: {e}")
+            return False
 
-    logger.info(f"Fetched CR: {cr} <- {name}")
-    model = model_management.get_model_by_name(spec['litellm_host'], spec['litellm_api_key'], spec['model_name'])
     if model is not None:
+        model_id = model.get('model_info', {}).get('id')
+        if model_id not in (None, spec.get('model_id')):
+            cr = [cr async for cr in kr8s.asyncio.get("LiteLLMModel.ops.veitosiander.de", name, namespace=namespace)][0]
+            await cr.patch({"spec": {"model_id": model_id}})
         logger.info(f"Model {spec['model_name']} exists. Nothing to do...")
+        return True
     else:
         logger.warning(f"Model {spec['model_name']} does not exist. Recreating...")
-        model_management.create_model(spec['litellm_host'], spec['litellm_api_key'], spec)
-        logger.info(f"Recreated modeö for {namespace}/{name}")
+        created = await model_management.create_model(spec['litellm_host'], spec['litellm_api_key'], model_payload(spec), deadline=deadline)
+        inventory.invalidate(spec['litellm_host'])
+        cr = [cr async for cr in kr8s.asyncio.get("LiteLLMModel.ops.veitosiander.de", name, namespace=namespace)][0]
+        await cr.patch({"spec": {"model_id": created_model_id(created)}})
+        logger.info(f"Recreated model for {namespace}/{name}")
+        return False
 
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "LiteLLMModel")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, **kwargs):
     model_management = injector.get(ModelManagement)
+    deadline = Deadline.for_plugin("litellm_model")
 
     logger.info(f"Deleting LiteLLM resource: {namespace}/{name} with spec: {spec}")
     try:
-        model_management.delete_model_by_name(spec['litellm_host'], spec['litellm_api_key'], spec['model_name'])
+        await model_management.delete_model_by_name(spec['litellm_host'], spec['litellm_api_key'], spec['model_name'], model_id=spec.get('model_id'), deadline=deadline)
+        injector.get(ModelInventory).invalidate(spec['litellm_host'])
         logger.info(f"LiteLLMModel {namespace}/{name} deleted successfully.")
     except Exception as e:
+        # A failed lookup does not mean the model is gone, keep the finalizer and try again
         logger.error(f"Failed to delete model {spec['model_name']}: {e}")
-        pass
+        raise kopf.TemporaryError(f"Failed to delete model: {e}", delay=30)
 
 @kopf.on.create("ops.veitosiander.de", "v1", "LiteLLMModel")
-def create_fn(spec, name, namespace,**kwargs):
+async def create_fn(spec, name, namespace,**kwargs):
     model_management = injector.get(ModelManagement)
+    deadline = Deadline.for_plugin("litellm_model")
 
     logger.info(f"Creating LiteLLM resource: {namespace}/{name} with spec: {spec}")
 
-    cr = list(kr8s.get("LiteLLMModel.ops.veitosiander.de", name, namespace=namespace))[0]
+    cr = [cr async for cr in kr8s.asyncio.get("LiteLLMModel.ops.veitosiander.de", name, namespace=namespace)][0]
     logger.info(f"Fetched CR: {cr}")
 
     try:
-        model = model_management.get_model_by_name(spec['litellm_host'], spec['litellm_api_key'], spec['model_name'])
+        model = await model_management.find_model(spec['litellm_host'], spec['litellm_api_key'], spec.get('model_id'), spec['model_name'], deadline=deadline)
         if model is not None:
             logger.warning(f"Model with name {spec['model_name']} already exists. Skipping...")
             return {"status": "created"}
 
         logger.info(f"Creating new model {spec['model_name']}...")
-        model = model_management.create_model(spec['litellm_host'], spec['litellm_api_key'], spec)
+        model = await model_management.create_model(spec['litellm_host'], spec['litellm_api_key'], model_payload(spec), deadline=deadline)
+        injector.get(ModelInventory).invalidate(spec['litellm_host'])
         logger.info(f"Created model for {namespace}/{name} with {model.get('model_name', 'no-model-name')}, updating CRD...")
-        cr.patch({"spec": {"is_installed": True}})
+        await cr.patch({"spec": {"is_installed": True, "spec_hash": model_fingerprint(spec), "model_id": created_model_id(model)}})
 
         logger.info(f"LiteLLMModel {namespace}/{name} created successfully.")
     except Exception as e:
@@ -81,3 +125,39 @@ def create_fn(spec, name, namespace,**kwargs):
         raise kopf.TemporaryError(f"Failed to create model: {e}", delay=30)
 
     return {"status": "created"}
+
+@kopf.on.update("ops.veitosiander.de", "v1", "LiteLLMModel")
+async def update_fn(spec, name, namespace, old, **kwargs):
+    if not spec.get('is_installed', False):
+        logger.info(f"Model not installed for {namespace}/{name} yet, leaving the update to the create handler.")
+        return
+
+    fingerprint = model_fingerprint(spec)
+    if spec.get('spec_hash') == fingerprint:
+        logger.debug(f"LiteLLMModel {namespace}/{name} unchanged, skipping /model/update.")
+        return
+
+    model_management = injector.get(ModelManagement)
+    deadline = Deadline.for_plugin("litellm_model")
+
+    logger.info(f"Updating LiteLLM resource: {namespace}/{name} with spec: {spec}")
+    cr = [cr async for cr in kr8s.asyncio.get("LiteLLMModel.ops.veitosiander.de", name, namespace=namespace)][0]
+
+    # A renamed model is still registered under its previous name
+    old_model_name = ((old or {}).get('spec') or {}).get('model_name') or spec['model_name']
+    model_data = model_payload(spec)
+    try:
+        model = await model_management.find_model(spec['litellm_host'], spec['litellm_api_key'], spec.get('model_id'), old_model_name, deadline=deadline)
+        if model is None:
+            logger.warning(f"Model {old_model_name} does not exist. Recreating...")
+            model_id = created_model_id(await model_management.create_model(spec['litellm_host'], spec['litellm_api_key'], model_data, deadline=deadline))
+        else:
+            model_id = model["model_info"]["id"]
+            await model_management.update_model(spec['litellm_host'], spec['litellm_api_key'], model_id, model_data, deadline=deadline)
+        injector.get(ModelInventory).invalidate(spec['litellm_host'])
+        await cr.patch({"spec": {"spec_hash": fingerprint, "model_id": model_id}})
+
+        logger.info(f"LiteLLMModel {namespace}/{name} updated successfully.")
+    except Exception as e:
+        logger.error(f"Failed to update model for {namespace}/{name}: {e}")
+        raise kopf.TemporaryError(f"Failed to update model: {e}", delay=30)
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import kr8s
+import kr8s.asyncio
+from injector import singleton, inject
+from loguru import logger
+
+from src.http_client.deadline import Deadline
+from src.litellm_model.inventory import ModelInventory
+from src.litellm_model.manager import ModelManagement, created_model_id, model_payload
+
+# Masked or rewritten by LiteLLM in /model/info, so they can never be compared with the spec
+_UNCOMPARABLE_PARAMS = {"api_key", "aws_access_key_id", "aws_secret_access_key", "vertex_credentials"}
+
+
+class BatchResult:
+    """Result of one batched reconcile pass of a LiteLLM host."""
+
+    def __init__(self, desired: List[str], missing: List[str], changed: List[str], orphaned: List[str]):
+        self.desired = desired
+        self.missing = missing
+        self.changed = changed
+        self.orphaned = orphaned
+
+    def in_sync(self, model_name: str) -> Optional[bool]:
+        """Whether the pass found the model in sync, None if the model was not part of the pass."""
+        if model_name not in self.desired:
+            return None
+        return model_name not in self.missing and model_name not in self.changed
+
+
+@singleton
+class HostReconciler:
+    """
+    Reconciles all LiteLLMModel resources of one LiteLLM host in a single pass.
+
+    The LiteLLMModel specs of the host are listed once from Kubernetes and diffed against one /model/info
+    download. Missing models are created and changed ones updated, up to LITELLM_MODEL_BATCH_CONCURRENCY at
+    a time. Models created by the operator without a LiteLLMModel are reported as orphaned, never deleted.
+    A pass runs at most once per reconcile interval per host, whichever LiteLLMModel timer fires first. A failed
+    pass is retried after LITELLM_MODEL_BATCH_RETRY_INTERVAL, not on every timer of the host.
+
+    Environment Variables:
+    - LITELLM_MODEL_BATCH_RECONCILE: Reconcile LiteLLMModels per host instead of per resource (default: false)
+    - LITELLM_MODEL_BATCH_CONCURRENCY: Concurrent creates/updates during a pass (default: 10)
+    - LITELLM_MODEL_BATCH_RETRY_INTERVAL: Seconds before a failed pass is attempted again (default: 60)
+    """
+
+    @inject
+    def __init__(self, model_management: ModelManagement, inventory: ModelInventory):
+        self.model_management = model_management
+        self.inventory = inventory
+        self.enabled = os.getenv("LITELLM_MODEL_BATCH_RECONCILE", "false").lower() == "true"
+        self.concurrency = int(os.getenv("LITELLM_MODEL_BATCH_CONCURRENCY", "10"))
+        self.interval = float(os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", "600"))
+        self.retry_interval = float(os.getenv("LITELLM_MODEL_BATCH_RETRY_INTERVAL", "60"))
+
+        self._next_run: Dict[Tuple[str, str], float] = {}
+        self._results: Dict[Tuple[str, str], Optional[BatchResult]] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    async def reconcile_host(self, litellm_host: str, litellm_api_key: str, deadline: Deadline) -> Optional[BatchResult]:
+        """
+        Run a batched pass for the host unless one was attempted recently.
+
+        Returns the result of the host's latest pass, None if that pass failed. A failure is logged once per pass.
+        """
+        key = (litellm_host.rstrip("/"), litellm_api_key)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if time.monotonic() < self._next_run.get(key, 0):
+                return self._results.get(key)
+
+            delay = self.retry_interval
+            try:
+                self._results[key] = await self._reconcile(litellm_host, litellm_api_key, deadline)
+                delay = self.interval
+            except Exception as e:
+                logger.error(f"Batched reconcile of {litellm_host} failed, retrying in {delay:.0f}s: {e}")
+                self._results[key] = None
+            finally:
+                # Recorded for failed passes too, so the other timers of the host do not repeat them right away
+                self._next_run[key] = time.monotonic() + delay
+            return self._results[key]
+
+    async def _desired(self, litellm_host: str, litellm_api_key: str) -> Dict[str, Any]:
+        """LiteLLMModel CRs of the host by model_name."""
+        desired = {}
+        async for cr in kr8s.asyncio.get("LiteLLMModel.ops.veitosiander.de", namespace=kr8s.ALL):
+            spec = cr.raw.get("spec", {})
+            if cr.metadata.get("deletionTimestamp") or not spec.get("is_installed", False):
+                continue
+            if spec.get("litellm_host", "").rstrip("/") != litellm_host.rstrip("/") or spec.get("litellm_api_key") != litellm_api_key:
+                continue
+            desired[spec["model_name"]] = cr
+        return desired
+
+    @staticmethod
+    def _changed(spec: Dict[str, Any], model: Dict[str, Any]) -> bool:
+        actual = model.get("litellm_params") or {}
+        for param, value in (spec.get("litellm_params") or {}).items():
+            if param in _UNCOMPARABLE_PARAMS or value in (None, 0, False, [], ""):
+                continue
+            if actual.get(param) != value:
+                return True
+        return False
+
+    async def _reconcile(self, litellm_host: str, litellm_api_key: str, deadline: Deadline) -> BatchResult:
+        crs = await self._desired(litellm_host, litellm_api_key)
+        desired = {name: cr.raw["spec"] for name, cr in crs.items()}
+
+        self.inventory.invalidate(litellm_host)
+        snapshot = await self.inventory.snapshot(litellm_host, litellm_api_key, deadline=deadline)
+        actual = {name: snapshot.by_id.get(spec.get("model_id")) or snapshot.by_name.get(name) for name, spec in desired.items()}
+
+        missing = [name for name in desired if actual[name] is None]
+        changed = [name for name in desired if actual[name] is not None and self._changed(desired[name], actual[name])]
+        # Models renamed in LiteLLM are matched by id, so they are not orphans
+        matched_ids = {(model.get("model_info") or {}).get("id") for model in actual.values() if model is not None}
+        orphaned = [name for name, model in snapshot.by_name.items()
+                    if name not in desired and (model.get("model_info") or {}).get("id") not in matched_ids
+                    and (model.get("model_info") or {}).get("created_by") == "genai-operator"]
+        logger.info(f"Batched reconcile of {litellm_host}: {len(desired)} desired, {len(snapshot.by_name)} actual, "
+                    f"{len(missing)} missing, {len(changed)} changed, {len(orphaned)} orphaned")
+        if orphaned:
+            logger.warning(f"Models on {litellm_host} created by the operator without a LiteLLMModel: {', '.join(orphaned)}")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def create(name: str):
+            async with semaphore:
+                created = await self.model_management.create_model(litellm_host, litellm_api_key, model_payload(desired[name]), deadline=deadline)
+            # Let the next pass and the LiteLLMModel handlers find the model by id
+            await crs[name].patch({"spec": {"model_id": created_model_id(created)}})
+
+        async def update(name: str):
+            async with semaphore:
+                model_id = actual[name]["model_info"]["id"]
+                await self.model_management.update_model(litellm_host, litellm_api_key, model_id, model_payload(desired[name]), deadline=deadline)
+            if desired[name].get("model_id") != model_id:
+                await crs[name].patch({"spec": {"model_id": model_id}})
+
+        names = missing + changed
+        results = await asyncio.gather(*[create(n) for n in missing], *[update(n) for n in changed], return_exceptions=True)
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Batched reconcile of model {name} on {litellm_host} failed: {result}")
+
+        if names:
+            self.inventory.invalidate(litellm_host)
+        return BatchResult(list(desired), missing, changed, orphaned)
@@ -0,0 +1,42 @@
+import kubecrd
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from src.kube.status import ReconcileStatus
+from src.litellm_model.crd import LiteLLMParams, LiteLLMModelInfo
+
+@dataclass
+class LiteLLMModelTemplate(kubecrd.KubeResourceBase):
+    model_name: str
+    litellm_params: LiteLLMParams = field(metadata={"description": "LiteLLM parameters for every model, string values may use {variable} placeholders."})
+    model_info: LiteLLMModelInfo = field(default_factory=LiteLLMModelInfo, metadata={"description": "Information about every model."})
+
+@dataclass
+class LiteLLMModelSet(ReconcileStatus, kubecrd.KubeResourceBase):
+    __group__ = "ops.veitosiander.de"
+    __version__ = "v1"
+    # Written by the operator after every reconcile
+    __status_fields__ = {
+        "spec_hash": {"type": "string", "description": "Fingerprint of the expanded models last pushed to LiteLLM."},
+        "item_status": {
+            "type": "object",
+            "description": "Per model_name state, model_id, fingerprint and error of the last reconcile.",
+            "additionalProperties": {
+                "type": "object",
+                "properties": {
+                    "state": {"type": "string", "description": "created, updated, ready or failed."},
+                    "model_id": {"type": "string", "description": "LiteLLM model_info.id of the model."},
+                    "hash": {"type": "string", "description": "Fingerprint of the model last pushed to LiteLLM."},
+                    "error": {"type": "string", "description": "Why the last reconcile of the model failed."},
+                },
+            },
+        },
+    }
+
+    litellm_host: str
+    litellm_api_key: str
+
+    template: LiteLLMModelTemplate = field(metadata={"description": "Model registered once per expanded item, e.g. model_name: '{model}-{preset}'."})
+    items: List[Dict[str, str]] = field(default_factory=list, metadata={"description": "Explicit variable sets, each expanded once per matrix combination."})
+    matrix: Dict[str, List[str]] = field(default_factory=dict, metadata={"description": "Variables whose cartesian product is expanded for every item."})
+    concurrency: int = field(default=10, metadata={"description": "Maximum concurrent model creates/updates/deletes."})
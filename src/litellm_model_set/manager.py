@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import itertools
+import re
+from typing import Any, Dict, Optional
+
+from injector import singleton, inject
+from loguru import logger
+
+from src.http_client.deadline import Deadline
+from src.litellm_model.inventory import ModelInventory
+from src.litellm_model.manager import ModelManagement, created_model_id, model_fingerprint
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class LiteLLMModelSetException(Exception):
+    pass
+
+
+def _render(value: Any, variables: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {k: _render(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, variables) for v in value]
+    if isinstance(value, str):
+        def substitute(match):
+            if match.group(1) not in variables:
+                raise LiteLLMModelSetException(f"Template variable {match.group(1)} is not defined in items or matrix")
+            return variables[match.group(1)]
+        return _PLACEHOLDER.sub(substitute, value)
+    return value
+
+
+def expand_models(spec: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Render the template of a LiteLLMModelSet once per item and matrix combination, keyed by model_name."""
+    matrix = dict(spec.get("matrix") or {})
+    combinations = [dict(zip(matrix, values)) for values in itertools.product(*matrix.values())]
+    template = {
+        "model_name": spec["template"]["model_name"],
+        "litellm_params": dict(spec["template"].get("litellm_params") or {}),
+        "model_info": dict(spec["template"].get("model_info") or {}),
+    }
+
+    models = {}
+    for item in spec.get("items") or [{}]:
+        for combination in combinations:
+            model = _render(template, {**combination, **item})
+            if model["model_name"] in models:
+                raise LiteLLMModelSetException(f"Template expands to model_name {model['model_name']} more than once")
+            models[model["model_name"]] = model
+    return models
+
+
+def set_fingerprint(models: Dict[str, Dict[str, Any]]) -> str:
+    """Fingerprint of a whole expanded model set."""
+    digest = hashlib.sha256()
+    for name in sorted(models):
+        digest.update(f"{name}={model_fingerprint(models[name])};".encode())
+    return digest.hexdigest()
+
+
+def _item_status(state: str, model_id: Optional[str] = None, fingerprint: str = "", error: str = "") -> Dict[str, str]:
+    # Always the same keys, so a merge patch never leaves a stale error behind
+    return {"state": state, "model_id": model_id or "", "hash": fingerprint, "error": error}
+
+
+@singleton
+class ModelSetManagement:
+    @inject
+    def __init__(self, model_management: ModelManagement, inventory: ModelInventory):
+        self.model_management = model_management
+        self.inventory = inventory
+
+    async def reconcile(self, litellm_host, litellm_api_key, models: Dict[str, Dict[str, Any]], item_status: Dict[str, Dict[str, str]],
+                        concurrency: int = 10, deadline: Optional[Deadline] = None) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Create missing, update changed and delete removed models of a set against one /model/info download.
+
+        Returns the new per-item status; removed items map to None so they drop out of a merge patch.
+        """
+        self.inventory.invalidate(litellm_host)
+        snapshot = await self.inventory.snapshot(litellm_host, litellm_api_key, deadline=deadline)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        status: Dict[str, Optional[Dict[str, str]]] = {}
+
+        async def apply(name: str, model: Dict[str, Any]):
+            fingerprint = model_fingerprint(model)
+            previous = item_status.get(name) or {}
+            existing = snapshot.by_id.get(previous.get("model_id")) or snapshot.by_name.get(name)
+            async with semaphore:
+                try:
+                    if existing is None:
+                        created = await self.model_management.create_model(litellm_host, litellm_api_key, model, deadline=deadline)
+                        status[name] = _item_status("created", created_model_id(created), fingerprint)
+                    elif previous.get("hash") != fingerprint:
+                        model_id = existing["model_info"]["id"]
+                        await self.model_management.update_model(litellm_host, litellm_api_key, model_id, dict(model), deadline=deadline)
+                        status[name] = _item_status("updated", model_id, fingerprint)
+                    else:
+                        status[name] = _item_status("ready", existing["model_info"]["id"], fingerprint)
+                except Exception as e:
+                    logger.error(f"Failed to reconcile model {name} of set on {litellm_host}: {e}")
+                    status[name] = _item_status("failed", previous.get("model_id"), previous.get("hash", ""), str(e))
+
+        async def remove(name: str):
+            async with semaphore:
+                try:
+                    await self.model_management.delete_model_by_name(litellm_host, litellm_api_key, name,
+                                                                     model_id=item_status[name].get("model_id"), deadline=deadline)
+                    status[name] = None
+                except Exception as e:
+                    logger.error(f"Failed to delete model {name} removed from set on {litellm_host}: {e}")
+                    status[name] = _item_status("failed", item_status[name].get("model_id"), item_status[name].get("hash", ""), str(e))
+
+        removed = [name for name in item_status if name not in models]
+        await asyncio.gather(*[apply(name, model) for name, model in models.items()], *[remove(name) for name in removed])
+
+        if any(s is None or s["state"] != "ready" for s in status.values()):
+            self.inventory.invalidate(litellm_host)
+        return status
+
+    async def delete_set(self, litellm_host, litellm_api_key, item_status: Dict[str, Dict[str, str]],
+                         concurrency: int = 10, deadline: Optional[Deadline] = None):
+        """Delete every model registered by a set."""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def remove(name: str):
+            async with semaphore:
+                try:
+                    await self.model_management.delete_model_by_name(litellm_host, litellm_api_key, name,
+                                                                     model_id=(item_status[name] or {}).get("model_id"), deadline=deadline)
+                except Exception as e:
+                    logger.error(f"Failed to delete model {name} of set on {litellm_host}: {e}")
+
+        await asyncio.gather(*[remove(name) for name in item_status])
+        self.inventory.invalidate(litellm_host)
@@ -0,0 +1,96 @@
+from injector import Injector
+from kubernetes.client import ApiClient
+from loguru import logger
+import kopf
+import kr8s.asyncio
+import os
+
+from src.litellm_model_set.crd import LiteLLMModelSet
+from src.litellm_model_set.manager import ModelSetManagement, LiteLLMModelSetException, expand_models, set_fingerprint
+from src.http_client.deadline import Deadline
+from src.scheduler import ReconcileScheduler
+
+injector: Injector = None
+api: ApiClient = None
+
+def register_handlers(inj: Injector):
+    global injector, api
+    injector = inj
+    api = inj.get(ApiClient)
+    logger.info("Registering LiteLLMModelSet handlers...")
+    LiteLLMModelSet.install(api, exist_ok=True)
+
+
+def _deadline() -> Deadline:
+    # A set registers many models in one handler run, so it gets a whole reconcile interval by default
+    return Deadline.for_plugin("litellm_model_set", default=float(os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", 600)))
+
+
+async def _reconcile(spec, status, name, namespace):
+    try:
+        models = expand_models(spec)
+    except (LiteLLMModelSetException, KeyError) as e:
+        raise kopf.PermanentError(f"Invalid template of LiteLLMModelSet {namespace}/{name}: {e}")
+
+    item_status = dict(status.get('item_status') or {})
+    new_status = await injector.get(ModelSetManagement).reconcile(
+        spec['litellm_host'], spec['litellm_api_key'], models, item_status, spec.get('concurrency', 10), deadline=_deadline()
+    )
+    failed = [n for n, s in new_status.items() if s is not None and s['state'] == 'failed']
+    logger.info(f"LiteLLMModelSet {namespace}/{name}: {len(models)} models, {len(failed)} failed")
+
+    fingerprint = set_fingerprint(models)
+    if new_status != item_status or status.get('spec_hash') != fingerprint:
+        cr = [cr async for cr in kr8s.asyncio.get("LiteLLMModelSet.ops.veitosiander.de", name, namespace=namespace)][0]
+        await cr.patch({"status": {"item_status": new_status, "spec_hash": fingerprint}})
+    return failed
+
+
+@kopf.daemon("ops.veitosiander.de", "v1", "LiteLLMModelSet", cancellation_timeout=5.0)
+async def timer_fn(uid, stopped, **kwargs):
+    await injector.get(ReconcileScheduler).run("litellm_model_set", uid, stopped, lambda: reconcile_fn(**kwargs))
+
+
+async def reconcile_fn(spec, status, name, namespace, **kwargs):
+    if not status.get('spec_hash'):
+        logger.warning(f"LiteLLMModelSet {namespace}/{name} not reconciled yet, skipping timer.")
+        return
+
+    logger.info(f"Reconciling LiteLLMModelSet resource: {namespace}/{name}")
+    await _reconcile(spec, status, name, namespace)
+
+
+@kopf.on.delete("ops.veitosiander.de", "v1", "LiteLLMModelSet")
+async def delete_fn(spec, status, name, namespace, **kwargs):
+    logger.info(f"Deleting LiteLLMModelSet resource: {namespace}/{name}")
+    try:
+        await injector.get(ModelSetManagement).delete_set(
+            spec['litellm_host'], spec['litellm_api_key'], dict(status.get('item_status') or {}), spec.get('concurrency', 10), deadline=_deadline()
+        )
+        logger.info(f"LiteLLMModelSet {namespace}/{name} deleted successfully.")
+    except Exception as e:
+        logger.error(f"Failed to delete models of LiteLLMModelSet {namespace}/{name}: {e}")
+
+
+@kopf.on.update("ops.veitosiander.de", "v1", "LiteLLMModelSet")
+@kopf.on.create("ops.veitosiander.de", "v1", "LiteLLMModelSet")
+async def create_fn(spec, status, name, namespace, **kwargs):
+    try:
+        if status.get('spec_hash') and status['spec_hash'] == set_fingerprint(expand_models(spec)):
+            logger.debug(f"LiteLLMModelSet {namespace}/{name} unchanged, skipping.")
+            return {"status": "created"}
+    except (LiteLLMModelSetException, KeyError) as e:
+        raise kopf.PermanentError(f"Invalid template of LiteLLMModelSet {namespace}/{name}: {e}")
+
+    logger.info(f"Creating LiteLLMModelSet resource: {namespace}/{name}")
+    try:
+        failed = await _reconcile(spec, status, name, namespace)
+    except kopf.PermanentError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to reconcile LiteLLMModelSet {namespace}/{name}: {e}")
+        raise kopf.TemporaryError(f"Failed to reconcile model set: {e}", delay=30)
+
+    if failed:
+        logger.warning(f"Models {', '.join(failed)} of LiteLLMModelSet {namespace}/{name} failed, retrying on the next timer run.")
+    return {"status": "created"}
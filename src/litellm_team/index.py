@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from injector import singleton, inject
+from loguru import logger
+
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.singleflight import auth_identity
+
+
+class LiteLLMTeamIndexException(Exception):
+    pass
+
+
+class HostTeams:
+    """All teams of one LiteLLM proxy, indexed by team_id and team_alias."""
+
+    def __init__(self):
+        self.fetched_at = time.monotonic()
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_alias: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def add(self, team: Dict[str, Any]):
+        """Insert a team, or merge changed fields into the team with the same id."""
+        team_id = team.get("team_id")
+        if team_id is None:
+            return
+        previous = self.remove(team_id)
+        team = {**previous, **team} if previous else dict(team)
+        self.by_id[team_id] = team
+        if team.get("team_alias"):
+            self.by_alias[team["team_alias"]] = team
+
+    def remove(self, team_id: str) -> Optional[Dict[str, Any]]:
+        team = self.by_id.pop(team_id, None)
+        if team is not None and team.get("team_alias") and self.by_alias.get(team["team_alias"]) is team:
+            del self.by_alias[team["team_alias"]]
+        return team
+
+
+@singleton
+class TeamIndex:
+    """
+    Per-host index of LiteLLM teams for LiteLLMTeam reconciles.
+
+    /team/list is fetched at most once per TTL for each (host, credential). Teams created, updated or deleted
+    through the operator are applied to the index in place, so those writes never force a new download.
+
+    Environment Variables:
+    - LITELLM_TEAM_INDEX_TTL: Seconds an index is reused before /team/list is fetched again, 0 disables the index (default: 300)
+    """
+
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health/liveness")
+        self.ttl = float(os.getenv("LITELLM_TEAM_INDEX_TTL", "300"))
+
+        self._indexes: Dict[Tuple[str, str], HostTeams] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def _key(litellm_host: str, litellm_api_key: str) -> Tuple[str, str]:
+        return litellm_host.rstrip("/"), auth_identity({"Authorization": f"Bearer {litellm_api_key}"})
+
+    def _fresh(self, key: Tuple[str, str]) -> Optional[HostTeams]:
+        index = self._indexes.get(key)
+        if index is not None and time.monotonic() - index.fetched_at < self.ttl:
+            return index
+        return None
+
+    async def _fetch(self, litellm_host: str, litellm_api_key: str, deadline: Optional[Deadline]) -> HostTeams:
+        response = await self.http.get(
+            url=f"{litellm_host}/team/list",
+            headers={"Authorization": f"Bearer {litellm_api_key}"},
+            deadline=deadline
+        )
+        if response.status_code != 200:
+            raise LiteLLMTeamIndexException(f"Failed to list teams on {litellm_host}: {response.status_code} - {response.text}")
+
+        teams = response.json()
+        if isinstance(teams, dict):
+            teams = teams.get("teams", [])
+        index = HostTeams()
+        for team in teams:
+            if isinstance(team, dict):
+                index.add(team)
+        logger.debug(f"Indexed {len(index)} LiteLLM teams of {litellm_host}")
+        return index
+
+    async def snapshot(self, litellm_host: str, litellm_api_key: str, deadline: Optional[Deadline] = None) -> HostTeams:
+        """Return the team index of a host, fetching /team/list if it expired."""
+        key = self._key(litellm_host, litellm_api_key)
+        index = self._fresh(key)
+        if index is not None:
+            return index
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            index = self._fresh(key)
+            if index is None:
+                index = await self._fetch(litellm_host, litellm_api_key, deadline)
+                self._indexes[key] = index
+            return index
+
+    async def get_by_alias(self, litellm_host: str, litellm_api_key: str, team_alias: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        return (await self.snapshot(litellm_host, litellm_api_key, deadline=deadline)).by_alias.get(team_alias)
+
+    def cached(self, litellm_host: str, litellm_api_key: str, team_id: str) -> Optional[Dict[str, Any]]:
+        """Return a team from an index that is still fresh, without fetching anything."""
+        index = self._fresh(self._key(litellm_host, litellm_api_key))
+        return index.by_id.get(team_id) if index is not None else None
+
+    def record(self, litellm_host: str, team: Dict[str, Any]):
+        """Apply a created, fetched or updated team to every loaded index of the host."""
+        for index_key in [k for k in self._indexes if k[0] == litellm_host.rstrip("/")]:
+            self._indexes[index_key].add(team)
+
+    def forget(self, litellm_host: str, team_ids: List[str]):
+        """Drop deleted teams from every loaded index of the host."""
+        for (host, _), index in self._indexes.items():
+            if host == litellm_host.rstrip("/"):
+                for team_id in team_ids:
+                    index.remove(team_id)
@@ -1,32 +1,47 @@
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 from typing import Dict, Optional, List, Any
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_data, trace_response
+from src.litellm_key.index import KeyIndex
+from src.litellm_team.index import TeamIndex
 
 
 @singleton
 class TeamManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, http: HttpClient, key_index: KeyIndex, team_index: TeamIndex):
+        self.http = http.with_probe("/health/liveness")
+        self.key_index = key_index
+        self.team_index = team_index
 
-    def ping(self, litellm_host: str) -> bool:
+    async def ping(self, litellm_host: str, deadline: Optional[Deadline] = None) -> bool:
         """Check if LiteLLM service is available."""
         try:
-            response = requests.get(url=f"{litellm_host}/health/liveness")
+            response = await self.http.get(url=f"{litellm_host}/health/liveness", deadline=deadline)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to ping LiteLLM service: {e}")
             return False
 
-    def get_team_by_name(self, litellm_host: str, litellm_api_key: str, team_name: str) -> Optional[Dict[str, Any]]:
+    async def get_team_by_name(self, litellm_host: str, litellm_api_key: str, team_name: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Get team information by team name (alias)."""
         try:
-            response = requests.get(
+            if self.team_index.enabled:
+                team = await self.team_index.get_by_alias(litellm_host, litellm_api_key, team_name, deadline=deadline)
+                if team is None:
+                    logger.info(f"Team with name {team_name} not found")
+                return team
+
+            response = await self.http.get(
                 url=f"{litellm_host}/team/list",
-                headers={"Authorization": f"Bearer {litellm_api_key}"}
+                cached=True,
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                deadline=deadline
             )
 
-            logger.trace(f"List teams response: {response.status_code} - {response.text}")
+            trace_response("List teams", response)
 
             if response.status_code == 200:
                 teams_data = response.json()
@@ -50,8 +65,54 @@ class TeamManagement:
             logger.error(f"Exception while getting team by name {team_name}: {e}")
             return None
 
-    def create_team(self, litellm_host: str, litellm_api_key: str, team_name: str,
-                    max_budget: Optional[float] = None, budget_duration: Optional[str] = None) -> Dict[str, Any]:
+    async def get_team_by_id(self, litellm_host: str, litellm_api_key: str, team_id: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """Get team information by team ID, from the team index if it is loaded, otherwise from /team/info."""
+        team = self.team_index.cached(litellm_host, litellm_api_key, team_id)
+        if team is not None:
+            return team
+
+        try:
+            response = await self.http.get(
+                url=f"{litellm_host}/team/info",
+                params={"team_id": team_id},
+                headers={"Authorization": f"Bearer {litellm_api_key}"},
+                deadline=deadline
+            )
+
+            trace_response("Team info", response)
+
+            if response.status_code == 200:
+                team = {**response.json().get("team_info", {}), "team_id": team_id}
+                self.team_index.record(litellm_host, team)
+                return team
+            elif response.status_code in (400, 404):
+                logger.info(f"Team with ID {team_id} not found")
+                return None
+            else:
+                logger.error(f"Failed to get team {team_id}: {response.status_code} - {response.text}")
+                return None
+
+        except Exception as e:
+            logger.error(f"Exception while getting team by ID {team_id}: {e}")
+            return None
+
+    @staticmethod
+    def team_changes(team: Dict[str, Any], team_name: str, models: List[str],
+                     max_budget: Optional[float] = None, budget_duration: Optional[str] = None) -> List[str]:
+        """Names of the fields of a live team that differ from the desired ones."""
+        changes = []
+        if team.get("team_alias") != team_name:
+            changes.append("team_alias")
+        if sorted(team.get("models") or []) != sorted(models or []):
+            changes.append("models")
+        if max_budget is not None and (team.get("max_budget") is None or float(team["max_budget"]) != float(max_budget)):
+            changes.append("max_budget")
+        if budget_duration is not None and team.get("budget_duration") != budget_duration:
+            changes.append("budget_duration")
+        return changes
+
+    async def create_team(self, litellm_host: str, litellm_api_key: str, team_name: str,
+                    max_budget: Optional[float] = None, budget_duration: Optional[str] = None, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Create a new team."""
         try:
             team_data = {
@@ -64,17 +125,19 @@ class TeamManagement:
             if budget_duration is not None:
                 team_data["budget_duration"] = budget_duration
 
-            logger.trace(f"Creating team with data: {team_data}")
-            response = requests.post(
+            trace_data("Creating team with data", team_data)
+            response = await self.http.post(
                 url=f"{litellm_host}/team/new",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json=team_data
+                json=team_data,
+                deadline=deadline
             )
 
-            logger.trace(f"Create team response: {response.status_code} - {response.text}")
+            trace_response("Create team", response)
 
             if response.status_code == 200:
                 result = response.json()
+                self.team_index.record(litellm_host, result)
                 logger.info(f"Successfully created team {team_name}")
                 return result
             else:
@@ -85,9 +148,9 @@ class TeamManagement:
             logger.error(f"Exception while creating team: {e}")
             raise
 
-    def update_team(self, litellm_host: str, litellm_api_key: str, team_id: str,
+    async def update_team(self, litellm_host: str, litellm_api_key: str, team_id: str,
                     team_name: str, models: List[str], max_budget: Optional[float] = None,
-                    budget_duration: Optional[str] = None) -> Dict[str, Any]:
+                    budget_duration: Optional[str] = None, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Update an existing team."""
         try:
             team_data = {
@@ -102,17 +165,19 @@ class TeamManagement:
             if budget_duration is not None:
                 team_data["budget_duration"] = budget_duration
 
-            logger.trace(f"Updating team with data: {team_data}")
-            response = requests.post(
+            trace_data("Updating team with data", team_data)
+            response = await self.http.post(
                 url=f"{litellm_host}/team/update",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json=team_data
+                json=team_data,
+                deadline=deadline
             )
 
-            logger.trace(f"Update team response: {response.status_code} - {response.text}")
+            trace_response("Update team", response)
 
             if response.status_code == 200:
                 result = response.json()
+                self.team_index.record(litellm_host, team_data)
                 logger.info(f"Successfully updated team {team_id}")
                 return result
             else:
@@ -123,22 +188,26 @@ class TeamManagement:
             logger.error(f"Exception while updating team: {e}")
             raise
 
-    def add_models_to_team(self, litellm_host: str, litellm_api_key: str, team_id: str, models: List[str]) -> None:
+    async def add_models_to_team(self, litellm_host: str, litellm_api_key: str, team_id: str, models: List[str], deadline: Optional[Deadline] = None) -> None:
         """Add model permissions to a team."""
         try:
             logger.trace(f"Adding models {",".join(models)} to team {team_id}")
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{litellm_host}/team/model/add",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
                 json={
                     "team_id": team_id,
                     "models": models
-                }
+                },
+                deadline=deadline
             )
 
-            logger.trace(f"Add model response: {response.status_code} - {response.text}")
+            trace_response("Add model", response)
 
             if response.status_code == 200:
+                team = self.team_index.cached(litellm_host, litellm_api_key, team_id)
+                if team is not None:
+                    self.team_index.record(litellm_host, {"team_id": team_id, "models": sorted(set(team.get("models") or []) | set(models))})
                 logger.info(f"Successfully added models {",".join(models)} to team {team_id}")
             else:
                 logger.warning(f"Failed to add models {",".join(models)} to team: {response.status_code} - {response.text}")
@@ -147,7 +216,7 @@ class TeamManagement:
             logger.error(f"Exception while adding models to team: {e}")
             raise
 
-    def generate_team_key(self, litellm_host: str, litellm_api_key: str, team_id: str, key_alias: str) -> str:
+    async def generate_team_key(self, litellm_host: str, litellm_api_key: str, team_id: str, key_alias: str, deadline: Optional[Deadline] = None) -> str:
         """Generate an API key for a team."""
         try:
             key_data = {
@@ -156,17 +225,19 @@ class TeamManagement:
             }
 
             logger.trace(f"Generating key for team {team_id} with alias {key_alias}")
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{litellm_host}/key/generate",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json=key_data
+                json=key_data,
+                deadline=deadline
             )
 
-            logger.trace(f"Generate key response: {response.status_code} - {response.text}")
+            trace_response("Generate key", response)
 
             if response.status_code == 200:
                 result = response.json()
                 key_value = result.get("key")
+                self.key_index.record(litellm_host, result)
                 logger.info(f"Successfully generated key for team {team_id}")
                 return key_value
             else:
@@ -177,19 +248,21 @@ class TeamManagement:
             logger.error(f"Exception while generating team key: {e}")
             raise
 
-    def delete_team_key(self, litellm_host: str, litellm_api_key: str, key_alias: str) -> None:
+    async def delete_team_key(self, litellm_host: str, litellm_api_key: str, key_alias: str, deadline: Optional[Deadline] = None) -> None:
         """Delete an API key by alias."""
         try:
             logger.trace(f"Deleting key with alias {key_alias}")
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{litellm_host}/key/delete",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json={"key_aliases": [key_alias]}
+                json={"key_aliases": [key_alias]},
+                deadline=deadline
             )
 
-            logger.trace(f"Delete key response: {response.status_code} - {response.text}")
+            trace_response("Delete key", response)
 
             if response.status_code == 200:
+                self.key_index.forget(litellm_host, key_alias)
                 logger.info(f"Successfully deleted key with alias {key_alias}")
             else:
                 logger.warning(f"Failed to delete key with alias {key_alias}: {response.status_code} - {response.text}")
@@ -199,7 +272,7 @@ class TeamManagement:
             logger.warning(f"Exception while deleting key {key_alias}: {e}")
             # Don't raise exception - allow team deletion to proceed
 
-    def delete_team(self, litellm_host: str, litellm_api_key: str, team_id: str) -> None:
+    async def delete_team(self, litellm_host: str, litellm_api_key: str, team_id: str, deadline: Optional[Deadline] = None) -> None:
         """Delete a team."""
         try:
             team_data = {
@@ -207,15 +280,17 @@ class TeamManagement:
             }
 
             logger.trace(f"Deleting team {team_id}")
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{litellm_host}/team/delete",
                 headers={"Authorization": f"Bearer {litellm_api_key}"},
-                json=team_data
+                json=team_data,
+                deadline=deadline
             )
 
-            logger.trace(f"Delete team response: {response.status_code} - {response.text}")
+            trace_response("Delete team", response)
 
             if response.status_code == 200:
+                self.team_index.forget(litellm_host, [team_id])
                 logger.info(f"Successfully deleted team {team_id}")
             else:
                 logger.error(f"Failed to delete team: {response.status_code} - {response.text}")
@@ -1,12 +1,17 @@
+import asyncio
+from typing import Any, Dict, Optional
+
 from injector import Injector
 from kubernetes.client import ApiClient
 from loguru import logger
 import kopf
-import kr8s
+import kr8s.asyncio
 
 from src.litellm_key.manager import KeyManagement
 from src.litellm_team.crd import LiteLLMTeam
 from src.litellm_team.manager import TeamManagement
+from src.http_client.deadline import Deadline
+from src.http_client.metrics import RECONCILE_STEP_SECONDS
 
 injector: Injector = None
 api: ApiClient = None
@@ -21,8 +26,9 @@ def register_handlers(inj: Injector):
 
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "LiteLLMTeam")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, **kwargs):
     team_management = injector.get(TeamManagement)
+    deadline = Deadline.for_plugin("litellm_team")
 
     logger.info(f"Deleting LiteLLMTeam resource: {namespace}/{name} with spec: {spec}")
 
@@ -31,10 +37,10 @@ def delete_fn(spec, name, namespace, **kwargs):
         try:
             # Delete the team's API key first
             logger.info(f"Deleting team key with alias {spec['team_name']}")
-            team_management.delete_team_key(spec["litellm_host"], spec["litellm_api_key"], spec['team_name'])
+            await team_management.delete_team_key(spec["litellm_host"], spec["litellm_api_key"], spec['team_name'], deadline=deadline)
 
             # Then delete the team
-            team_management.delete_team(spec["litellm_host"], spec["litellm_api_key"], spec["team_id"])
+            await team_management.delete_team(spec["litellm_host"], spec["litellm_api_key"], spec["team_id"], deadline=deadline)
             logger.info(f"LiteLLMTeam {namespace}/{name} deleted successfully.")
         except Exception as e:
             logger.error(f"Failed to delete team {spec['team_id']}: {e}")
@@ -44,81 +50,82 @@ def delete_fn(spec, name, namespace, **kwargs):
 
 @kopf.on.update("ops.veitosiander.de", "v1", "LiteLLMTeam")
 @kopf.on.create("ops.veitosiander.de", "v1", "LiteLLMTeam")
-def create_fn(spec, name, namespace, **kwargs):
+async def create_fn(spec, name, namespace, **kwargs):
     team_management = injector.get(TeamManagement)
+    deadline = Deadline.for_plugin("litellm_team")
     key_management = injector.get(KeyManagement)
 
     logger.info(f"Creating LiteLLMTeam resource: {namespace}/{name} with spec: {spec}")
 
-    crs = list(kr8s.get("LiteLLMTeam.ops.veitosiander.de", name, namespace=namespace))
-    if len(crs) == 0:
-        logger.error(f"CR LiteLLMTeam {namespace}/{name} not found.")
-        raise kopf.TemporaryError(f"CR LiteLLMTeam {namespace}/{name} not found.", delay=30)
-
-    cr = crs[0]
-    logger.info(f"Fetched CR: {cr}")
+    host, master_key = spec["litellm_host"], spec["litellm_api_key"]
+    models = list(spec.get("models") or [])
+
+    def step(what: str):
+        return RECONCILE_STEP_SECONDS.labels(plugin="litellm_team", step=what).time()
+
+    async def lookup_team():
+        with step("lookup_team"):
+            # A known team ID is looked up directly, only first-time discovery needs the team list
+            if spec.get("team_id"):
+                team = await team_management.get_team_by_id(host, master_key, spec["team_id"], deadline=deadline)
+                if team is not None:
+                    return team
+            return await team_management.get_team_by_name(host, master_key, spec["team_name"], deadline=deadline)
+
+    async def lookup_key():
+        with step("lookup_key"):
+            return await key_management.get_key_by_alias(host, master_key, spec["team_name"], deadline=deadline)
+
+    async def sync_team(team: Dict[str, Any], team_id: str):
+        changes = team_management.team_changes(team, spec["team_name"], models, spec.get("max_budget"), spec.get("budget_duration"))
+        if not changes:
+            logger.info(f"Team {spec['team_name']} is up to date. Nothing to do...")
+            return
+        logger.info(f"Updating team {spec['team_name']} with ID {team_id}: {', '.join(changes)}...")
+        with step("update_team"):
+            await team_management.update_team(host, master_key, team_id, spec["team_name"], models,
+                                              spec.get("max_budget"), spec.get("budget_duration"), deadline=deadline)
+        if models:
+            logger.info(f"Adding models {models} to team...")
+            with step("add_models"):
+                await team_management.add_models_to_team(host, master_key, team_id, models, deadline=deadline)
+
+    async def ensure_key(key_obj: Optional[Dict[str, Any]], team_id: str) -> Optional[str]:
+        if key_obj is not None:
+            logger.info(f"Key already exists for team {spec['team_name']}...")
+            return None
+        logger.info(f"Generating new key for team {spec['team_name']}...")
+        with step("generate_key"):
+            return await team_management.generate_team_key(host, master_key, team_id, key_alias=spec["team_name"], deadline=deadline)
 
     try:
-        # Check if team already exists
-        team = team_management.get_team_by_name(spec["litellm_host"], spec["litellm_api_key"], spec["team_name"])
+        # The team and its key are looked up independently of each other
+        team, key_obj = await asyncio.gather(lookup_team(), lookup_key())
 
         if team is None:
-            # Create new team
             logger.info(f"Creating new team {spec['team_name']}...")
-            result = team_management.create_team(
-                spec["litellm_host"],
-                spec["litellm_api_key"],
-                spec["team_name"],
-                spec.get("max_budget"),
-                spec.get("budget_duration")
-            )
-            logger.info(f"Created team: {result}")
-            team_id = result.get("team_id")
-            logger.info(f"Created team with ID {team_id}")
-        else:
-            team_id = team.get("team_id")
-
-        logger.info(f"Updating team {spec['team_name']} with ID {team_id}...")
-        team_management.update_team(
-            spec["litellm_host"],
-            spec["litellm_api_key"],
-            team_id,
-            spec["team_name"],
-            spec.get("models", []),
-            spec.get("max_budget"),
-            spec.get("budget_duration")
-        )
-        logger.info(f"Updated existing team {spec['team_name']}")
-
-        # Add models to team
-        if spec.get("models"):
-            logger.info(f"Adding models {spec['models']} to team...")
-            team_management.add_models_to_team(
-                spec["litellm_host"],
-                spec["litellm_api_key"],
-                team_id,
-                spec["models"]
-            )
-
-        key_obj = key_management.get_key_by_alias(
-            spec["litellm_host"],
-            spec["litellm_api_key"],
-            spec["team_name"]
-        )
-        cr_spec = {"team_id": team_id}
-        if key_obj is None:
-            logger.info(f"Generating new key for team {spec['team_name']}...")
-            cr_spec["key_value"] = team_management.generate_team_key(
-                spec["litellm_host"],
-                spec["litellm_api_key"],
-                team_id,
-                key_alias=spec["team_name"],
-            )
-        else:
-            logger.info(f"Key already exists for team {spec['team_name']}...")
-
-        logger.info(f"Updating CR with team_id {team_id}...")
-        cr.patch({"spec": cr_spec})
+            with step("create_team"):
+                team = await team_management.create_team(host, master_key, spec["team_name"], spec.get("max_budget"),
+                                                         spec.get("budget_duration"), deadline=deadline)
+            logger.info(f"Created team: {team}")
+        team_id = team.get("team_id")
+
+        # Syncing the team and generating its key only share the team ID
+        _, key_value = await asyncio.gather(sync_team(team, team_id), ensure_key(key_obj, team_id))
+
+        cr_spec = {}
+        if spec.get("team_id") != team_id:
+            cr_spec["team_id"] = team_id
+        if key_value is not None:
+            cr_spec["key_value"] = key_value
+        if cr_spec:
+            crs = [o async for o in kr8s.asyncio.get("LiteLLMTeam.ops.veitosiander.de", name, namespace=namespace)]
+            if len(crs) == 0:
+                logger.error(f"CR LiteLLMTeam {namespace}/{name} not found.")
+                raise kopf.TemporaryError(f"CR LiteLLMTeam {namespace}/{name} not found.", delay=30)
+
+            logger.info(f"Updating CR with {', '.join(cr_spec)}...")
+            await crs[0].patch({"spec": cr_spec})
 
         logger.info(f"LiteLLMTeam {namespace}/{name} created successfully.")
     except Exception as e:
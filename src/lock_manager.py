@@ -1,6 +1,7 @@
+import asyncio
 import os
 import threading
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from typing import Optional
 from loguru import logger
 import redis
@@ -27,6 +28,7 @@ class LockManager:
         # In-memory locks dictionary
         self._memory_locks = {}
         self._memory_locks_lock = threading.Lock()
+        self._async_memory_locks = {}
         
         # Redis client
         self._redis_client: Optional[redis.Redis] = None
@@ -70,6 +72,12 @@ class LockManager:
                 self._memory_locks[key] = threading.Lock()
             return self._memory_locks[key]
     
+    def _get_async_memory_lock(self, key: str) -> asyncio.Lock:
+        """Get or create an in-memory asyncio lock for the given key."""
+        if key not in self._async_memory_locks:
+            self._async_memory_locks[key] = asyncio.Lock()
+        return self._async_memory_locks[key]
+
     @contextmanager
     def acquire_lock(self, key: str, blocking: bool = True, timeout: Optional[int] = None):
         """
@@ -139,6 +147,76 @@ class LockManager:
                     logger.error(f"Error releasing lock {key}: {e}")
 
 
+    @asynccontextmanager
+    async def acquire_lock_async(self, key: str, blocking: bool = True, timeout: Optional[int] = None):
+        """
+        Acquire a lock for the given key without blocking the event loop.
+
+        Same semantics as acquire_lock, for use from async handlers and managers.
+
+        Example:
+            async with lock_manager.acquire_lock_async("my_resource") as acquired:
+                # Critical section
+                pass
+        """
+        if timeout is None:
+            timeout = self.lock_timeout
+
+        lock_acquired = False
+        lock = None
+
+        try:
+            if self.provider == "redis" and self._redis_client:
+                # Redis distributed lock, acquired off the event loop. Acquire and release may run in
+                # different worker threads, so the token must not live in thread-local storage.
+                lock = RedisLock(
+                    self._redis_client,
+                    name=f"lock:{key}",
+                    timeout=timeout,
+                    blocking_timeout=timeout if blocking else 0.1,
+                    thread_local=False,
+                )
+                lock_acquired = await asyncio.to_thread(
+                    lock.acquire, blocking=blocking, blocking_timeout=timeout if blocking else 0.1
+                )
+
+                if lock_acquired:
+                    logger.debug(f"Acquired Redis lock: {key}")
+                else:
+                    logger.warning(f"Failed to acquire Redis lock: {key}")
+
+            else:
+                # In-memory lock
+                lock = self._get_async_memory_lock(key)
+                if blocking:
+                    try:
+                        await asyncio.wait_for(lock.acquire(), timeout=timeout)
+                        lock_acquired = True
+                    except asyncio.TimeoutError:
+                        lock_acquired = False
+                elif not lock.locked():
+                    await lock.acquire()
+                    lock_acquired = True
+
+                if lock_acquired:
+                    logger.debug(f"Acquired in-memory lock: {key}")
+                else:
+                    logger.warning(f"Failed to acquire in-memory lock: {key}")
+
+            yield lock_acquired
+
+        finally:
+            if lock_acquired and lock:
+                try:
+                    if self.provider == "redis" and isinstance(lock, RedisLock):
+                        await asyncio.to_thread(lock.release)
+                        logger.debug(f"Released Redis lock: {key}")
+                    elif isinstance(lock, asyncio.Lock):
+                        lock.release()
+                        logger.debug(f"Released in-memory lock: {key}")
+                except Exception as e:
+                    logger.error(f"Error releasing lock {key}: {e}")
+
 # Injector module for LockManager
 from injector import Module, provider, singleton as injector_singleton
 
@@ -1,4 +1,5 @@
 import logging
+import os
 import sys
 from loguru import logger
 
@@ -26,5 +27,6 @@ def setup_logging():
         logging.getLogger(name).handlers = []
         logging.getLogger(name).propagate = True
 
-    logger.configure(handlers=[{"sink": sys.stdout, "serialize": False, "colorize": True}])
+    level = os.getenv("LLM_OPERATOR_LOG_LEVEL", "DEBUG").upper()
+    logger.configure(handlers=[{"sink": sys.stdout, "serialize": False, "colorize": True, "level": level}])
 
@@ -1,15 +1,19 @@
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 import os
+from typing import Optional
+from src.http_client.client import HttpClient, HttpClientException
+from src.http_client.deadline import Deadline
 
 @singleton
 class AdminUserManagement:
-    def __init__(self):
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/healthz")
         self.request_timeout = int(os.getenv("N8N_REQUEST_TIMEOUT", "30"))
         pass
 
-    def create_admin_user(self, domain: str, email: str, first_name: str, last_name: str, password: str) -> bool:
+    async def create_admin_user(self, domain: str, email: str, first_name: str, last_name: str, password: str, deadline: Optional[Deadline] = None) -> bool:
         """Create admin user via N8N owner setup API"""
         try:
             url = f"{domain}/rest/owner/setup"
@@ -20,18 +24,18 @@ class AdminUserManagement:
                 "password": password
             }
             
-            response = requests.post(url, json=payload, timeout=self.request_timeout)
+            response = await self.http.post(url, json=payload, timeout=self.request_timeout, deadline=deadline)
             if response.status_code != 200:
                 logger.error(f"Failed to create admin user for {domain}: {response.status_code} - {response.text}")
                 return False
                 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error creating admin user for {domain}: {e}")
             return False
 
         return True
 
-    def login(self, domain: str, email: str, password: str) -> str:
+    async def login(self, domain: str, email: str, password: str, deadline: Optional[Deadline] = None) -> str:
         """Login to N8N and return auth cookie"""
         try:
             url = f"{domain}/rest/login"
@@ -40,7 +44,7 @@ class AdminUserManagement:
                 "password": password
             }
 
-            response = requests.post(url, json=payload, timeout=self.request_timeout)
+            response = await self.http.post(url, json=payload, timeout=self.request_timeout, deadline=deadline)
 
             if response.status_code != 200:
                 logger.error(f"No auth cookie received from {domain}")
@@ -51,7 +55,7 @@ class AdminUserManagement:
                 logger.info(f"Successfully logged in to {domain}")
                 return auth_cookie
 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error logging in to {domain}: {e}")
             return None
 
@@ -6,6 +6,7 @@ import kopf
 
 from src.n8n_admin_user.manager import AdminUserManagement
 from src.n8n_admin_user.crd import N8nAdminUser
+from src.http_client.deadline import Deadline
 
 injector: Injector = None
 api: ApiClient = None
@@ -18,26 +19,29 @@ def register_handlers(inj: Injector):
     N8nAdminUser.install(api, exist_ok=True)
 
 @kopf.on.create("ops.veitosiander.de", "v1", "N8nAdminUser")
-def create_fn(spec, name, namespace, **kwargs):
+async def create_fn(spec, name, namespace, **kwargs):
     admin_user_management = injector.get(AdminUserManagement)
+    deadline = Deadline.for_plugin("n8n_admin_user")
 
     logger.info(f"Trying to login to {spec['n8n_domain']} to check if admin user {spec['email']} already exists...")
-    auth_cookie = admin_user_management.login(
+    auth_cookie = await admin_user_management.login(
         domain=spec['n8n_domain'],
         email=spec['email'],
-        password=spec['password']
+        password=spec['password'],
+        deadline=deadline
     )
     if auth_cookie:
         logger.info(f"Admin user {spec['email']} already exists for {spec['n8n_domain']}. No action needed.")
         return {"status": "exists"}
 
     logger.info(f"Creating admin user {spec['email']} for {spec['n8n_domain']}...")
-    success = admin_user_management.create_admin_user(
+    success = await admin_user_management.create_admin_user(
         domain=spec['n8n_domain'],
         email=spec['email'],
         first_name=spec['first_name'],
         last_name=spec['last_name'],
-        password=spec['password']
+        password=spec['password'],
+        deadline=deadline
     )
 
     if success:
@@ -47,7 +51,7 @@ def create_fn(spec, name, namespace, **kwargs):
         raise PermanentError(f"Failed to create admin user for {spec['n8n_domain']}")
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "N8nAdminUser")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, **kwargs):
     logger.info(f"Deleting N8nAdminUser resource: {namespace}/{name}")
     
     # Note: N8N does not provide an API to delete admin users
@@ -1,8 +1,10 @@
 import kubecrd
 from dataclasses import dataclass, field
 
+from src.kube.status import ReconcileStatus
+
 @dataclass
-class N8nApiKey(kubecrd.KubeResourceBase):
+class N8nApiKey(ReconcileStatus, kubecrd.KubeResourceBase):
     __group__ = 'ops.veitosiander.de'
     __version__ = 'v1'
 
@@ -1,16 +1,20 @@
-from injector import singleton
-from kr8s.objects import Secret
+from injector import singleton, inject
+from kr8s.asyncio.objects import Secret
 from loguru import logger
-import requests
 import os
 import secrets
 import string
-import kr8s
+import kr8s.asyncio
 import base64
+from typing import Optional
+from src.http_client.client import HttpClient, HttpClientException
+from src.http_client.deadline import Deadline
 
 @singleton
 class ApiKeyManagement:
-    def __init__(self):
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/healthz")
         self.request_timeout = int(os.getenv("N8N_REQUEST_TIMEOUT", "30"))
         # Full scopes from the original shell script for non-enterprise customers
         self.n8n_scopes = [
@@ -25,7 +29,7 @@ class ApiKeyManagement:
         ]
         pass
 
-    def login(self, domain: str, email: str, password: str) -> str:
+    async def login(self, domain: str, email: str, password: str, deadline: Optional[Deadline] = None) -> str:
         """Login to N8N and return auth cookie"""
         try:
             url = f"{domain}/rest/login"
@@ -34,7 +38,7 @@ class ApiKeyManagement:
                 "password": password
             }
             
-            response = requests.post(url, json=payload, timeout=self.request_timeout)
+            response = await self.http.post(url, json=payload, timeout=self.request_timeout, deadline=deadline)
             
             if response.status_code != 200:
                 logger.error(f"No auth cookie received from {domain}")
@@ -45,7 +49,7 @@ class ApiKeyManagement:
                 logger.info(f"Successfully logged in to {domain}")
                 return auth_cookie
 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error logging in to {domain}: {e}")
             return None
 
@@ -56,7 +60,7 @@ class ApiKeyManagement:
         random_suffix = ''.join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(8))
         return f"{base_name}-{random_suffix}"
 
-    def create_api_key(self, domain: str, auth_cookie: str, unique_key_name: str) -> dict:
+    async def create_api_key(self, domain: str, auth_cookie: str, unique_key_name: str, deadline: Optional[Deadline] = None) -> dict:
         """Create API key via N8N API and return dict with api_key, unique_key_name, user_id, and id"""
         try:
             logger.info(f"Creating API key with name: {unique_key_name}")
@@ -74,7 +78,7 @@ class ApiKeyManagement:
                 "Cookie": f"n8n-auth={auth_cookie}"
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=self.request_timeout)
+            response = await self.http.post(url, json=payload, headers=headers, timeout=self.request_timeout, deadline=deadline)
             logger.debug(f"Create API key response: {response.status_code} - {response.text}")
 
             result = response.json()
@@ -100,11 +104,11 @@ class ApiKeyManagement:
             logger.error(f"Missing required fields in response from {domain}: {result}")
             return None
 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error creating API key for {domain}: {e}")
             return None
 
-    def delete_api_key(self, domain: str, auth_cookie: str, key_id: str) -> bool:
+    async def delete_api_key(self, domain: str, auth_cookie: str, key_id: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete API key via N8N API"""
         try:
             url = f"{domain}/rest/api-keys/{key_id}"
@@ -112,7 +116,7 @@ class ApiKeyManagement:
                 "Cookie": f"n8n-auth={auth_cookie}"
             }
             
-            response = requests.delete(url, headers=headers, timeout=self.request_timeout)
+            response = await self.http.delete(url, headers=headers, timeout=self.request_timeout, deadline=deadline)
 
             logger.debug(f"Delete API key response: {response.status_code} - {response.text}")
             
@@ -123,24 +127,24 @@ class ApiKeyManagement:
                 logger.error(f"Failed to delete API key {key_id} from {domain}: {response.status_code} - {response.text}")
                 return False
                 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error deleting API key {key_id} from {domain}: {e}")
             return False
 
-    def create_k8s_secret(self, secret_name: str, namespace: str, api_key: str, api_key_name: str, api_key_id: str, user_id: str) -> bool:
+    async def create_k8s_secret(self, secret_name: str, namespace: str, api_key: str, api_key_name: str, api_key_id: str, user_id: str) -> bool:
         """Create Kubernetes secret with all N8N API key metadata"""
         try:
             # Delete existing secret if it exists
             try:
-                existing_secrets = list(kr8s.get("secrets", secret_name, namespace=namespace))
+                existing_secrets = [s async for s in kr8s.asyncio.get("secrets", secret_name, namespace=namespace)]
                 if existing_secrets:
-                    existing_secrets[0].delete()
+                    await existing_secrets[0].delete()
                     logger.info(f"Deleted existing secret {secret_name} in namespace {namespace}")
             except Exception as e:
                 logger.debug(f"No existing secret to delete: {e}")
             
             # Create new secret with base64 encoded data
-            Secret({
+            secret = await Secret({
                 "apiVersion": "v1",
                 "kind": "Secret",
                 "metadata": {
@@ -153,7 +157,8 @@ class ApiKeyManagement:
                     "api-key-id": base64.b64encode(api_key_id.encode()).decode(),
                     "user-id": base64.b64encode(user_id.encode()).decode()
                 }
-            }).create()
+            })
+            await secret.create()
             logger.info(f"Successfully created secret {secret_name} in namespace {namespace}")
             logger.info(f"Secret contains: api-key, api-key-name ({api_key_name}), api-key-id ({api_key_id}), user-id ({user_id})")
             return True
@@ -162,12 +167,12 @@ class ApiKeyManagement:
             logger.error(f"Error creating Kubernetes secret {secret_name}: {e}")
             return False
 
-    def delete_k8s_secret(self, secret_name: str, namespace: str) -> bool:
+    async def delete_k8s_secret(self, secret_name: str, namespace: str) -> bool:
         """Delete Kubernetes secret"""
         try:
-            secrets = list(kr8s.get("secrets", secret_name, namespace=namespace))
+            secrets = [s async for s in kr8s.asyncio.get("secrets", secret_name, namespace=namespace)]
             if secrets:
-                secrets[0].delete()
+                await secrets[0].delete()
                 logger.info(f"Successfully deleted secret {secret_name} from namespace {namespace}")
             else:
                 logger.info(f"Secret {secret_name} not found in namespace {namespace}, nothing to delete")
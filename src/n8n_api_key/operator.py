@@ -2,11 +2,12 @@ from injector import Injector
 from kubernetes.client import ApiClient
 from loguru import logger
 import kopf
-import kr8s
-import os
+import kr8s.asyncio
 
 from src.n8n_api_key.manager import ApiKeyManagement
 from src.n8n_api_key.crd import N8nApiKey
+from src.http_client.deadline import Deadline
+from src.scheduler import ReconcileScheduler
 
 injector: Injector = None
 api: ApiClient = None
@@ -19,8 +20,9 @@ def register_handlers(inj: Injector):
     N8nApiKey.install(api, exist_ok=True)
 
 @kopf.on.create("ops.veitosiander.de", "v1", "N8nApiKey")
-def create_fn(spec, name, namespace, **kwargs):
+async def create_fn(spec, name, namespace, **kwargs):
     api_key_management = injector.get(ApiKeyManagement)
+    deadline = Deadline.for_plugin("n8n_api_key")
 
     logger.info(f"Creating N8nApiKey resource: {namespace}/{name}")
 
@@ -31,10 +33,11 @@ def create_fn(spec, name, namespace, **kwargs):
 
         # Step 2: Login to N8N
         logger.info(f"Logging in to N8N at {spec['n8n_domain']}...")
-        auth_cookie = api_key_management.login(
+        auth_cookie = await api_key_management.login(
             domain=spec['n8n_domain'],
             email=spec['email'],
-            password=spec['password']
+            password=spec['password'],
+            deadline=deadline
         )
         
         if not auth_cookie:
@@ -42,10 +45,11 @@ def create_fn(spec, name, namespace, **kwargs):
 
         # Step 3: Create API key
         logger.info(f"Creating API key {unique_key_name} for {spec['n8n_domain']}...")
-        api_key_data = api_key_management.create_api_key(
+        api_key_data = await api_key_management.create_api_key(
             domain=spec['n8n_domain'],
             auth_cookie=auth_cookie,
-            unique_key_name=unique_key_name
+            unique_key_name=unique_key_name,
+            deadline=deadline
         )
         
         if not api_key_data:
@@ -59,7 +63,7 @@ def create_fn(spec, name, namespace, **kwargs):
 
         # Step 4: Create Kubernetes secret
         logger.info(f"Creating Kubernetes secret {spec['secret_name']} in namespace {spec['secret_namespace']}...")
-        secret_success = api_key_management.create_k8s_secret(
+        secret_success = await api_key_management.create_k8s_secret(
             secret_name=spec['secret_name'],
             namespace=spec['secret_namespace'],
             api_key=api_key,
@@ -73,8 +77,8 @@ def create_fn(spec, name, namespace, **kwargs):
 
         # Step 5: Update CRD with all N8N API response fields
         logger.info(f"Updating CRD with N8N API key metadata...")
-        cr = list(kr8s.get("N8nApiKey.ops.veitosiander.de", name, namespace=namespace))[0]
-        cr.patch({
+        cr = [cr async for cr in kr8s.asyncio.get("N8nApiKey.ops.veitosiander.de", name, namespace=namespace)][0]
+        await cr.patch({
             "spec": {
                 "n8n_api_key_name": actual_key_name,
                 "user_id": user_id,
@@ -92,8 +96,9 @@ def create_fn(spec, name, namespace, **kwargs):
         raise kopf.TemporaryError(f"Failed to create N8nApiKey: {e}", delay=30)
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "N8nApiKey")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, **kwargs):
     api_key_management = injector.get(ApiKeyManagement)
+    deadline = Deadline.for_plugin("n8n_api_key")
 
     logger.info(f"Deleting N8nApiKey resource: {namespace}/{name}")
     
@@ -103,17 +108,19 @@ def delete_fn(spec, name, namespace, **kwargs):
             logger.info(f"Deleting API key with ID {spec['api_key_id']} from N8N at {spec['n8n_domain']}...")
             
             # Login to N8N
-            auth_cookie = api_key_management.login(
+            auth_cookie = await api_key_management.login(
                 domain=spec['n8n_domain'],
                 email=spec['email'],
-                password=spec['password']
+                password=spec['password'],
+                deadline=deadline
             )
             
             if auth_cookie:
-                api_key_deleted = api_key_management.delete_api_key(
+                api_key_deleted = await api_key_management.delete_api_key(
                     domain=spec['n8n_domain'],
                     auth_cookie=auth_cookie,
-                    key_id=spec['api_key_id']
+                    key_id=spec['api_key_id'],
+                    deadline=deadline
                 )
                 
                 if api_key_deleted:
@@ -125,24 +132,26 @@ def delete_fn(spec, name, namespace, **kwargs):
         elif spec.get('n8n_api_key_name'):
             # Backward compatibility - fallback to using key name if no ID (shouldn't happen with new implementation)
             logger.warning(f"No api_key_id found, attempting fallback deletion using key name {spec['n8n_api_key_name']}")
-            auth_cookie = api_key_management.login(
+            auth_cookie = await api_key_management.login(
                 domain=spec['n8n_domain'],
                 email=spec['email'],
-                password=spec['password']
+                password=spec['password'],
+                deadline=deadline
             )
             
             if auth_cookie:
-                api_key_deleted = api_key_management.delete_api_key(
+                api_key_deleted = await api_key_management.delete_api_key(
                     domain=spec['n8n_domain'],
                     auth_cookie=auth_cookie,
-                    key_id=spec['n8n_api_key_name']
+                    key_id=spec['n8n_api_key_name'],
+                    deadline=deadline
                 )
                 logger.info(f"Fallback deletion result: {api_key_deleted}")
         else:
             logger.info(f"No API key ID or name stored in CRD, skipping N8N API key deletion")
 
         # Delete the Kubernetes secret
-        success = api_key_management.delete_k8s_secret(
+        success = await api_key_management.delete_k8s_secret(
             secret_name=spec['secret_name'],
             namespace=spec['secret_namespace']
         )
@@ -157,11 +166,17 @@ def delete_fn(spec, name, namespace, **kwargs):
     except Exception as e:
         logger.error(f"Error during N8nApiKey deletion for {namespace}/{name}: {e}")
 
-@kopf.on.timer("ops.veitosiander.de", "v1", "N8nApiKey", interval=os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", 600))
-def timer_fn(spec, name, namespace, **kwargs):
-    """Reconcile N8nApiKey resources by ensuring the Kubernetes secret exists"""
+@kopf.daemon("ops.veitosiander.de", "v1", "N8nApiKey", cancellation_timeout=5.0)
+async def timer_fn(uid, name, namespace, stopped, **kwargs):
+    await injector.get(ReconcileScheduler).run("n8n_api_key", uid, stopped, lambda: reconcile_fn(name=name, namespace=namespace, **kwargs),
+                                               resource="N8nApiKey.ops.veitosiander.de", name=name, namespace=namespace)
+
+
+async def reconcile_fn(spec, name, namespace, **kwargs):
+    """Reconcile N8nApiKey resources by ensuring the Kubernetes secret exists. Returns whether it was in sync."""
     logger.info(f"Reconciling N8nApiKey resource: {namespace}/{name}")
     api_key_management = injector.get(ApiKeyManagement)
+    deadline = Deadline.for_plugin("n8n_api_key")
 
     if not spec.get('n8n_api_key_name'):
         logger.warning(f"No n8n_api_key_name in spec for {namespace}/{name}, skipping reconciliation")
@@ -169,11 +184,11 @@ def timer_fn(spec, name, namespace, **kwargs):
     
     try:
         # Check if the Kubernetes secret exists using kr8s
-        secrets = list(kr8s.get("secrets", spec['secret_name'], namespace=spec['secret_namespace']))
+        secrets = [o async for o in kr8s.asyncio.get("secrets", spec['secret_name'], namespace=spec['secret_namespace'])]
         
         if secrets:
             logger.info(f"Secret {spec['secret_name']} exists in namespace {spec['secret_namespace']}. Nothing to do.")
-            return
+            return True
 
         logger.warning(f"Secret {spec['secret_name']} not found in namespace {spec['secret_namespace']}. Recreating...")
         
@@ -182,17 +197,18 @@ def timer_fn(spec, name, namespace, **kwargs):
         logger.info(f"Generated new unique key name for recreation: {unique_key_name}")
         
         # Login to N8N
-        auth_cookie = api_key_management.login(domain=spec['n8n_domain'], email=spec['email'], password=spec['password'])
+        auth_cookie = await api_key_management.login(domain=spec['n8n_domain'], email=spec['email'], password=spec['password'], deadline=deadline)
 
         if not auth_cookie:
             logger.error(f"Failed to authenticate with N8N for secret recreation")
-            return
+            return False
 
         # Create new API key
-        api_key_data = api_key_management.create_api_key(
+        api_key_data = await api_key_management.create_api_key(
             domain=spec['n8n_domain'], 
             auth_cookie=auth_cookie, 
-            unique_key_name=unique_key_name
+            unique_key_name=unique_key_name,
+            deadline=deadline
         )
         
         if api_key_data:
@@ -203,7 +219,7 @@ def timer_fn(spec, name, namespace, **kwargs):
             api_key_id = api_key_data["id"]
             
             # Create secret with all metadata
-            api_key_management.create_k8s_secret(
+            await api_key_management.create_k8s_secret(
                 secret_name=spec['secret_name'], 
                 namespace=spec['secret_namespace'], 
                 api_key=api_key,
@@ -213,8 +229,8 @@ def timer_fn(spec, name, namespace, **kwargs):
             )
             
             # Update CRD with all new fields
-            cr = list(kr8s.get("N8nApiKey.ops.veitosiander.de", name, namespace=namespace))[0]
-            cr.patch({
+            cr = [cr async for cr in kr8s.asyncio.get("N8nApiKey.ops.veitosiander.de", name, namespace=namespace)][0]
+            await cr.patch({
                 "spec": {
                     "n8n_api_key_name": actual_key_name,
                     "user_id": user_id,
@@ -229,3 +245,5 @@ def timer_fn(spec, name, namespace, **kwargs):
                 
     except Exception as e:
         logger.error(f"Error during N8nApiKey reconciliation for {namespace}/{name}: {e}")
+
+    return False
@@ -1,10 +1,29 @@
 import kubecrd
 from dataclasses import dataclass, field
 
+from src.kube.status import ReconcileStatus
+
 @dataclass
-class OllamaModel(kubecrd.KubeResourceBase):
+class OllamaModel(ReconcileStatus, kubecrd.KubeResourceBase):
     __group__ = 'ops.veitosiander.de'
     __version__ = 'v1'
+    # Progress of the background pull, written by the PullTracker
+    __status_fields__ = {
+        "pull": {
+            "type": "object",
+            "properties": {
+                "state": {"type": "string", "description": "queued, pulling, succeeded or failed."},
+                "queue_position": {"type": "integer", "description": "Position in the Ollama host's pull queue while queued."},
+                "waited": {"type": "integer", "description": "Seconds the pull waited in the queue before it started."},
+                "model": {"type": "string", "description": "The model:tag being pulled."},
+                "digest": {"type": "string", "description": "Digest of the layer currently being downloaded."},
+                "completed": {"type": "integer", "description": "Bytes of the current layer downloaded."},
+                "total": {"type": "integer", "description": "Total bytes of the current layer."},
+                "error": {"type": "string", "description": "Why the last pull failed."},
+                "updated": {"type": "string", "description": "Time of the last progress update."},
+            },
+        },
+    }
 
     ollama_host: str
 
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from injector import singleton, inject
+from loguru import logger
+
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+
+
+class OllamaModelInventoryException(Exception):
+    pass
+
+
+class HostModels:
+    """Snapshot of one Ollama server's /api/tags, indexed by name:tag and digest."""
+
+    def __init__(self, models: list):
+        self.fetched_at = time.monotonic()
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self.by_digest: Dict[str, List[Dict[str, Any]]] = {}
+        for model in models:
+            name = model.get("name") or model.get("model")
+            if name is None:
+                continue
+            self.by_name[name] = model
+            if model.get("digest"):
+                self.by_digest.setdefault(model["digest"], []).append(model)
+
+    def __len__(self):
+        return len(self.by_name)
+
+
+@singleton
+class ModelInventory:
+    """
+    Per-host inventory of the models present on Ollama servers, shared by all OllamaModel reconciles.
+
+    /api/tags is downloaded at most once per TTL for each host and presence checks are dictionary
+    lookups against that snapshot. Concurrent refreshes of the same host wait for one download.
+
+    Environment Variables:
+    - OLLAMA_INVENTORY_TTL: Seconds a snapshot is reused (default: LLM_OPERATOR_RECONCILE_INTERVAL or 600)
+    """
+
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/api/version")
+        self.ttl = float(os.getenv("OLLAMA_INVENTORY_TTL", os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", "600")))
+
+        self._snapshots: Dict[str, HostModels] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _fresh(self, host: str) -> Optional[HostModels]:
+        snapshot = self._snapshots.get(host)
+        if snapshot is not None and time.monotonic() - snapshot.fetched_at < self.ttl:
+            return snapshot
+        return None
+
+    async def snapshot(self, ollama_host: str, deadline: Optional[Deadline] = None) -> HostModels:
+        """Return the current inventory of a host, downloading /api/tags if the snapshot expired."""
+        host = ollama_host.rstrip("/")
+        snapshot = self._fresh(host)
+        if snapshot is not None:
+            return snapshot
+
+        async with self._locks.setdefault(host, asyncio.Lock()):
+            # Another reconcile may have refreshed it while we waited
+            snapshot = self._fresh(host)
+            if snapshot is not None:
+                return snapshot
+
+            response = await self.http.get(url=f"{host}/api/tags", timeout=30, deadline=deadline)
+            if response.status_code != 200:
+                raise OllamaModelInventoryException(f"Failed to list models on {host}: {response.status_code} - {response.text}")
+
+            snapshot = HostModels(response.json().get("models") or [])
+            self._snapshots[host] = snapshot
+            logger.debug(f"Refreshed Ollama model inventory of {host}: {len(snapshot)} models")
+            return snapshot
+
+    async def get_by_name(self, ollama_host: str, name: str, tag: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """Look up a model by name and tag."""
+        return (await self.snapshot(ollama_host, deadline=deadline)).by_name.get(f"{name}:{tag}")
+
+    async def get_by_digest(self, ollama_host: str, digest: str, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        """Look up all names of a model by its digest."""
+        return list((await self.snapshot(ollama_host, deadline=deadline)).by_digest.get(digest, []))
+
+    def invalidate(self, ollama_host: str):
+        """Drop the snapshot of a host after the operator pulled or deleted a model."""
+        self._snapshots.pop(ollama_host.rstrip("/"), None)
@@ -1,21 +1,47 @@
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.http_client.client import HttpClient, HttpClientException
+from src.http_client.deadline import Deadline
+from src.ollama_model.inventory import ModelInventory, OllamaModelInventoryException
 
 
 @singleton
 class ModelManagement:
-    def __init__(self):
+    """
+    Ollama model lookups, pulls and deletion.
+
+    Presence checks are answered from the per-host /api/tags inventory; /api/show is only used by get_model,
+    when a model's details are needed.
+
+    Environment Variables:
+    - OLLAMA_PULL_TIMEOUT: Seconds a pull may go without progress from Ollama before it is aborted (default: 600)
+    """
+
+    @inject
+    def __init__(self, http: HttpClient, inventory: ModelInventory):
+        self.http = http.with_probe("/api/version")
+        self.inventory = inventory
         self.pull_timeout = int(os.getenv("OLLAMA_PULL_TIMEOUT", "600"))
-        pass
 
-    def get_model(self, ollama_host: str, name: str, tag: str):
+    async def has_model(self, ollama_host: str, name: str, tag: str, deadline: Optional[Deadline] = None) -> bool:
+        """Check if a model is present on the Ollama server"""
+        try:
+            if await self.inventory.get_by_name(ollama_host, name, tag, deadline=deadline) is not None:
+                return True
+        except (OllamaModelInventoryException, HttpClientException) as e:
+            logger.warning(f"Failed to list models on {ollama_host}, checking {name}:{tag} directly: {e}")
+
+        # The snapshot may predate a pull from outside the operator, confirm misses before pulling again
+        return await self.get_model(ollama_host, name, tag, deadline=deadline) is not None
+
+    async def get_model(self, ollama_host: str, name: str, tag: str, deadline: Optional[Deadline] = None):
         """Get model information from Ollama API"""
         try:
             url = f"{ollama_host}/api/show"
             payload = {"model": f"{name}:{tag}"}
-            response = requests.post(url, json=payload, timeout=30)
+            response = await self.http.post(url, json=payload, timeout=30, deadline=deadline)
 
             if response.status_code == 200:
                 logger.info(f"Successfully retrieved model info for {name}")
@@ -27,18 +53,19 @@ class ModelManagement:
                 logger.error(f"Failed to get model {name}: {response.status_code} - {response.text}")
                 return None
 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error connecting to Ollama at {ollama_host}: {e}")
             return None
 
-    def delete_model(self, ollama_host: str, name: str, tag: str):
+    async def delete_model(self, ollama_host: str, name: str, tag: str, deadline: Optional[Deadline] = None):
         """Delete a model from Ollama"""
         try:
             url = f"{ollama_host}/api/delete"
             payload = {"model": f"{name}:{tag}"}
-            response = requests.delete(url, json=payload, timeout=30)
+            response = await self.http.delete(url, json=payload, timeout=30, deadline=deadline)
 
             if response.status_code == 200:
+                self.inventory.invalidate(ollama_host)
                 logger.info(f"Successfully deleted model {name}")
                 return True
             elif response.status_code == 404:
@@ -48,27 +75,39 @@ class ModelManagement:
                 logger.error(f"Failed to delete model {name}: {response.status_code} - {response.text}")
                 return False
 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error connecting to Ollama at {ollama_host}: {e}")
             return False
 
-    def pull_model(self, ollama_host: str, name: str, tag: str):
-        """Pull a model from Ollama registry"""
+    async def pull_model(self, ollama_host: str, name: str, tag: str,
+                         on_progress: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None):
+        """
+        Pull a model from Ollama registry, following Ollama's streamed progress.
+
+        on_progress is awaited with every progress line ({"status", "digest", "total", "completed"}). The pull
+        is aborted when Ollama sends nothing for OLLAMA_PULL_TIMEOUT seconds.
+        """
         try:
             # Format model name with tag
             model_name = f"{name}:{tag}"
 
+            async def progress(item):
+                if on_progress is not None and isinstance(item, dict):
+                    await on_progress(item)
+
             url = f"{ollama_host}/api/pull"
-            payload = {"model": model_name, "stream": False}
-            response = requests.post(url, json=payload, timeout=self.pull_timeout)  # Longer timeout for model downloads
+            payload = {"model": model_name, "stream": True}
+            response = await self.http.stream_json_lines("POST", url, progress, json=payload, idle_timeout=self.pull_timeout)
 
-            if response.status_code == 200 and response.json().get("status") == "success":
+            last = response.matches[-1] if response.matches else {}
+            if response.status_code == 200 and last.get("status") == "success":
+                self.inventory.invalidate(ollama_host)
                 logger.info(f"Successfully pulled model {model_name}")
                 return True
 
-            logger.error(f"Failed to pull model {model_name} for {ollama_host}: {response.status_code} - {response.text}")
+            logger.error(f"Failed to pull model {model_name} for {ollama_host}: {response.status_code} - {last.get('error') or response.text}")
             return False
 
-        except requests.RequestException as e:
+        except HttpClientException as e:
             logger.error(f"Error connecting to Ollama at {ollama_host}: {e}")
             return False
@@ -2,11 +2,12 @@ from injector import Injector
 from kubernetes.client import ApiClient
 from loguru import logger
 import kopf
-import kr8s
-import os
 
 from src.ollama_model.manager import ModelManagement
 from src.ollama_model.crd import OllamaModel
+from src.ollama_model.pulls import PullTracker
+from src.http_client.deadline import Deadline
+from src.scheduler import ReconcileScheduler
 
 injector: Injector = None
 api: ApiClient = None
@@ -18,34 +19,47 @@ def register_handlers(inj: Injector):
     logger.info("Registering OllamaModel handlers...")
     OllamaModel.install(api, exist_ok=True)
 
-@kopf.on.timer("ops.veitosiander.de", "v1", "OllamaModel", interval=os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", 600))
-def timer_fn(spec, name, namespace, **kwargs):
+@kopf.daemon("ops.veitosiander.de", "v1", "OllamaModel", cancellation_timeout=5.0)
+async def timer_fn(uid, name, namespace, stopped, **kwargs):
+    await injector.get(ReconcileScheduler).run("ollama_model", uid, stopped, lambda: reconcile_fn(name=name, namespace=namespace, uid=uid, **kwargs),
+                                               resource="OllamaModel.ops.veitosiander.de", name=name, namespace=namespace)
+
+
+async def reconcile_fn(spec, name, namespace, uid, **kwargs):
+    """Start pulling the model if it is missing. Returns whether it was in sync, None if it was not checked."""
     if not spec.get('model') or not spec.get('ollama_host'):
         logger.warning(f"Model or ollama_host not specified for {namespace}/{name}, skipping reconciliation.")
         return
 
     logger.info(f"Reconciling OllamaModel resource: {namespace}/{name}")
     model_management = injector.get(ModelManagement)
+    pulls = injector.get(PullTracker)
+    deadline = Deadline.for_plugin("ollama_model")
+    if not model_management.http.available(spec['ollama_host']):
+        logger.warning(f"Circuit for {spec['ollama_host']} is open, skipping reconciliation of {namespace}/{name} until it recovers.")
+        return
+    if pulls.running(uid):
+        logger.info(f"Model {spec['model']} is still queued or being pulled for {namespace}/{name}...")
+        return False
     
     # Check if model exists on Ollama server
-    model_info = model_management.get_model(spec['ollama_host'], spec['model'], spec['tag'])
-    if model_info is not None:
+    if await model_management.has_model(spec['ollama_host'], spec['model'], spec['tag'], deadline=deadline):
         logger.info(f"Model {spec['model']} exists on Ollama server. Nothing to do...")
+        return True
     else:
         logger.info(f"Model {spec['model']} does not exist. Pulling model...")
-        success = model_management.pull_model(spec['ollama_host'], spec['model'], spec.get('tag', 'latest'))
-        if success:
-            logger.info(f"Successfully pulled model {spec['model']} for {namespace}/{name}")
-        else:
-            logger.error(f"Failed to pull model {spec['model']} for {namespace}/{name}")
+        await pulls.start(uid, name, namespace, spec['ollama_host'], spec['model'], spec.get('tag', 'latest'))
+        return False
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "OllamaModel")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, uid, **kwargs):
     model_management = injector.get(ModelManagement)
+    deadline = Deadline.for_plugin("ollama_model")
+    injector.get(PullTracker).cancel(uid)
 
     logger.info(f"Deleting OllamaModel resource: {namespace}/{name}")
     try:
-        success = model_management.delete_model(spec['ollama_host'], spec['model'], spec['tag'])
+        success = await model_management.delete_model(spec['ollama_host'], spec['model'], spec['tag'], deadline=deadline)
         if success:
             logger.info(f"OllamaModel {namespace}/{name} deleted successfully.")
         else:
@@ -55,27 +69,22 @@ def delete_fn(spec, name, namespace, **kwargs):
 
 @kopf.on.update("ops.veitosiander.de", "v1", "OllamaModel")
 @kopf.on.create("ops.veitosiander.de", "v1", "OllamaModel")
-def create_fn(spec, name, namespace, **kwargs):
+async def create_fn(spec, name, namespace, uid, **kwargs):
     model_management = injector.get(ModelManagement)
+    deadline = Deadline.for_plugin("ollama_model")
 
     logger.info(f"Creating OllamaModel resource: {namespace}/{name}")
 
     try:
         # Check if model already exists
-        model_info = model_management.get_model(spec['ollama_host'], spec['model'], spec['tag'])
-        if model_info is not None:
+        if await model_management.has_model(spec['ollama_host'], spec['model'], spec['tag'], deadline=deadline):
             logger.info(f"Model {spec['model']} already exists on Ollama server. Nothing to do.")
             return {"status": "created"}
 
-        # Pull the model
+        # Queue the model for a background pull, its progress is tracked in status.pull
         logger.info(f"Pulling model {spec['model']}:{spec.get('tag', 'latest')}...")
-        success = model_management.pull_model(spec['ollama_host'], spec['model'], spec.get('tag', 'latest'))
-        
-        if success:
-            logger.info(f"OllamaModel {namespace}/{name} created successfully.")
-            return {"status": "created"}
-        else:
-            raise Exception(f"Failed to pull model {spec['model']}")
+        await injector.get(PullTracker).start(uid, name, namespace, spec['ollama_host'], spec['model'], spec.get('tag', 'latest'))
+        return {"status": "queued"}
             
     except Exception as e:
         logger.error(f"Failed to create model for {namespace}/{name}: {e}")
@@ -0,0 +1,231 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import kr8s.asyncio
+from injector import singleton, inject
+from loguru import logger
+from prometheus_client import Gauge, Histogram
+
+from src.ollama_model.manager import ModelManagement
+
+RESOURCE = "OllamaModel.ops.veitosiander.de"
+
+OLLAMA_PULLS = Gauge(
+    "llm_operator_ollama_pulls",
+    "Ollama pulls per host that are queued or running.",
+    ["host", "state"],
+)
+OLLAMA_PULL_WAIT = Histogram(
+    "llm_operator_ollama_pull_wait_seconds",
+    "Time an Ollama pull waited in its host's queue before it started.",
+    ["host"],
+    buckets=[1, 5, 15, 60, 300, 900, 1800, 3600, 7200],
+)
+
+
+class PullProgress:
+    """Progress of one background pull as seen by one OllamaModel, written to its status.pull at a throttled rate."""
+
+    def __init__(self, name: str, namespace: str, model: str, interval: float):
+        self.name = name
+        self.namespace = namespace
+        self.model = model
+        self.interval = interval
+        self.status: Dict[str, Any] = {"state": "queued", "model": model, "error": None}
+        self._written_at = 0.0
+
+    async def queued(self, position: int):
+        self.status.update(state="queued", queue_position=position)
+        await self.write()
+
+    async def started(self, waited: float):
+        self.status.update(state="pulling", queue_position=None, waited=round(waited))
+        await self.write()
+
+    async def update(self, item: Dict[str, Any]):
+        if item.get("digest"):
+            self.status.update(digest=item["digest"], completed=int(item.get("completed") or 0), total=int(item.get("total") or 0))
+        if time.monotonic() - self._written_at >= self.interval:
+            await self.write()
+
+    async def finish(self, success: bool, error: Optional[str] = None):
+        self.status.update(state="succeeded" if success else "failed", queue_position=None, error=error)
+        await self.write()
+
+    async def write(self):
+        self._written_at = time.monotonic()
+        status = {**self.status, "updated": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")}
+        try:
+            crs = [cr async for cr in kr8s.asyncio.get(RESOURCE, self.name, namespace=self.namespace)]
+            if crs:
+                await crs[0].patch({"status": {"pull": status}})
+        except Exception as e:
+            logger.warning(f"Failed to record pull progress of {self.namespace}/{self.name}: {e}")
+
+
+class SharedPull:
+    """One pull of model:tag on a host, shared by every OllamaModel that asked for it."""
+
+    def __init__(self, host: str, ollama_host: str, model: str, tag: str):
+        self.host = host
+        self.ollama_host = ollama_host
+        self.model = model
+        self.tag = tag
+        self.model_name = f"{model}:{tag}"
+        self.subscribers: Dict[str, PullProgress] = {}
+        self.queued_at = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+        self.done = False
+
+    async def broadcast(self, method: str, *args):
+        await asyncio.gather(*[getattr(progress, method)(*args) for progress in list(self.subscribers.values())])
+
+
+class HostPullQueue:
+    """FIFO queue of the pulls of one Ollama host, of which at most `concurrency` run at a time."""
+
+    def __init__(self, host: str, concurrency: int):
+        self.host = host
+        self.concurrency = max(1, concurrency)
+        self.waiting: List[SharedPull] = []
+        self.active: List[SharedPull] = []
+
+    def position(self, pull: SharedPull) -> int:
+        """1-based position of a waiting pull, 0 once it runs."""
+        return self.waiting.index(pull) + 1 if pull in self.waiting else 0
+
+    def record(self):
+        OLLAMA_PULLS.labels(host=self.host, state="queued").set(len(self.waiting))
+        OLLAMA_PULLS.labels(host=self.host, state="running").set(len(self.active))
+
+
+@singleton
+class PullTracker:
+    """
+    Runs Ollama pulls as background tasks, so OllamaModel handlers return as soon as a pull is queued.
+
+    Requests for the same model:tag on the same host, from any namespace, share one pull. Pulls wait in a
+    FIFO queue per host, of which at most OLLAMA_PULL_CONCURRENCY run at a time. Each resource's status.pull
+    shows its queue position and, once the pull runs, the time it waited and the pull's progress; failed pulls
+    are retried by the next periodic reconcile.
+
+    Environment Variables:
+    - OLLAMA_PULL_CONCURRENCY: Maximum concurrent pulls per Ollama host (default: 2)
+    - OLLAMA_PULL_STATUS_INTERVAL: Minimum seconds between two pull progress writes to a resource's status (default: 5)
+    """
+
+    @inject
+    def __init__(self, model_management: ModelManagement):
+        self.model_management = model_management
+        self.concurrency = int(os.getenv("OLLAMA_PULL_CONCURRENCY", "2"))
+        self.status_interval = float(os.getenv("OLLAMA_PULL_STATUS_INTERVAL", "5"))
+
+        self._queues: Dict[str, HostPullQueue] = {}
+        self._pulls: Dict[Tuple[str, str], SharedPull] = {}
+        self._resources: Dict[str, SharedPull] = {}
+
+    def running(self, uid: str) -> bool:
+        """Whether a pull requested by the resource is queued or running."""
+        pull = self._resources.get(uid)
+        return pull is not None and not pull.done
+
+    def queue_of(self, ollama_host: str) -> HostPullQueue:
+        host = ollama_host.rstrip("/")
+        if host not in self._queues:
+            self._queues[host] = HostPullQueue(host, self.concurrency)
+        return self._queues[host]
+
+    async def start(self, uid: str, name: str, namespace: str, ollama_host: str, model: str, tag: str) -> bool:
+        """Queue pulling model:tag for a resource. Returns False if the resource already waits for that pull."""
+        queue = self.queue_of(ollama_host)
+        key = (queue.host, f"{model}:{tag}")
+        current = self._resources.get(uid)
+        if current is not None and not current.done:
+            if (current.host, current.model_name) == key:
+                return False
+            logger.info(f"Model of {namespace}/{name} changed to {key[1]}, leaving pull of {current.model_name}")
+        self._detach(uid)
+
+        pull = self._pulls.get(key)
+        if pull is None:
+            pull = SharedPull(queue.host, ollama_host, model, tag)
+            self._pulls[key] = pull
+            queue.waiting.append(pull)
+            queue.record()
+        else:
+            logger.info(f"Model {pull.model_name} is already being pulled from {queue.host}, {namespace}/{name} shares that pull")
+
+        progress = PullProgress(name, namespace, pull.model_name, self.status_interval)
+        pull.subscribers[uid] = progress
+        self._resources[uid] = pull
+        if pull.task is None:
+            await progress.queued(queue.position(pull))
+        else:
+            await progress.started(time.monotonic() - pull.queued_at)
+        self._dispatch(queue)
+        return True
+
+    def cancel(self, uid: str):
+        """Stop waiting for the resource's pull; the pull itself stops once nobody waits for it anymore."""
+        self._detach(uid)
+
+    def _detach(self, uid: str):
+        pull = self._resources.pop(uid, None)
+        if pull is None or pull.done:
+            return
+        pull.subscribers.pop(uid, None)
+        if pull.subscribers:
+            return
+
+        queue = self._queues[pull.host]
+        if pull in queue.waiting:
+            logger.info(f"Removing pull of {pull.model_name} from the queue of {pull.host}")
+            queue.waiting.remove(pull)
+            self._pulls.pop((pull.host, pull.model_name), None)
+            queue.record()
+            asyncio.get_running_loop().create_task(self._announce(queue))
+        elif pull.task is not None:
+            logger.info(f"Cancelling pull of {pull.model_name} from {pull.host}")
+            pull.task.cancel()
+
+    def _dispatch(self, queue: HostPullQueue):
+        started = False
+        while queue.waiting and len(queue.active) < queue.concurrency:
+            pull = queue.waiting.pop(0)
+            queue.active.append(pull)
+            pull.task = asyncio.get_running_loop().create_task(self._pull(queue, pull))
+            started = True
+        queue.record()
+        if started:
+            asyncio.get_running_loop().create_task(self._announce(queue))
+
+    async def _announce(self, queue: HostPullQueue):
+        """Write the new queue positions of all waiting pulls."""
+        await asyncio.gather(*[pull.broadcast("queued", position) for position, pull in enumerate(list(queue.waiting), start=1)])
+
+    async def _pull(self, queue: HostPullQueue, pull: SharedPull):
+        waited = time.monotonic() - pull.queued_at
+        OLLAMA_PULL_WAIT.labels(host=queue.host).observe(waited)
+        logger.info(f"Pulling model {pull.model_name} from {queue.host} for {len(pull.subscribers)} resources after waiting {waited:.0f}s...")
+        started = time.monotonic()
+        success, error = False, None
+        try:
+            await pull.broadcast("started", waited)
+            success = await self.model_management.pull_model(pull.ollama_host, pull.model, pull.tag,
+                                                              on_progress=lambda item: pull.broadcast("update", item))
+            if success:
+                logger.info(f"Pulled model {pull.model_name} from {queue.host} in {time.monotonic() - started:.0f}s")
+            else:
+                error = f"Failed to pull model {pull.model_name}"
+        except Exception as e:
+            logger.error(f"Pull of {pull.model_name} from {queue.host} failed: {e}")
+            error = str(e)
+        finally:
+            pull.done = True
+            queue.active.remove(pull)
+            self._pulls.pop((pull.host, pull.model_name), None)
+            self._dispatch(queue)
+        await pull.broadcast("finish", success, error)
@@ -1,8 +1,9 @@
-import json
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 from typing import Dict, List, Optional, Any
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_data, trace_response
 
 
 class OpenWebUIBannerException(Exception):
@@ -11,33 +12,37 @@ class OpenWebUIBannerException(Exception):
 
 @singleton
 class BannerManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health")
 
-    def ping(self, openwebui_host):
+    async def ping(self, openwebui_host, deadline: Optional[Deadline] = None):
         """Check if Open-WebUI is accessible."""
         try:
-            response = requests.get(url=f"{openwebui_host}/health")
+            response = await self.http.get(url=f"{openwebui_host}/health", deadline=deadline)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to ping Open-WebUI at {openwebui_host}: {e}")
             return False
 
-    def get_banners(self, openwebui_host: str, openwebui_api_key: str) -> Optional[List[Dict[str, Any]]]:
-        """Get all banners."""
+    async def get_banners(self, openwebui_host: str, openwebui_api_key: str, fresh: bool = False, deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get all banners; pass fresh=True to bypass the response cache before writing the list back."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/configs/banners",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                cached=not fresh,
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get banners response: {response.status_code} - {response.text}")
+            trace_response("Get banners", response)
             
             if response.status_code == 200:
                 data = response.json()
+                # Copied since callers edit the list and the response may be shared
                 if isinstance(data, list):
-                    return data
-                return data.get("banners", []) if isinstance(data, dict) else []
+                    return list(data)
+                return list(data.get("banners", [])) if isinstance(data, dict) else []
             else:
                 logger.error(f"Failed to get banners: {response.status_code} - {response.text}")
                 return None
@@ -46,9 +51,9 @@ class BannerManagement:
             logger.error(f"Exception while getting banners: {e}")
             return None
 
-    def get_banner_by_id(self, openwebui_host: str, openwebui_api_key: str, banner_id: str) -> Optional[Dict[str, Any]]:
+    async def get_banner_by_id(self, openwebui_host: str, openwebui_api_key: str, banner_id: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Find a banner by ID."""
-        banners = self.get_banners(openwebui_host, openwebui_api_key)
+        banners = await self.get_banners(openwebui_host, openwebui_api_key, deadline=deadline)
         if banners is None:
             return None
         
@@ -59,7 +64,7 @@ class BannerManagement:
         logger.info(f"Banner with ID {banner_id} not found")
         return None
 
-    def create_banner(self, openwebui_host: str, openwebui_api_key: str, banner_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def create_banner(self, openwebui_host: str, openwebui_api_key: str, banner_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Add a new banner to the configuration."""
         banner_data = dict(banner_data)
         banner_data.pop('openwebui_host', None)
@@ -68,7 +73,7 @@ class BannerManagement:
         
         try:
             # Get current banners
-            current_banners = self.get_banners(openwebui_host, openwebui_api_key)
+            current_banners = await self.get_banners(openwebui_host, openwebui_api_key, fresh=True, deadline=deadline)
             if current_banners is None:
                 current_banners = []
             
@@ -81,14 +86,15 @@ class BannerManagement:
             # Add new banner
             current_banners.append(banner_data)
             
-            logger.trace(f"Creating banner with data: {json.dumps(banner_data, indent=2)}")
-            response = requests.post(
+            trace_data("Creating banner with data", banner_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/configs/banners",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json={"banners": current_banners}
+                json={"banners": current_banners},
+                deadline=deadline
             )
             
-            logger.trace(f"Create banner response: {response.status_code} - {response.text}")
+            trace_response("Create banner", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully created banner {banner_data.get('id')}")
@@ -101,7 +107,7 @@ class BannerManagement:
             logger.error(f"Exception while creating banner: {e}")
             raise
 
-    def update_banner(self, openwebui_host: str, openwebui_api_key: str, banner_id: str, banner_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def update_banner(self, openwebui_host: str, openwebui_api_key: str, banner_id: str, banner_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Update an existing banner."""
         banner_data = dict(banner_data)
         banner_data.pop('openwebui_host', None)
@@ -110,7 +116,7 @@ class BannerManagement:
         
         try:
             # Get current banners
-            current_banners = self.get_banners(openwebui_host, openwebui_api_key)
+            current_banners = await self.get_banners(openwebui_host, openwebui_api_key, fresh=True, deadline=deadline)
             if current_banners is None:
                 raise OpenWebUIBannerException("Failed to get current banners")
             
@@ -126,13 +132,14 @@ class BannerManagement:
                 raise OpenWebUIBannerException(f"Banner with ID {banner_id} not found")
             
             # Update banners
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/configs/banners",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json={"banners": current_banners}
+                json={"banners": current_banners},
+                deadline=deadline
             )
             
-            logger.trace(f"Update banner response: {response.status_code} - {response.text}")
+            trace_response("Update banner", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully updated banner {banner_id}")
@@ -145,27 +152,27 @@ class BannerManagement:
             logger.error(f"Exception while updating banner {banner_id}: {e}")
             raise
 
-    def upsert_banner(self, openwebui_host: str, openwebui_api_key: str, banner_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def upsert_banner(self, openwebui_host: str, openwebui_api_key: str, banner_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Create or update a banner idempotently."""
         banner_id = banner_data.get('id')
         if not banner_id:
             raise OpenWebUIBannerException("Banner ID is required for upsert")
         
         # Check if banner exists
-        existing = self.get_banner_by_id(openwebui_host, openwebui_api_key, banner_id)
+        existing = await self.get_banner_by_id(openwebui_host, openwebui_api_key, banner_id, deadline=deadline)
         if existing:
             logger.info(f"Banner with ID {banner_id} exists, updating...")
-            return self.update_banner(openwebui_host, openwebui_api_key, banner_id, banner_data)
+            return await self.update_banner(openwebui_host, openwebui_api_key, banner_id, banner_data, deadline=deadline)
         
         # Create new
         logger.info(f"Banner does not exist, creating new banner...")
-        return self.create_banner(openwebui_host, openwebui_api_key, banner_data)
+        return await self.create_banner(openwebui_host, openwebui_api_key, banner_data, deadline=deadline)
 
-    def delete_banner(self, openwebui_host: str, openwebui_api_key: str, banner_id: str) -> bool:
+    async def delete_banner(self, openwebui_host: str, openwebui_api_key: str, banner_id: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a banner by ID."""
         try:
             # Get current banners
-            current_banners = self.get_banners(openwebui_host, openwebui_api_key)
+            current_banners = await self.get_banners(openwebui_host, openwebui_api_key, fresh=True, deadline=deadline)
             if current_banners is None:
                 logger.info("No banners found, nothing to delete.")
                 return True
@@ -178,13 +185,14 @@ class BannerManagement:
                 return True
             
             # Update banners
-            response = requests.post(
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/configs/banners",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json={"banners": filtered_banners}
+                json={"banners": filtered_banners},
+                deadline=deadline
             )
             
-            logger.trace(f"Delete banner response: {response.status_code} - {response.text}")
+            trace_response("Delete banner", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully deleted banner {banner_id}")
@@ -1,8 +1,9 @@
-import json
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 from typing import Dict, List, Optional, Any
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_data, trace_response
 
 
 class OpenWebUIChannelException(Exception):
@@ -11,27 +12,30 @@ class OpenWebUIChannelException(Exception):
 
 @singleton
 class ChannelManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health")
 
-    def ping(self, openwebui_host):
+    async def ping(self, openwebui_host, deadline: Optional[Deadline] = None):
         """Check if Open-WebUI is accessible."""
         try:
-            response = requests.get(url=f"{openwebui_host}/health")
+            response = await self.http.get(url=f"{openwebui_host}/health", deadline=deadline)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to ping Open-WebUI at {openwebui_host}: {e}")
             return False
 
-    def get_channels(self, openwebui_host: str, openwebui_api_key: str) -> Optional[List[Dict[str, Any]]]:
+    async def get_channels(self, openwebui_host: str, openwebui_api_key: str, deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, Any]]]:
         """Get all channels."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/channels/",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                cached=True,
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get channels response: {response.status_code} - {response.text}")
+            trace_response("Get channels", response)
             
             if response.status_code == 200:
                 return response.json()
@@ -43,15 +47,16 @@ class ChannelManagement:
             logger.error(f"Exception while getting channels: {e}")
             return None
 
-    def get_channel_by_id(self, openwebui_host: str, openwebui_api_key: str, channel_id: str) -> Optional[Dict[str, Any]]:
+    async def get_channel_by_id(self, openwebui_host: str, openwebui_api_key: str, channel_id: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Get channel by ID."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/channels/{channel_id}",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get channel by ID response: {response.status_code} - {response.text}")
+            trace_response("Get channel by ID", response)
             
             if response.status_code == 200:
                 return response.json()
@@ -66,9 +71,9 @@ class ChannelManagement:
             logger.error(f"Exception while getting channel {channel_id}: {e}")
             return None
 
-    def get_channel_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str) -> Optional[Dict[str, Any]]:
+    async def get_channel_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Find channel by name."""
-        channels = self.get_channels(openwebui_host, openwebui_api_key)
+        channels = await self.get_channels(openwebui_host, openwebui_api_key, deadline=deadline)
         if channels is None:
             return None
         
@@ -79,7 +84,7 @@ class ChannelManagement:
         logger.info(f"Channel with name {name} not found")
         return None
 
-    def create_channel(self, openwebui_host: str, openwebui_api_key: str, channel_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def create_channel(self, openwebui_host: str, openwebui_api_key: str, channel_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Create a new channel."""
         channel_data = dict(channel_data)
         channel_data.pop('openwebui_host', None)
@@ -88,14 +93,15 @@ class ChannelManagement:
         channel_data.pop('channel_id', None)
         
         try:
-            logger.trace(f"Creating channel with data: {json.dumps(channel_data, indent=2)}")
-            response = requests.post(
+            trace_data("Creating channel with data", channel_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/channels/create",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json=channel_data
+                json=channel_data,
+                deadline=deadline
             )
             
-            logger.trace(f"Create channel response: {response.status_code} - {response.text}")
+            trace_response("Create channel", response)
             
             if response.status_code == 200:
                 result = response.json()
@@ -109,7 +115,7 @@ class ChannelManagement:
             logger.error(f"Exception while creating channel: {e}")
             raise
 
-    def update_channel(self, openwebui_host: str, openwebui_api_key: str, channel_id: str, channel_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def update_channel(self, openwebui_host: str, openwebui_api_key: str, channel_id: str, channel_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Update an existing channel."""
         channel_data = dict(channel_data)
         channel_data.pop('openwebui_host', None)
@@ -118,14 +124,15 @@ class ChannelManagement:
         channel_data.pop('channel_id', None)
         
         try:
-            logger.trace(f"Updating channel {channel_id} with data: {json.dumps(channel_data, indent=2)}")
-            response = requests.post(
+            trace_data(f"Updating channel {channel_id} with data", channel_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/channels/{channel_id}/update",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json=channel_data
+                json=channel_data,
+                deadline=deadline
             )
             
-            logger.trace(f"Update channel response: {response.status_code} - {response.text}")
+            trace_response("Update channel", response)
             
             if response.status_code == 200:
                 result = response.json()
@@ -139,15 +146,16 @@ class ChannelManagement:
             logger.error(f"Exception while updating channel {channel_id}: {e}")
             raise
 
-    def delete_channel(self, openwebui_host: str, openwebui_api_key: str, channel_id: str) -> bool:
+    async def delete_channel(self, openwebui_host: str, openwebui_api_key: str, channel_id: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a channel by ID."""
         try:
-            response = requests.delete(
+            response = await self.http.delete(
                 url=f"{openwebui_host}/api/v1/channels/{channel_id}/delete",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Delete channel response: {response.status_code} - {response.text}")
+            trace_response("Delete channel", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully deleted channel {channel_id}")
@@ -160,31 +168,31 @@ class ChannelManagement:
             logger.error(f"Exception while deleting channel {channel_id}: {e}")
             raise
 
-    def upsert_channel(self, openwebui_host: str, openwebui_api_key: str, channel_data: Dict[str, Any], channel_id: Optional[str] = None) -> Dict[str, Any]:
+    async def upsert_channel(self, openwebui_host: str, openwebui_api_key: str, channel_data: Dict[str, Any], channel_id: Optional[str] = None, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Create or update a channel idempotently."""
         # Try by ID first if provided
         if channel_id:
-            existing = self.get_channel_by_id(openwebui_host, openwebui_api_key, channel_id)
+            existing = await self.get_channel_by_id(openwebui_host, openwebui_api_key, channel_id, deadline=deadline)
             if existing:
                 logger.info(f"Channel with ID {channel_id} exists, updating...")
-                return self.update_channel(openwebui_host, openwebui_api_key, channel_id, channel_data)
+                return await self.update_channel(openwebui_host, openwebui_api_key, channel_id, channel_data, deadline=deadline)
         
         # Check by name
         channel_name = channel_data.get('name')
         if channel_name:
-            existing = self.get_channel_by_name(openwebui_host, openwebui_api_key, channel_name)
+            existing = await self.get_channel_by_name(openwebui_host, openwebui_api_key, channel_name, deadline=deadline)
             if existing:
                 existing_id = existing.get('id')
                 logger.info(f"Channel with name {channel_name} exists (ID: {existing_id}), updating...")
-                return self.update_channel(openwebui_host, openwebui_api_key, existing_id, channel_data)
+                return await self.update_channel(openwebui_host, openwebui_api_key, existing_id, channel_data, deadline=deadline)
         
         # Create new
         logger.info(f"Channel does not exist, creating new channel...")
-        return self.create_channel(openwebui_host, openwebui_api_key, channel_data)
+        return await self.create_channel(openwebui_host, openwebui_api_key, channel_data, deadline=deadline)
 
-    def delete_channel_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str) -> bool:
+    async def delete_channel_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a channel by name."""
-        channel = self.get_channel_by_name(openwebui_host, openwebui_api_key, name)
+        channel = await self.get_channel_by_name(openwebui_host, openwebui_api_key, name, deadline=deadline)
         if channel is None:
             logger.info(f"Channel with name {name} does not exist, nothing to delete.")
             return True
@@ -195,4 +203,4 @@ class ChannelManagement:
             raise OpenWebUIChannelException("Channel has no ID, cannot delete.")
 
         logger.info(f"Deleting channel {name} with ID {channel_id}")
-        return self.delete_channel(openwebui_host, openwebui_api_key, channel_id)
+        return await self.delete_channel(openwebui_host, openwebui_api_key, channel_id, deadline=deadline)
@@ -1,8 +1,9 @@
-import json
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 from typing import Dict, List, Optional, Any
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_data, trace_response
 
 
 class OpenWebUIGroupException(Exception):
@@ -11,27 +12,30 @@ class OpenWebUIGroupException(Exception):
 
 @singleton
 class GroupManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health")
 
-    def ping(self, openwebui_host):
+    async def ping(self, openwebui_host, deadline: Optional[Deadline] = None):
         """Check if Open-WebUI is accessible."""
         try:
-            response = requests.get(url=f"{openwebui_host}/health")
+            response = await self.http.get(url=f"{openwebui_host}/health", deadline=deadline)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to ping Open-WebUI at {openwebui_host}: {e}")
             return False
 
-    def get_all_users(self, openwebui_host: str, openwebui_api_key: str) -> List[Dict[str, Any]]:
+    async def get_all_users(self, openwebui_host: str, openwebui_api_key: str, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
         """Get all users from OpenWebUI."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/users/all",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                cached=True,
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get all users response: {response.status_code} - {response.text}")
+            trace_response("Get all users", response)
             
             if response.status_code == 200:
                 result = response.json()
@@ -46,7 +50,31 @@ class GroupManagement:
             logger.error(f"Exception while getting users: {e}")
             return []
 
-    def translate_emails_to_ids(self, openwebui_host: str, openwebui_api_key: str, user_emails: List[str]) -> List[str]:
+    async def _find_users_by_email(self, openwebui_host: str, openwebui_api_key: str, user_emails: List[str], deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        """Stream the user list and stop reading it once every requested email was seen."""
+        wanted = {email.lower() for email in user_emails}
+        try:
+            response = await self.http.search_json(
+                f"{openwebui_host}/api/v1/users/all",
+                "users",
+                lambda user: isinstance(user, dict) and (user.get('email') or '').lower() in wanted,
+                limit=len(wanted),
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
+            )
+
+            if response.status_code == 200:
+                logger.info(f"Found {len(response.matches)}/{len(wanted)} requested users in OpenWebUI")
+                return response.matches
+            else:
+                logger.error(f"Failed to get users: {response.status_code} - {response.text}")
+                return []
+
+        except Exception as e:
+            logger.error(f"Exception while getting users: {e}")
+            return []
+
+    async def translate_emails_to_ids(self, openwebui_host: str, openwebui_api_key: str, user_emails: List[str], deadline: Optional[Deadline] = None) -> List[str]:
         """
         Translate email addresses to user IDs.
         
@@ -62,8 +90,11 @@ class GroupManagement:
             logger.info("No user emails provided, returning empty list")
             return []
         
-        # Fetch all users
-        users = self.get_all_users(openwebui_host, openwebui_api_key)
+        # Fetch all users, or only the requested ones when streaming lookups are enabled
+        if self.http.stream_lookups:
+            users = await self._find_users_by_email(openwebui_host, openwebui_api_key, user_emails, deadline=deadline)
+        else:
+            users = await self.get_all_users(openwebui_host, openwebui_api_key, deadline=deadline)
         
         if not users:
             logger.warning("No users found in OpenWebUI, cannot translate emails to IDs")
@@ -84,15 +115,17 @@ class GroupManagement:
         logger.info(f"Successfully translated {len(user_ids)}/{len(user_emails)} emails to user IDs")
         return user_ids
 
-    def get_groups(self, openwebui_host: str, openwebui_api_key: str) -> Optional[List[Dict[str, Any]]]:
+    async def get_groups(self, openwebui_host: str, openwebui_api_key: str, deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, Any]]]:
         """Get all groups."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/groups/",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                cached=True,
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get groups response: {response.status_code} - {response.text}")
+            trace_response("Get groups", response)
             
             if response.status_code == 200:
                 return response.json()
@@ -104,15 +137,16 @@ class GroupManagement:
             logger.error(f"Exception while getting groups: {e}")
             return None
 
-    def get_group_by_id(self, openwebui_host: str, openwebui_api_key: str, group_id: str) -> Optional[Dict[str, Any]]:
+    async def get_group_by_id(self, openwebui_host: str, openwebui_api_key: str, group_id: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Get group by ID."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/groups/id/{group_id}",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get group by ID response: {response.status_code} - {response.text}")
+            trace_response("Get group by ID", response)
             
             if response.status_code == 200:
                 return response.json()
@@ -127,9 +161,9 @@ class GroupManagement:
             logger.error(f"Exception while getting group {group_id}: {e}")
             return None
 
-    def get_group_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str) -> Optional[Dict[str, Any]]:
+    async def get_group_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Find group by name."""
-        groups = self.get_groups(openwebui_host, openwebui_api_key)
+        groups = await self.get_groups(openwebui_host, openwebui_api_key, deadline=deadline)
         if groups is None:
             return None
         
@@ -140,7 +174,7 @@ class GroupManagement:
         logger.info(f"Group with name {name} not found")
         return None
 
-    def create_group(self, openwebui_host: str, openwebui_api_key: str, group_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def create_group(self, openwebui_host: str, openwebui_api_key: str, group_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Create a new group."""
         group_data = dict(group_data)
         group_data.pop('openwebui_host', None)
@@ -149,14 +183,15 @@ class GroupManagement:
         group_data.pop('group_id', None)
         
         try:
-            logger.trace(f"Creating group with data: {json.dumps(group_data, indent=2)}")
-            response = requests.post(
+            trace_data("Creating group with data", group_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/groups/create",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json=group_data
+                json=group_data,
+                deadline=deadline
             )
             
-            logger.trace(f"Create group response: {response.status_code} - {response.text}")
+            trace_response("Create group", response)
             
             if response.status_code != 200:
                 logger.error(f"Failed to create group: {response.status_code} - {response.text}")
@@ -165,11 +200,12 @@ class GroupManagement:
             result = response.json()
             logger.info(f"Successfully created group {group_data.get('name')} with ID {result.get('id')}")
 
-            logger.trace(f"Adding users to group: {json.dumps(group_data, indent=2)}")
-            response = requests.post(
+            trace_data("Adding users to group", group_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/groups/id/{result.get('id')}/users/add",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json=group_data
+                json=group_data,
+                deadline=deadline
             )
 
             if response.status_code != 200:
@@ -184,7 +220,7 @@ class GroupManagement:
             logger.error(f"Exception while creating group: {e}")
             raise
 
-    def update_group(self, openwebui_host: str, openwebui_api_key: str, group_id: str, group_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def update_group(self, openwebui_host: str, openwebui_api_key: str, group_id: str, group_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Update an existing group."""
         group_data = dict(group_data)
         group_data.pop('openwebui_host', None)
@@ -193,14 +229,15 @@ class GroupManagement:
         group_data.pop('group_id', None)
         
         try:
-            logger.trace(f"Updating group {group_id} with data: {json.dumps(group_data, indent=2)}")
-            response = requests.post(
+            trace_data(f"Updating group {group_id} with data", group_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/groups/id/{group_id}/update",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json=group_data
+                json=group_data,
+                deadline=deadline
             )
             
-            logger.trace(f"Update group response: {response.status_code} - {response.text}")
+            trace_response("Update group", response)
             
             if response.status_code == 200:
                 result = response.json()
@@ -214,15 +251,16 @@ class GroupManagement:
             logger.error(f"Exception while updating group {group_id}: {e}")
             raise
 
-    def delete_group(self, openwebui_host: str, openwebui_api_key: str, group_id: str) -> bool:
+    async def delete_group(self, openwebui_host: str, openwebui_api_key: str, group_id: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a group by ID."""
         try:
-            response = requests.delete(
+            response = await self.http.delete(
                 url=f"{openwebui_host}/api/v1/groups/id/{group_id}/delete",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Delete group response: {response.status_code} - {response.text}")
+            trace_response("Delete group", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully deleted group {group_id}")
@@ -235,9 +273,9 @@ class GroupManagement:
             logger.error(f"Exception while deleting group {group_id}: {e}")
             raise
 
-    def delete_group_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str) -> bool:
+    async def delete_group_by_name(self, openwebui_host: str, openwebui_api_key: str, name: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a group by name."""
-        group = self.get_group_by_name(openwebui_host, openwebui_api_key, name)
+        group = await self.get_group_by_name(openwebui_host, openwebui_api_key, name, deadline=deadline)
         if group is None:
             logger.info(f"Group with name {name} does not exist, nothing to delete.")
             return True
@@ -248,9 +286,9 @@ class GroupManagement:
             raise OpenWebUIGroupException("Group has no ID, cannot delete.")
 
         logger.info(f"Deleting group {name} with ID {group_id}")
-        return self.delete_group(openwebui_host, openwebui_api_key, group_id)
+        return await self.delete_group(openwebui_host, openwebui_api_key, group_id, deadline=deadline)
 
-    def upsert_group(self, openwebui_host: str, openwebui_api_key: str, group_data: Dict[str, Any], group_id: Optional[str] = None) -> Dict[str, Any]:
+    async def upsert_group(self, openwebui_host: str, openwebui_api_key: str, group_data: Dict[str, Any], group_id: Optional[str] = None, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Upsert (create or update) a group.
         Checks if the group exists by ID or name, then updates if found or creates if not.
@@ -267,7 +305,7 @@ class GroupManagement:
         # Translate user emails to user IDs before upserting
         user_emails = group_data.get('user_emails', [])
         if user_emails:
-            user_ids = self.translate_emails_to_ids(openwebui_host, openwebui_api_key, user_emails)
+            user_ids = await self.translate_emails_to_ids(openwebui_host, openwebui_api_key, user_emails, deadline=deadline)
             # Replace user_emails with user_ids in the group data
             group_data = dict(group_data)
             group_data.pop('user_emails', None)
@@ -280,19 +318,19 @@ class GroupManagement:
         
         # Try by ID first if provided
         if group_id:
-            existing = self.get_group_by_id(openwebui_host, openwebui_api_key, group_id)
+            existing = await self.get_group_by_id(openwebui_host, openwebui_api_key, group_id, deadline=deadline)
             if existing:
                 logger.info(f"Group with ID {group_id} exists, updating...")
-                return self.update_group(openwebui_host, openwebui_api_key, group_id, group_data)
+                return await self.update_group(openwebui_host, openwebui_api_key, group_id, group_data, deadline=deadline)
         
         # Check by name
         group_name = group_data.get('name')
         if group_name:
-            existing = self.get_group_by_name(openwebui_host, openwebui_api_key, group_name)
+            existing = await self.get_group_by_name(openwebui_host, openwebui_api_key, group_name, deadline=deadline)
             if existing:
                 logger.info(f"Group with name {group_name} exists, updating...")
-                return self.update_group(openwebui_host, openwebui_api_key, existing['id'], group_data)
+                return await self.update_group(openwebui_host, openwebui_api_key, existing['id'], group_data, deadline=deadline)
         
         # Create new group
         logger.info(f"Group does not exist, creating new group...")
-        return self.create_group(openwebui_host, openwebui_api_key, group_data)
+        return await self.create_group(openwebui_host, openwebui_api_key, group_data, deadline=deadline)
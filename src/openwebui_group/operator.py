@@ -2,20 +2,21 @@ from injector import Injector
 from kubernetes.client import ApiClient
 from loguru import logger
 import kopf
-import kr8s
+import kr8s.asyncio
 import base64
 
 from src.openwebui_group.manager import GroupManagement
 from src.openwebui_group.crd import OpenWebUIGroup
+from src.http_client.deadline import Deadline
 
 injector: Injector = None
 api: ApiClient = None
 
 
-def get_api_key_from_secret(secret_name: str, secret_namespace: str) -> str:
+async def get_api_key_from_secret(secret_name: str, secret_namespace: str) -> str:
     """Retrieve OpenWebUI API key from Kubernetes Secret."""
     try:
-        secrets = list(kr8s.get("secrets", secret_name, namespace=secret_namespace))
+        secrets = [o async for o in kr8s.asyncio.get("secrets", secret_name, namespace=secret_namespace)]
         if not secrets:
             raise ValueError(f"Secret {secret_name} not found in namespace {secret_namespace}")
         
@@ -40,22 +41,23 @@ def register_handlers(inj: Injector):
 
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "OpenWebUIGroup")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, **kwargs):
     group_management = injector.get(GroupManagement)
+    deadline = Deadline.for_plugin("openwebui_group")
     
     logger.info(f"Deleting OpenWebUIGroup resource: {namespace}/{name}")
     
     try:
         # Retrieve API key from secret in the same namespace as the CR
-        api_key = get_api_key_from_secret(
+        api_key = await get_api_key_from_secret(
             spec['existing_secret'],
             namespace
         )
         
         if spec.get('group_id'):
-            group_management.delete_group(spec['openwebui_host'], api_key, spec['group_id'])
+            await group_management.delete_group(spec['openwebui_host'], api_key, spec['group_id'], deadline=deadline)
         else:
-            group_management.delete_group_by_name(spec['openwebui_host'], api_key, spec['name'])
+            await group_management.delete_group_by_name(spec['openwebui_host'], api_key, spec['name'], deadline=deadline)
         logger.info(f"OpenWebUIGroup {namespace}/{name} deleted successfully.")
     except Exception as e:
         logger.error(f"Failed to delete group {spec['name']}: {e}")
@@ -64,23 +66,25 @@ def delete_fn(spec, name, namespace, **kwargs):
 
 @kopf.on.create("ops.veitosiander.de", "v1", "OpenWebUIGroup")
 @kopf.on.update("ops.veitosiander.de", "v1", "OpenWebUIGroup")
-def upsert_fn(spec, name, namespace, **kwargs):
+async def upsert_fn(spec, name, namespace, **kwargs):
     group_management = injector.get(GroupManagement)
+    deadline = Deadline.for_plugin("openwebui_group")
     
     logger.info(f"Upserting OpenWebUIGroup resource: {namespace}/{name}")
     
     try:
         # Retrieve API key from secret in the same namespace as the CR
-        api_key = get_api_key_from_secret(
+        api_key = await get_api_key_from_secret(
             spec['existing_secret'],
             namespace
         )
         
-        group = group_management.upsert_group(
+        group = await group_management.upsert_group(
             spec['openwebui_host'],
             api_key,
             spec,
-            spec.get('group_id')
+            spec.get('group_id'),
+            deadline=deadline
         )
         
         # Update is_installed and group_id if needed
@@ -91,8 +95,8 @@ def upsert_fn(spec, name, namespace, **kwargs):
             patch_data["group_id"] = group['id']
         
         if patch_data:
-            cr = list(kr8s.get("OpenWebUIGroup.ops.veitosiander.de/v1", name, namespace=namespace))[0]
-            cr.patch({"spec": patch_data})
+            cr = [cr async for cr in kr8s.asyncio.get("OpenWebUIGroup.ops.veitosiander.de/v1", name, namespace=namespace)][0]
+            await cr.patch({"spec": patch_data})
             logger.info(f"Updated CRD for {namespace}/{name}: {patch_data}")
         
         logger.info(f"OpenWebUIGroup {namespace}/{name} upserted successfully.")
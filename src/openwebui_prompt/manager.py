@@ -1,8 +1,9 @@
-import json
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
-import requests
 from typing import Dict, List, Optional, Any
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_data, trace_response
 
 
 class OpenWebUIPromptException(Exception):
@@ -11,27 +12,30 @@ class OpenWebUIPromptException(Exception):
 
 @singleton
 class PromptManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, http: HttpClient):
+        self.http = http.with_probe("/health")
 
-    def ping(self, openwebui_host):
+    async def ping(self, openwebui_host, deadline: Optional[Deadline] = None):
         """Check if Open-WebUI is accessible."""
         try:
-            response = requests.get(url=f"{openwebui_host}/health")
+            response = await self.http.get(url=f"{openwebui_host}/health", deadline=deadline)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to ping Open-WebUI at {openwebui_host}: {e}")
             return False
 
-    def get_prompts(self, openwebui_host: str, openwebui_api_key: str) -> Optional[List[Dict[str, Any]]]:
+    async def get_prompts(self, openwebui_host: str, openwebui_api_key: str, deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, Any]]]:
         """Get all prompts."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/prompts/",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                cached=True,
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get prompts response: {response.status_code} - {response.text}")
+            trace_response("Get prompts", response)
             
             if response.status_code == 200:
                 return response.json()
@@ -43,18 +47,19 @@ class PromptManagement:
             logger.error(f"Exception while getting prompts: {e}")
             return None
 
-    def get_prompt_by_command(self, openwebui_host: str, openwebui_api_key: str, command: str) -> Optional[Dict[str, Any]]:
+    async def get_prompt_by_command(self, openwebui_host: str, openwebui_api_key: str, command: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Get prompt by command."""
         # Remove "/" prefix for URL if present
         command = command.lstrip('/')
         
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/prompts/command/{command}",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get prompt by command response: {response.status_code} - {response.text}")
+            trace_response("Get prompt by command", response)
             
             if response.status_code == 200:
                 return response.json()
@@ -69,7 +74,7 @@ class PromptManagement:
             logger.error(f"Exception while getting prompt {command}: {e}")
             return None
 
-    def create_prompt(self, openwebui_host: str, openwebui_api_key: str, prompt_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def create_prompt(self, openwebui_host: str, openwebui_api_key: str, prompt_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Create a new prompt."""
         prompt_data = dict(prompt_data)
         prompt_data.pop('openwebui_host', None)
@@ -81,14 +86,15 @@ class PromptManagement:
             prompt_data['command'] = f"/{prompt_data['command']}"
         
         try:
-            logger.trace(f"Creating prompt with data: {json.dumps(prompt_data, indent=2)}")
-            response = requests.post(
+            trace_data("Creating prompt with data", prompt_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/prompts/create",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json=prompt_data
+                json=prompt_data,
+                deadline=deadline
             )
             
-            logger.trace(f"Create prompt response: {response.status_code} - {response.text}")
+            trace_response("Create prompt", response)
             
             if response.status_code == 200:
                 result = response.json()
@@ -102,7 +108,7 @@ class PromptManagement:
             logger.error(f"Exception while creating prompt: {e}")
             raise
 
-    def update_prompt(self, openwebui_host: str, openwebui_api_key: str, command: str, prompt_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def update_prompt(self, openwebui_host: str, openwebui_api_key: str, command: str, prompt_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Update an existing prompt."""
         prompt_data = dict(prompt_data)
         prompt_data.pop('openwebui_host', None)
@@ -117,14 +123,15 @@ class PromptManagement:
             prompt_data['command'] = f"/{prompt_data['command']}"
         
         try:
-            logger.trace(f"Updating prompt {command_for_url} with data: {json.dumps(prompt_data, indent=2)}")
-            response = requests.post(
+            trace_data(f"Updating prompt {command_for_url} with data", prompt_data)
+            response = await self.http.post(
                 url=f"{openwebui_host}/api/v1/prompts/command/{command_for_url}/update",
                 headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                json=prompt_data
+                json=prompt_data,
+                deadline=deadline
             )
             
-            logger.trace(f"Update prompt response: {response.status_code} - {response.text}")
+            trace_response("Update prompt", response)
             
             if response.status_code == 200:
                 result = response.json()
@@ -138,18 +145,19 @@ class PromptManagement:
             logger.error(f"Exception while updating prompt {command}: {e}")
             raise
 
-    def delete_prompt(self, openwebui_host: str, openwebui_api_key: str, command: str) -> bool:
+    async def delete_prompt(self, openwebui_host: str, openwebui_api_key: str, command: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a prompt by command."""
         # Remove "/" prefix for deletion if present
         command = command.lstrip('/')
         
         try:
-            response = requests.delete(
+            response = await self.http.delete(
                 url=f"{openwebui_host}/api/v1/prompts/command/{command}/delete",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Delete prompt response: {response.status_code} - {response.text}")
+            trace_response("Delete prompt", response)
             
             if response.status_code == 200:
                 logger.info(f"Successfully deleted prompt {command}")
@@ -165,7 +173,7 @@ class PromptManagement:
             logger.error(f"Exception while deleting prompt {command}: {e}")
             raise
 
-    def upsert_prompt(self, openwebui_host: str, openwebui_api_key: str, prompt_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def upsert_prompt(self, openwebui_host: str, openwebui_api_key: str, prompt_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Upsert (create or update) a prompt.
         Checks if the prompt exists by command, then updates if found or creates if not.
@@ -183,12 +191,12 @@ class PromptManagement:
             raise OpenWebUIPromptException("Command is required for prompt upsert")
         
         # Check if prompt exists
-        existing = self.get_prompt_by_command(openwebui_host, openwebui_api_key, command)
+        existing = await self.get_prompt_by_command(openwebui_host, openwebui_api_key, command, deadline=deadline)
         
         if existing:
             logger.info(f"Prompt with command {command} exists, updating...")
-            return self.update_prompt(openwebui_host, openwebui_api_key, command, prompt_data)
+            return await self.update_prompt(openwebui_host, openwebui_api_key, command, prompt_data, deadline=deadline)
         
         # Create new prompt
         logger.info(f"Prompt with command {command} does not exist, creating...")
-        return self.create_prompt(openwebui_host, openwebui_api_key, prompt_data)
+        return await self.create_prompt(openwebui_host, openwebui_api_key, prompt_data, deadline=deadline)
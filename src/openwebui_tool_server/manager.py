@@ -1,9 +1,10 @@
-import json
 from injector import singleton, inject
 from loguru import logger
-import requests
 from typing import Dict, List, Optional, Any
 from src.lock_manager import LockManager
+from src.http_client.client import HttpClient
+from src.http_client.deadline import Deadline
+from src.http_client.trace import trace_data, trace_response
 
 
 class OpenWebUIToolServerException(Exception):
@@ -13,32 +14,35 @@ class OpenWebUIToolServerException(Exception):
 @singleton
 class ToolServerManagement:
     @inject
-    def __init__(self, lock_manager: LockManager):
+    def __init__(self, lock_manager: LockManager, http: HttpClient):
         self.lock_manager = lock_manager
+        self.http = http.with_probe("/health")
 
-    def ping(self, openwebui_host):
+    async def ping(self, openwebui_host, deadline: Optional[Deadline] = None):
         """Check if Open-WebUI is accessible."""
         try:
-            response = requests.get(url=f"{openwebui_host}/health")
+            response = await self.http.get(url=f"{openwebui_host}/health", deadline=deadline)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to ping Open-WebUI at {openwebui_host}: {e}")
             return False
 
-    def get_tool_servers(self, openwebui_host: str, openwebui_api_key: str) -> Optional[List[Dict[str, Any]]]:
-        """Get all tool servers configuration."""
+    async def get_tool_servers(self, openwebui_host: str, openwebui_api_key: str, fresh: bool = False, deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get all tool servers configuration; pass fresh=True to bypass the response cache before writing the list back."""
         try:
-            response = requests.get(
+            response = await self.http.get(
                 url=f"{openwebui_host}/api/v1/configs/tool_servers",
-                headers={"Authorization": f"Bearer {openwebui_api_key}"}
+                cached=not fresh,
+                headers={"Authorization": f"Bearer {openwebui_api_key}"},
+                deadline=deadline
             )
             
-            logger.trace(f"Get tool servers response: {response.status_code} - {response.text}")
+            trace_response("Get tool servers", response)
             
             if response.status_code == 200:
                 data = response.json()
-                # API returns {"TOOL_SERVER_CONNECTIONS": [...]}
-                return data.get("TOOL_SERVER_CONNECTIONS", [])
+                # API returns {"TOOL_SERVER_CONNECTIONS": [...]}; copied since callers edit the list and the response may be shared
+                return list(data.get("TOOL_SERVER_CONNECTIONS", []))
             else:
                 logger.error(f"Failed to get tool servers: {response.status_code} - {response.text}")
                 return None
@@ -47,9 +51,9 @@ class ToolServerManagement:
             logger.error(f"Exception while getting tool servers: {e}")
             return None
 
-    def get_tool_server_by_url(self, openwebui_host: str, openwebui_api_key: str, url: str) -> Optional[Dict[str, Any]]:
+    async def get_tool_server_by_url(self, openwebui_host: str, openwebui_api_key: str, url: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Find a tool server by URL."""
-        servers = self.get_tool_servers(openwebui_host, openwebui_api_key)
+        servers = await self.get_tool_servers(openwebui_host, openwebui_api_key, deadline=deadline)
         if servers is None:
             return None
         
@@ -60,7 +64,7 @@ class ToolServerManagement:
         logger.info(f"Tool server with URL {url} not found")
         return None
 
-    def create_tool_server(self, openwebui_host: str, openwebui_api_key: str, server_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def create_tool_server(self, openwebui_host: str, openwebui_api_key: str, server_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Add a new tool server to the configuration."""
         server_data = dict(server_data)
         server_data.pop('openwebui_host', None)
@@ -70,13 +74,13 @@ class ToolServerManagement:
         # Use lock to prevent race conditions when multiple servers are created concurrently
         lock_key = f"tool_servers:{openwebui_host}"
         
-        with self.lock_manager.acquire_lock(lock_key) as acquired:
+        async with self.lock_manager.acquire_lock_async(lock_key) as acquired:
             if not acquired:
                 raise OpenWebUIToolServerException(f"Failed to acquire lock for {lock_key}")
             
             try:
                 # Get current servers
-                current_servers = self.get_tool_servers(openwebui_host, openwebui_api_key)
+                current_servers = await self.get_tool_servers(openwebui_host, openwebui_api_key, fresh=True, deadline=deadline)
                 if current_servers is None:
                     current_servers = []
                 
@@ -92,14 +96,15 @@ class ToolServerManagement:
                 current_servers.append(server_data)
                 logger.debug(f"Adding server, new count: {len(current_servers)}")
                 
-                logger.trace(f"Creating tool server with data: {json.dumps(server_data, indent=2)}")
-                response = requests.post(
+                trace_data("Creating tool server with data", server_data)
+                response = await self.http.post(
                     url=f"{openwebui_host}/api/v1/configs/tool_servers",
                     headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                    json={"TOOL_SERVER_CONNECTIONS": current_servers}
+                    json={"TOOL_SERVER_CONNECTIONS": current_servers},
+                    deadline=deadline
                 )
                 
-                logger.trace(f"Create tool server response: {response.status_code} - {response.text}")
+                trace_response("Create tool server", response)
                 
                 if response.status_code == 200:
                     logger.info(f"Successfully created tool server {server_data.get('url')}")
@@ -112,7 +117,7 @@ class ToolServerManagement:
                 logger.error(f"Exception while creating tool server: {e}")
                 raise
 
-    def update_tool_server(self, openwebui_host: str, openwebui_api_key: str, url: str, server_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def update_tool_server(self, openwebui_host: str, openwebui_api_key: str, url: str, server_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
         """Update an existing tool server."""
         server_data = dict(server_data)
         server_data.pop('openwebui_host', None)
@@ -122,13 +127,13 @@ class ToolServerManagement:
         # Use lock to prevent race conditions
         lock_key = f"tool_servers:{openwebui_host}"
         
-        with self.lock_manager.acquire_lock(lock_key) as acquired:
+        async with self.lock_manager.acquire_lock_async(lock_key) as acquired:
             if not acquired:
                 raise OpenWebUIToolServerException(f"Failed to acquire lock for {lock_key}")
             
             try:
                 # Get current servers
-                current_servers = self.get_tool_servers(openwebui_host, openwebui_api_key)
+                current_servers = await self.get_tool_servers(openwebui_host, openwebui_api_key, fresh=True, deadline=deadline)
                 if current_servers is None:
                     raise OpenWebUIToolServerException("Failed to get current tool servers")
                 
@@ -144,13 +149,14 @@ class ToolServerManagement:
                     raise OpenWebUIToolServerException(f"Tool server with URL {url} not found")
                 
                 # Update servers
-                response = requests.post(
+                response = await self.http.post(
                     url=f"{openwebui_host}/api/v1/configs/tool_servers",
                     headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                    json={"TOOL_SERVER_CONNECTIONS": current_servers}
+                    json={"TOOL_SERVER_CONNECTIONS": current_servers},
+                    deadline=deadline
                 )
                 
-                logger.trace(f"Update tool server response: {response.status_code} - {response.text}")
+                trace_response("Update tool server", response)
                 
                 if response.status_code == 200:
                     logger.info(f"Successfully updated tool server {url}")
@@ -163,18 +169,18 @@ class ToolServerManagement:
                 logger.error(f"Exception while updating tool server {url}: {e}")
                 raise
 
-    def delete_tool_server(self, openwebui_host: str, openwebui_api_key: str, url: str) -> bool:
+    async def delete_tool_server(self, openwebui_host: str, openwebui_api_key: str, url: str, deadline: Optional[Deadline] = None) -> bool:
         """Delete a tool server by URL."""
         # Use lock to prevent race conditions
         lock_key = f"tool_servers:{openwebui_host}"
         
-        with self.lock_manager.acquire_lock(lock_key) as acquired:
+        async with self.lock_manager.acquire_lock_async(lock_key) as acquired:
             if not acquired:
                 raise OpenWebUIToolServerException(f"Failed to acquire lock for {lock_key}")
             
             try:
                 # Get current servers
-                current_servers = self.get_tool_servers(openwebui_host, openwebui_api_key)
+                current_servers = await self.get_tool_servers(openwebui_host, openwebui_api_key, fresh=True, deadline=deadline)
                 if current_servers is None:
                     logger.info("No tool servers found, nothing to delete.")
                     return True
@@ -187,13 +193,14 @@ class ToolServerManagement:
                     return True
                 
                 # Update servers
-                response = requests.post(
+                response = await self.http.post(
                     url=f"{openwebui_host}/api/v1/configs/tool_servers",
                     headers={"Authorization": f"Bearer {openwebui_api_key}"},
-                    json={"TOOL_SERVER_CONNECTIONS": filtered_servers}
+                    json={"TOOL_SERVER_CONNECTIONS": filtered_servers},
+                    deadline=deadline
                 )
                 
-                logger.trace(f"Delete tool server response: {response.status_code} - {response.text}")
+                trace_response("Delete tool server", response)
                 
                 if response.status_code == 200:
                     logger.info(f"Successfully deleted tool server {url}")
@@ -206,7 +213,7 @@ class ToolServerManagement:
                 logger.error(f"Exception while deleting tool server {url}: {e}")
                 raise
 
-    def upsert_tool_server(self, openwebui_host: str, openwebui_api_key: str, server_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def upsert_tool_server(self, openwebui_host: str, openwebui_api_key: str, server_data: Dict[str, Any], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Upsert (create or update) a tool server.
         Checks if the tool server exists by URL, then updates if found or creates if not.
@@ -224,12 +231,12 @@ class ToolServerManagement:
             raise OpenWebUIToolServerException("URL is required for tool server upsert")
         
         # Check if tool server exists
-        existing = self.get_tool_server_by_url(openwebui_host, openwebui_api_key, url)
+        existing = await self.get_tool_server_by_url(openwebui_host, openwebui_api_key, url, deadline=deadline)
         
         if existing:
             logger.info(f"Tool server with URL {url} exists, updating...")
-            return self.update_tool_server(openwebui_host, openwebui_api_key, url, server_data)
+            return await self.update_tool_server(openwebui_host, openwebui_api_key, url, server_data, deadline=deadline)
         
         # Create new tool server
         logger.info(f"Tool server with URL {url} does not exist, creating...")
-        return self.create_tool_server(openwebui_host, openwebui_api_key, server_data)
+        return await self.create_tool_server(openwebui_host, openwebui_api_key, server_data, deadline=deadline)
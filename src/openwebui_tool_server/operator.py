@@ -2,20 +2,21 @@ from injector import Injector
 from kubernetes.client import ApiClient
 from loguru import logger
 import kopf
-import kr8s
+import kr8s.asyncio
 import base64
 
 from src.openwebui_tool_server.manager import ToolServerManagement
 from src.openwebui_tool_server.crd import OpenWebUIToolServer
+from src.http_client.deadline import Deadline
 
 injector: Injector = None
 api: ApiClient = None
 
 
-def get_api_key_from_secret(secret_name: str, secret_namespace: str) -> str:
+async def get_api_key_from_secret(secret_name: str, secret_namespace: str) -> str:
     """Retrieve OpenWebUI API key from Kubernetes Secret."""
     try:
-        secrets = list(kr8s.get("secrets", secret_name, namespace=secret_namespace))
+        secrets = [o async for o in kr8s.asyncio.get("secrets", secret_name, namespace=secret_namespace)]
         if not secrets:
             raise ValueError(f"Secret {secret_name} not found in namespace {secret_namespace}")
         
@@ -40,19 +41,20 @@ def register_handlers(inj: Injector):
 
 
 @kopf.on.delete("ops.veitosiander.de", "v1", "OpenWebUIToolServer")
-def delete_fn(spec, name, namespace, **kwargs):
+async def delete_fn(spec, name, namespace, **kwargs):
     tool_server_management = injector.get(ToolServerManagement)
+    deadline = Deadline.for_plugin("openwebui_tool_server")
     
     logger.info(f"Deleting OpenWebUIToolServer resource: {namespace}/{name}")
     
     try:
         # Retrieve API key from secret in the same namespace as the CR
-        api_key = get_api_key_from_secret(
+        api_key = await get_api_key_from_secret(
             spec['existing_secret'],
             namespace
         )
         
-        tool_server_management.delete_tool_server(spec['openwebui_host'], api_key, spec['url'])
+        await tool_server_management.delete_tool_server(spec['openwebui_host'], api_key, spec['url'], deadline=deadline)
         logger.info(f"OpenWebUIToolServer {namespace}/{name} deleted successfully.")
     except Exception as e:
         logger.error(f"Failed to delete tool server {spec['url']}: {e}")
@@ -61,28 +63,30 @@ def delete_fn(spec, name, namespace, **kwargs):
 
 @kopf.on.create("ops.veitosiander.de", "v1", "OpenWebUIToolServer")
 @kopf.on.update("ops.veitosiander.de", "v1", "OpenWebUIToolServer")
-def upsert_fn(spec, name, namespace, **kwargs):
+async def upsert_fn(spec, name, namespace, **kwargs):
     tool_server_management = injector.get(ToolServerManagement)
+    deadline = Deadline.for_plugin("openwebui_tool_server")
     
     logger.info(f"Upserting OpenWebUIToolServer resource: {namespace}/{name}")
     
     try:
         # Retrieve API key from secret in the same namespace as the CR
-        api_key = get_api_key_from_secret(
+        api_key = await get_api_key_from_secret(
             spec['existing_secret'],
             namespace
         )
         
-        server = tool_server_management.upsert_tool_server(
+        server = await tool_server_management.upsert_tool_server(
             spec['openwebui_host'],
             api_key,
-            spec
+            spec,
+            deadline=deadline
         )
         
         # Update is_installed flag if needed
         if not spec.get('is_installed', False):
-            cr = list(kr8s.get("OpenWebUIToolServer.ops.veitosiander.de/v1", name, namespace=namespace))[0]
-            cr.patch({"spec": {"is_installed": True}})
+            cr = [cr async for cr in kr8s.asyncio.get("OpenWebUIToolServer.ops.veitosiander.de/v1", name, namespace=namespace)][0]
+            await cr.patch({"spec": {"is_installed": True}})
         
         logger.info(f"OpenWebUIToolServer {namespace}/{name} upserted successfully.")
         return {"status": "upserted"}
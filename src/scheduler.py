@@ -0,0 +1,129 @@
+import hashlib
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+import kr8s.asyncio
+from injector import singleton
+from loguru import logger
+from prometheus_client import Gauge, Histogram
+
+RECONCILE_TICK_PHASE = Histogram(
+    "llm_operator_reconcile_tick_phase",
+    "Position of each reconcile tick within the reconcile interval (0-1); a flat histogram means evenly spread load.",
+    ["plugin"],
+    buckets=[i / 10 for i in range(1, 11)],
+)
+RECONCILE_INTERVAL = Gauge(
+    "llm_operator_reconcile_interval_seconds",
+    "Current effective reconcile interval of a resource.",
+    ["plugin", "uid"],
+)
+
+
+@singleton
+class ReconcileScheduler:
+    """
+    Runs the periodic reconcile of every resource at its own stable phase within the reconcile interval.
+
+    A resource's offset is derived from its uid, so resources loaded together at startup no longer fire in
+    lockstep and keep their slot across operator restarts. Ticks are aligned to the wall clock, so jitter
+    never accumulates into drift.
+
+    With adaptive intervals, reconcile reports whether it found the resource in sync (True), drifted or
+    failed (False) or could not tell (None). In sync doubles the resource's interval up to the maximum,
+    drift and errors reset it to the minimum. The effective interval is written to the resource's status.
+
+    Environment Variables:
+    - LLM_OPERATOR_RECONCILE_INTERVAL: Seconds between reconciles of one resource (default: 600)
+    - LLM_OPERATOR_RECONCILE_JITTER: Maximum random delay in seconds added to each tick (default: 0)
+    - LLM_OPERATOR_RECONCILE_ADAPTIVE: Adapt each resource's interval to its observed drift (default: false)
+    - LLM_OPERATOR_RECONCILE_MIN_INTERVAL: Adaptive interval after drift or an error (default: 60)
+    - LLM_OPERATOR_RECONCILE_MAX_INTERVAL: Upper bound of the adaptive interval (default: 3600)
+    """
+
+    def __init__(self):
+        self.interval = float(os.getenv("LLM_OPERATOR_RECONCILE_INTERVAL", "600"))
+        self.jitter = float(os.getenv("LLM_OPERATOR_RECONCILE_JITTER", "0"))
+        self.adaptive = os.getenv("LLM_OPERATOR_RECONCILE_ADAPTIVE", "false").lower() == "true"
+        self.min_interval = float(os.getenv("LLM_OPERATOR_RECONCILE_MIN_INTERVAL", "60"))
+        self.max_interval = float(os.getenv("LLM_OPERATOR_RECONCILE_MAX_INTERVAL", "3600"))
+
+        self._intervals: Dict[str, float] = {}
+        logger.info(f"ReconcileScheduler initialized with interval={self.interval}, jitter={self.jitter}, adaptive={self.adaptive}")
+
+    def interval_of(self, uid: str) -> float:
+        """Current effective interval of a resource."""
+        return self._intervals.get(uid, self.interval)
+
+    def adapt(self, uid: str, in_sync: Optional[bool]) -> float:
+        """Grow the interval of an in-sync resource, reset it after drift or an error."""
+        interval = self.interval_of(uid)
+        if self.adaptive and in_sync is not None:
+            interval = min(interval * 2, self.max_interval) if in_sync else self.min_interval
+            self._intervals[uid] = interval
+        return interval
+
+    def offset(self, uid: str, interval: Optional[float] = None) -> float:
+        """Stable offset of a resource within the interval."""
+        interval = interval or self.interval
+        digest = int.from_bytes(hashlib.sha256(uid.encode()).digest()[:8], "big")
+        return (digest % int(interval * 1000)) / 1000
+
+    def next_tick(self, uid: str, now: float) -> float:
+        """Wall clock time of the resource's next tick after now."""
+        interval = self.interval_of(uid)
+        tick = now - (now % interval) + self.offset(uid, interval)
+        return tick if tick > now else tick + interval
+
+    async def run(self, plugin: str, uid: str, stopped, reconcile: Callable[[], Awaitable[Optional[bool]]],
+                  resource: Optional[str] = None, name: Optional[str] = None, namespace: Optional[str] = None):
+        """
+        Call reconcile once per interval at the resource's phase until the kopf daemon is stopped.
+
+        Errors of a single tick are logged, count as drift and do not end the loop. If resource is given
+        (e.g. "LiteLLMModel.ops.veitosiander.de"), adaptive interval changes are written to its status.
+        """
+        try:
+            while not stopped:
+                now = time.time()
+                delay = self.next_tick(uid, now) - now
+                if self.jitter > 0:
+                    delay += random.uniform(0, self.jitter)
+                await stopped.wait(delay)
+                if stopped:
+                    break
+
+                interval = self.interval_of(uid)
+                RECONCILE_TICK_PHASE.labels(plugin=plugin).observe((time.time() % interval) / interval)
+                try:
+                    in_sync = await reconcile()
+                except Exception as e:
+                    logger.error(f"Reconcile of {plugin} resource {uid} failed: {e}")
+                    in_sync = False
+
+                previous, interval = interval, self.adapt(uid, in_sync)
+                if self.adaptive:
+                    RECONCILE_INTERVAL.labels(plugin=plugin, uid=uid).set(interval)
+                    if resource is not None and interval != previous:
+                        await self._record(resource, name, namespace, interval, in_sync)
+        finally:
+            self._intervals.pop(uid, None)
+            try:
+                RECONCILE_INTERVAL.remove(plugin, uid)
+            except KeyError:
+                pass
+
+    async def _record(self, resource: str, name: str, namespace: str, interval: float, in_sync: Optional[bool]):
+        try:
+            cr = [cr async for cr in kr8s.asyncio.get(resource, name, namespace=namespace)][0]
+            await cr.patch({"status": {
+                "reconcile_interval": interval,
+                "in_sync": bool(in_sync),
+                "last_reconcile": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+            }})
+            logger.debug(f"Reconcile interval of {resource} {namespace}/{name} is now {interval}s")
+        except Exception as e:
+            logger.warning(f"Failed to record reconcile interval of {resource} {namespace}/{name}: {e}")
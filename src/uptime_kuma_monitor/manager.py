@@ -1,7 +1,9 @@
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
 from uptime_kuma_api import UptimeKumaApi
 
+from src.http_client.limiter import RateLimiter
+
 
 class UptimeKumaMonitorException(Exception):
     """Raised for monitor operation errors"""
@@ -17,8 +19,9 @@ class MonitorType:
 
 @singleton
 class MonitorManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
 
     def connect_to_kuma(self, kuma_url: str, username: str, password: str):
         """Create authenticated API client.
@@ -36,8 +39,9 @@ class MonitorManagement:
         """
         try:
             logger.info(f"Connecting to Uptime Kuma at {kuma_url}")
-            api = UptimeKumaApi(kuma_url)
-            api.login(username, password)
+            with self.limiter.for_host(kuma_url).slot_sync():
+                api = UptimeKumaApi(kuma_url)
+                api.login(username, password)
             logger.info(f"Successfully connected to {kuma_url}")
             return api
         except Exception as e:
@@ -55,7 +59,8 @@ class MonitorManagement:
             dict: Monitor details or None if not found
         """
         try:
-            monitors = api.get_monitors()
+            with self.limiter.for_host(api.url).slot_sync():
+                monitors = api.get_monitors()
             for monitor in monitors:
                 if monitor.get('id') == monitor_id:
                     return monitor
@@ -76,7 +81,8 @@ class MonitorManagement:
             dict: Monitor details or None if not found
         """
         try:
-            monitors = api.get_monitors()
+            with self.limiter.for_host(api.url).slot_sync():
+                monitors = api.get_monitors()
             for monitor in monitors:
                 if monitor.get('name') == name:
                     return monitor
@@ -101,7 +107,8 @@ class MonitorManagement:
         """
         try:
             logger.info(f"Creating monitor: {monitor_data.get('name')}")
-            result = api.add_monitor(**monitor_data)
+            with self.limiter.for_host(api.url).slot_sync():
+                result = api.add_monitor(**monitor_data)
             logger.info(f"Successfully created monitor with ID {result.get('monitorID')}")
             return result
         except Exception as e:
@@ -125,7 +132,8 @@ class MonitorManagement:
         try:
             logger.info(f"Updating monitor {monitor_id}")
             # Pass monitor_id as first positional argument (id_)
-            result = api.edit_monitor(monitor_id, **monitor_data)
+            with self.limiter.for_host(api.url).slot_sync():
+                result = api.edit_monitor(monitor_id, **monitor_data)
             logger.info(f"Successfully updated monitor {monitor_id}")
             return result
         except Exception as e:
@@ -147,7 +155,8 @@ class MonitorManagement:
         """
         try:
             logger.info(f"Deleting monitor {monitor_id}")
-            api.delete_monitor(monitor_id)
+            with self.limiter.for_host(api.url).slot_sync():
+                api.delete_monitor(monitor_id)
             logger.info(f"Successfully deleted monitor {monitor_id}")
             return True
         except Exception as e:
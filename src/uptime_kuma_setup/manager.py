@@ -1,7 +1,9 @@
-from injector import singleton
+from injector import singleton, inject
 from loguru import logger
 from uptime_kuma_api import UptimeKumaApi
 
+from src.http_client.limiter import RateLimiter
+
 
 class UptimeKumaSetupException(Exception):
     """Raised for setup/connection errors"""
@@ -10,8 +12,9 @@ class UptimeKumaSetupException(Exception):
 
 @singleton
 class SetupManagement:
-    def __init__(self):
-        pass
+    @inject
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
 
     def setup(self, kuma_url: str, username: str, password: str) -> bool:
         """
@@ -27,8 +30,9 @@ class SetupManagement:
         """
         try:
             logger.info(f"Connecting to Uptime Kuma at {kuma_url}")
-            api = UptimeKumaApi(kuma_url)
-            api.setup(username, password)
+            with self.limiter.for_host(kuma_url).slot_sync():
+                api = UptimeKumaApi(kuma_url)
+                api.setup(username, password)
             logger.info(f"Successfully connected to {kuma_url}")
             return True
         except Exception as e:
@@ -49,8 +53,9 @@ class SetupManagement:
         """
         try:
             logger.info(f"Connecting to Uptime Kuma at {kuma_url}")
-            api = UptimeKumaApi(kuma_url)
-            return api.need_setup()
+            with self.limiter.for_host(kuma_url).slot_sync():
+                api = UptimeKumaApi(kuma_url)
+                return api.need_setup()
         except Exception as e:
             logger.error(f"Connection failed: {e}")
             if 'api' in locals():
@@ -0,0 +1,88 @@
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+from unittest.mock import AsyncMock
+from urllib.parse import urlsplit
+
+from src.http_client.client import HttpResponse
+
+Route = Union[Any, Callable[[Dict[str, Any]], Any]]
+
+
+class FakeHttp:
+    """
+    Stand-in for HttpClient answering each (method, path) from a route table and recording every call.
+
+    A route is a JSON body, a (status_code, body) tuple, or a callable taking the call's kwargs and returning either.
+    """
+
+    stream_lookups = False
+
+    def __init__(self, routes: Dict[Tuple[str, str], Route] = None):
+        self.routes = dict(routes or {})
+        self.calls: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    def with_probe(self, probe_path: str) -> "FakeHttp":
+        return self
+
+    def available(self, url: str) -> bool:
+        return True
+
+    def calls_to(self, method: str, path: str) -> List[Dict[str, Any]]:
+        return [kwargs for m, p, kwargs in self.calls if (m, p) == (method, path)]
+
+    async def request(self, method: str, url: str, **kwargs) -> HttpResponse:
+        path = urlsplit(url).path
+        self.calls.append((method, path, kwargs))
+        route = self.routes.get((method, path), (404, {"detail": "not found"}))
+        if callable(route):
+            route = route(kwargs)
+        status_code, body = route if isinstance(route, tuple) else (200, route)
+        return HttpResponse(status_code, {}, json.dumps(body).encode(), {}, url)
+
+    async def stream_json_lines(self, method: str, url: str, on_item: Callable[[Any], Awaitable[None]], **kwargs) -> HttpResponse:
+        """Stream a route whose body is a list of lines; like the real client, matches holds the last line on 200."""
+        response = await self.request(method, url, **kwargs)
+        if response.status_code != 200:
+            return response
+        lines = response.json()
+        for line in lines:
+            await on_item(line)
+        response.matches = lines[-1:]
+        return response
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+
+class FakeCR:
+    """A kr8s custom resource recording the patches sent to it."""
+
+    def __init__(self, name: str = "cr", namespace: str = "default", spec: Dict[str, Any] = None, status: Dict[str, Any] = None):
+        self.name = name
+        self.namespace = namespace
+        self.raw = {"metadata": {"name": name, "namespace": namespace}, "spec": dict(spec or {}), "status": dict(status or {})}
+        self.metadata = self.raw["metadata"]
+        self.patch = AsyncMock()
+
+
+def fake_get(*crs: FakeCR, resource: str = None):
+    """
+    Replacement for kr8s.asyncio.get yielding the given resources, filtered by name if one is asked for.
+
+    With resource set, lookups of any other kind find nothing.
+    """
+
+    async def get(kind, name=None, namespace=None, **kwargs):
+        if resource is not None and kind != resource:
+            return
+        for cr in crs:
+            if name is None or cr.name == name:
+                yield cr
+
+    return get
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.http_client.breaker import CircuitBreaker, CircuitOpenException, CircuitState, HostBreaker
+
+
+async def healthy(breaker):
+    return True
+
+
+async def unhealthy(breaker):
+    return False
+
+
+async def test_opens_after_consecutive_failures():
+    breaker = HostBreaker("http://litellm:4000", failure_threshold=3, probe_interval=60)
+    breaker.record_failure(healthy)
+    breaker.record_failure(healthy)
+    breaker.check("GET /model/info")
+
+    breaker.record_failure(healthy)
+    assert breaker.state == CircuitState.OPEN
+    assert 0 < breaker.retry_in() <= 60
+    with pytest.raises(CircuitOpenException):
+        breaker.check("GET /model/info")
+    breaker.cancel()
+
+
+async def test_success_resets_the_failure_count():
+    breaker = HostBreaker("http://litellm:4000", failure_threshold=2, probe_interval=60)
+    breaker.record_failure(healthy)
+    breaker.record_success()
+    breaker.record_failure(healthy)
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_successful_probe_closes_the_circuit():
+    breaker = HostBreaker("http://litellm:4000", failure_threshold=1, probe_interval=0.01)
+    breaker.record_failure(healthy)
+    await asyncio.wait_for(breaker._probe_task, 1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.retry_in() == 0
+
+
+async def test_failed_probe_keeps_the_circuit_open():
+    probes = []
+
+    async def probe(breaker):
+        probes.append(breaker.state)
+        return len(probes) > 1
+
+    breaker = HostBreaker("http://litellm:4000", failure_threshold=1, probe_interval=0.01)
+    breaker.record_failure(probe)
+    await asyncio.wait_for(breaker._probe_task, 1)
+    # Half-open while each probe is in flight, closed after the second one succeeded
+    assert probes == [CircuitState.HALF_OPEN, CircuitState.HALF_OPEN]
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_probe_errors_count_as_unhealthy():
+    async def probe(breaker):
+        raise ConnectionError("refused")
+
+    breaker = HostBreaker("http://litellm:4000", failure_threshold=1, probe_interval=0.01)
+    breaker.record_failure(probe)
+    await asyncio.sleep(0.05)
+    assert breaker.state != CircuitState.CLOSED
+    breaker.cancel()
+
+
+def test_registry_keys_breakers_by_host():
+    registry = CircuitBreaker()
+    assert registry.for_host("http://Ollama:11434/api/tags") is registry.for_host("http://ollama:11434/api/pull")
+    assert registry.is_closed("http://ollama:11434/api/tags")
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from src.http_client.cache import ResponseCache
+
+HOST = "http://litellm:4000"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setenv("HTTP_CACHE_TTL", "30")
+    monkeypatch.setenv("HTTP_CACHE_MAXSIZE", "2")
+    return ResponseCache()
+
+
+def test_hit_and_miss(cache):
+    assert cache.get(HOST, "/model/info", "") is None
+    cache.put(HOST, "/model/info", "", "models")
+    assert cache.get(HOST, "/model/info", "") == "models"
+    assert cache.get(HOST, "/model/info", "other-key") is None
+
+
+def test_expired_entries_are_dropped(cache, monkeypatch):
+    cache.put(HOST, "/model/info", "", "models")
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert cache.get(HOST, "/model/info", "") is None
+    assert len(cache._entries) == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.put(HOST, "/a", "", "a")
+    cache.put(HOST, "/b", "", "b")
+    cache.get(HOST, "/a", "")
+    cache.put(HOST, "/c", "", "c")
+    assert cache.get(HOST, "/b", "") is None
+    assert cache.get(HOST, "/a", "") == "a"
+    assert cache.get(HOST, "/c", "") == "c"
+
+
+def test_invalidate_drops_only_that_host(cache):
+    cache.put(HOST, "/model/info", "", "models")
+    cache.put("http://ollama:11434", "/api/tags", "", "tags")
+    cache.invalidate(HOST)
+    assert cache.get(HOST, "/model/info", "") is None
+    assert cache.get("http://ollama:11434", "/api/tags", "") == "tags"
+
+
+def test_zero_ttl_disables_the_cache(monkeypatch):
+    monkeypatch.setenv("HTTP_CACHE_TTL", "0")
+    cache = ResponseCache()
+    cache.put(HOST, "/model/info", "", "models")
+    assert cache.get(HOST, "/model/info", "") is None
@@ -0,0 +1,27 @@
+from src.http_client.client import SessionRegistry
+
+
+async def test_one_session_per_host():
+    registry = SessionRegistry()
+    session = registry.get_session("http://LiteLLM:4000/model/info")
+    assert registry.get_session("http://litellm:4000/key/list") is session
+    assert registry.get_session("http://ollama:11434/api/tags") is not session
+    await registry.close()
+    assert session.closed
+
+
+async def test_closed_session_is_replaced():
+    registry = SessionRegistry()
+    session = registry.get_session("http://litellm:4000/")
+    await session.close()
+    replacement = registry.get_session("http://litellm:4000/")
+    assert replacement is not session and not replacement.closed
+    await registry.close()
+
+
+async def test_sessions_never_keep_cookies():
+    registry = SessionRegistry()
+    session = registry.get_session("http://n8n:5678/")
+    session.cookie_jar.update_cookies({"n8n-auth": "secret"})
+    assert len(session.cookie_jar) == 0
+    await registry.close()
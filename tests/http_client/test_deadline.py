@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from src.http_client.deadline import Deadline, DeadlineExceededException
+
+
+def test_for_plugin_prefers_plugin_env_over_code_default(monkeypatch):
+    monkeypatch.setenv("LLM_OPERATOR_DEADLINE", "60")
+    monkeypatch.setenv("OLLAMA_MODEL_DEADLINE", "5")
+    assert Deadline.for_plugin("ollama_model", default=900).budget == 5
+
+
+def test_for_plugin_prefers_code_default_over_global_env(monkeypatch):
+    monkeypatch.setenv("LLM_OPERATOR_DEADLINE", "60")
+    monkeypatch.delenv("OLLAMA_MODEL_DEADLINE", raising=False)
+    assert Deadline.for_plugin("ollama_model", default=900).budget == 900
+
+
+def test_for_plugin_falls_back_to_global_env(monkeypatch):
+    monkeypatch.setenv("LLM_OPERATOR_DEADLINE", "42")
+    monkeypatch.delenv("LITELLM_MODEL_DEADLINE", raising=False)
+    deadline = Deadline.for_plugin("litellm_model")
+    assert deadline.budget == 42
+    assert deadline.plugin == "litellm_model"
+
+
+def test_timeout_is_capped_by_the_call_timeout():
+    deadline = Deadline(60)
+    assert deadline.timeout("GET", cap=5) == 5
+    assert 59 < deadline.timeout("GET") <= 60
+
+
+def test_timeout_is_capped_by_the_remaining_budget():
+    deadline = Deadline(2)
+    assert deadline.timeout("GET", cap=30) <= 2
+
+
+def test_expired_deadline_raises():
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    assert deadline.expired
+    assert deadline.remaining() == 0
+    with pytest.raises(DeadlineExceededException, match="during GET /model/info"):
+        deadline.timeout("GET /model/info")
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from src.http_client.jsonstream import JsonArrayScanner, JsonStreamException
+
+BODY = json.dumps({
+    "total": 3,
+    "meta": {"data": ["not", "this"], "note": "a \"data\": [ in a string"},
+    "data": [{"id": "a", "name": "ü"}, [1, 2], "x", 2.5, -10, True, None, 1e3],
+}).encode()
+
+
+def scan(body, chunk_size, array_key="data"):
+    scanner = JsonArrayScanner(array_key)
+    items = []
+    for i in range(0, len(body), chunk_size):
+        items += list(scanner.feed(body[i:i + chunk_size]))
+    scanner.close()
+    return items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, len(BODY)])
+def test_every_chunking_yields_the_same_items(chunk_size):
+    assert scan(BODY, chunk_size) == json.loads(BODY)["data"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_numbers_split_across_chunks_are_not_truncated(chunk_size):
+    assert scan(b"[12345, 2.5, -0.125e2, 7]", chunk_size, array_key=None) == [12345, 2.5, -12.5, 7]
+
+
+def test_number_before_the_closing_bracket_waits_for_it():
+    scanner = JsonArrayScanner(None)
+    assert list(scanner.feed(b"[1, 2")) == [1]
+    assert list(scanner.feed(b"5")) == []
+    assert list(scanner.feed(b"]")) == [25]
+    assert scanner.done
+
+
+def test_stops_at_the_end_of_the_array():
+    scanner = JsonArrayScanner("data")
+    assert list(scanner.feed(b'{"data": [1]')) == [1]
+    assert scanner.done
+    assert list(scanner.feed(b', "more": [2]}')) == []
+
+
+def test_body_without_the_array():
+    scanner = JsonArrayScanner("data")
+    assert list(scanner.feed(b'{"other": [1, 2]}')) == []
+    assert scanner.done
+
+
+def test_truncated_body_raises():
+    scanner = JsonArrayScanner("data")
+    list(scanner.feed(b'{"data": [{"id": "a"}, {"id"'))
+    with pytest.raises(JsonStreamException):
+        scanner.close()
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.http_client.limiter import HostLimiter, RateLimiter
+
+
+def test_for_host_shares_one_limiter_per_host(monkeypatch):
+    limiter = RateLimiter()
+    assert limiter.for_host("http://LiteLLM:4000/model/info") is limiter.for_host("http://litellm:4000/key/list")
+    assert limiter.for_host("http://litellm:4000/") is not limiter.for_host("http://ollama:11434/")
+
+
+def test_burst_is_free_then_tokens_cost_time():
+    limiter = HostLimiter("http://litellm:4000", rate=10, burst=3, max_in_flight=10)
+    assert [limiter._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter._reserve() == pytest.approx(0.1, abs=0.01)
+    assert limiter._reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_zero_rate_disables_the_bucket():
+    limiter = HostLimiter("http://litellm:4000", rate=0, burst=1, max_in_flight=10)
+    assert [limiter._reserve() for _ in range(5)] == [0.0] * 5
+
+
+async def test_in_flight_cap():
+    limiter = HostLimiter("http://litellm:4000", rate=0, burst=1, max_in_flight=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.acquire(max_wait=0.05)
+
+    limiter.release()
+    await limiter.acquire(max_wait=0.05)
+
+
+async def test_max_wait_refunds_a_token_it_cannot_wait_for():
+    limiter = HostLimiter("http://litellm:4000", rate=1, burst=1, max_in_flight=10)
+    async with limiter.slot():
+        pass
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.acquire(max_wait=0.1)
+
+    # The refused caller neither kept its slot nor its token
+    assert limiter._semaphore._value == 10
+    assert limiter._reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_slot_sync_releases_the_slot():
+    limiter = HostLimiter("http://uptime-kuma:3001", rate=0, burst=1, max_in_flight=1)
+    with limiter.slot_sync():
+        assert not limiter._sync_semaphore.acquire(blocking=False)
+    assert limiter._sync_semaphore.acquire(blocking=False)
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.http_client.deadline import Deadline
+from src.http_client.retry import RetryPolicy, retry_after_seconds
+
+
+class TransportError(Exception):
+    pass
+
+
+def response(status_code, headers=None):
+    return SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+def test_retry_after_as_seconds():
+    assert retry_after_seconds({"Retry-After": "3"}) == 3
+    assert retry_after_seconds({"Retry-After": "-1"}) == 0
+
+
+def test_retry_after_as_http_date():
+    at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 28 <= retry_after_seconds({"Retry-After": format_datetime(at, usegmt=True)}) <= 30
+
+
+def test_retry_after_missing_or_invalid():
+    assert retry_after_seconds(None) is None
+    assert retry_after_seconds({}) is None
+    assert retry_after_seconds({"Retry-After": "soon"}) is None
+
+
+def test_only_idempotent_methods_are_retried(monkeypatch):
+    monkeypatch.setenv("HTTP_RETRY_ATTEMPTS", "3")
+    policy = RetryPolicy()
+    assert policy.should_retry("get")
+    assert policy.should_retry("DELETE")
+    assert not policy.should_retry("POST")
+
+    monkeypatch.setenv("HTTP_RETRY_ATTEMPTS", "1")
+    assert not RetryPolicy().should_retry("GET")
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    monkeypatch.setenv("HTTP_RETRY_ATTEMPTS", "3")
+    monkeypatch.setenv("HTTP_RETRY_INITIAL_WAIT", "0")
+    monkeypatch.setenv("HTTP_RETRY_JITTER", "0")
+    monkeypatch.setenv("HTTP_RETRY_MAX_WAIT", "0.5")
+    return RetryPolicy()
+
+
+async def send(policy, outcomes, deadline=None):
+    """Run the outcomes through the policy like the client does, returning the final response and the attempts."""
+    attempts = 0
+    async for attempt in policy.retrying("http://litellm:4000", TransportError, deadline):
+        with attempt:
+            outcome = outcomes[attempts]
+            attempts += 1
+            if isinstance(outcome, Exception):
+                raise outcome
+        if not attempt.retry_state.outcome.failed:
+            attempt.retry_state.set_result(outcome)
+    return attempt.retry_state.outcome.result(), attempts
+
+
+async def test_retries_transient_status_codes(policy):
+    final, attempts = await send(policy, [response(503), response(429), response(200)])
+    assert (final.status_code, attempts) == (200, 3)
+
+
+async def test_returns_the_last_response_once_attempts_are_exhausted(policy):
+    final, attempts = await send(policy, [response(502), response(502), response(502)])
+    assert (final.status_code, attempts) == (502, 3)
+
+
+async def test_does_not_retry_client_errors(policy):
+    final, attempts = await send(policy, [response(404)])
+    assert (final.status_code, attempts) == (404, 1)
+
+
+async def test_retries_transport_errors(policy):
+    final, attempts = await send(policy, [TransportError("reset"), response(200)])
+    assert (final.status_code, attempts) == (200, 2)
+
+
+async def test_retry_after_is_capped_by_max_wait(policy):
+    final, attempts = await send(policy, [response(429, {"Retry-After": "3600"}), response(200)])
+    assert (final.status_code, attempts) == (200, 2)
+
+
+async def test_no_retry_sleeps_past_the_deadline(policy):
+    final, attempts = await send(policy, [response(429, {"Retry-After": "1"}), response(200)], Deadline(0.1))
+    assert (final.status_code, attempts) == (429, 1)
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from src.http_client.singleflight import SingleFlight, auth_identity
+
+HOST = "http://litellm:4000"
+
+
+def test_auth_identity_covers_credentials_only():
+    assert auth_identity(None) == ""
+    assert auth_identity({"Accept": "application/json"}) == ""
+    assert auth_identity({"Authorization": "Bearer a"}) == auth_identity({"authorization": "Bearer a", "Accept": "*/*"})
+    assert auth_identity({"Authorization": "Bearer a"}) != auth_identity({"Authorization": "Bearer b"})
+
+
+@pytest.fixture
+def flights(monkeypatch):
+    monkeypatch.setenv("HTTP_COALESCE", "true")
+    return SingleFlight()
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+
+async def test_concurrent_identical_calls_share_one_flight(flights):
+    upstream = Upstream()
+    callers = [asyncio.create_task(flights.do(HOST, "/model/info", "", upstream)) for _ in range(5)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    assert await asyncio.gather(*callers) == [1] * 5
+    assert upstream.calls == 1
+    assert flights._flights == {}
+
+
+async def test_different_identities_do_not_share(flights):
+    upstream = Upstream()
+    upstream.release.set()
+    await asyncio.gather(flights.do(HOST, "/model/info", "a", upstream), flights.do(HOST, "/model/info", "b", upstream))
+    assert upstream.calls == 2
+
+
+async def test_a_write_starts_a_new_flight(flights):
+    upstream = Upstream()
+    before = asyncio.create_task(flights.do(HOST, "/model/info", "", upstream))
+    await asyncio.sleep(0)
+    flights.invalidate(HOST)
+    after = asyncio.create_task(flights.do(HOST, "/model/info", "", upstream))
+    await asyncio.sleep(0)
+    upstream.release.set()
+    await asyncio.gather(before, after)
+    assert upstream.calls == 2
+
+
+async def test_a_caller_timing_out_does_not_cancel_the_flight(flights):
+    upstream = Upstream()
+    impatient = asyncio.create_task(flights.do(HOST, "/model/info", "", upstream, max_wait=0.01))
+    patient = asyncio.create_task(flights.do(HOST, "/model/info", "", upstream))
+    with pytest.raises(asyncio.TimeoutError):
+        await impatient
+    upstream.release.set()
+    assert await patient == 1
+
+
+async def test_errors_reach_every_caller(flights):
+    async def failing():
+        await asyncio.sleep(0)
+        raise ConnectionError("refused")
+
+    results = await asyncio.gather(*[flights.do(HOST, "/model/info", "", failing) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert flights._flights == {}
+
+
+async def test_disabled_calls_every_time(monkeypatch):
+    monkeypatch.setenv("HTTP_COALESCE", "false")
+    flights = SingleFlight()
+    upstream = Upstream()
+    upstream.release.set()
+    await asyncio.gather(*[flights.do(HOST, "/model/info", "", upstream) for _ in range(3)])
+    assert upstream.calls == 3
@@ -0,0 +1,33 @@
+import pytest
+from loguru import logger
+
+from src.http_client import trace
+from src.http_client.client import HttpResponse
+
+
+@pytest.fixture
+def lines():
+    lines = []
+    handler = logger.add(lines.append, level="TRACE", format="{message}")
+    yield lines
+    logger.remove(handler)
+
+
+def test_response_body_is_capped(lines, monkeypatch):
+    monkeypatch.setattr(trace, "HTTP_TRACE_MAX_BYTES", 10)
+    trace.trace_response("List models", HttpResponse(200, {}, b"x" * 50, {}, "http://litellm:4000"))
+    assert lines[0].strip() == f"List models response: 200 - {'x' * 10}... (50 bytes total)"
+
+
+def test_streamed_response_is_not_decoded(lines):
+    trace.trace_response("Find model", HttpResponse(200, {}, b"", {}, "http://litellm:4000", matches=[{}]))
+    assert lines[0].strip() == "Find model response: 200 - <streamed, 1 matches>"
+
+
+def test_nothing_is_serialized_below_trace_level(monkeypatch):
+    def fail(data):
+        raise AssertionError("serialized although no handler takes TRACE")
+
+    # loguru's default handler starts at DEBUG
+    monkeypatch.setattr(trace, "_data_preview", fail)
+    trace.trace_data("Creating model with data", {"model_name": "llama3"})
@@ -0,0 +1,51 @@
+import json
+from unittest.mock import MagicMock
+
+import kubecrd
+import pytest
+from kubernetes import client, utils
+from kubernetes.client.rest import ApiException
+
+from src.litellm_key.crd import LiteLLMKey
+
+
+def install_error(code):
+    error = ApiException(status=code)
+    error.body = json.dumps({"code": code})
+    return utils.FailToCreateError([error])
+
+
+@pytest.fixture
+def apiextensions(monkeypatch):
+    api = MagicMock()
+    api.read_custom_resource_definition.return_value = MagicMock(spec=["spec"])
+    monkeypatch.setattr(client, "ApiextensionsV1Api", lambda k8s_client: api)
+    return api
+
+
+def test_new_crd_is_created(monkeypatch, apiextensions):
+    monkeypatch.setattr(kubecrd.KubeResourceBase, "install", classmethod(lambda cls, k8s_client, exist_ok=False: None))
+    LiteLLMKey.install(MagicMock())
+    apiextensions.replace_custom_resource_definition.assert_not_called()
+
+
+def test_existing_crd_gets_the_current_schema(monkeypatch, apiextensions):
+    def install(cls, k8s_client, exist_ok=False):
+        raise install_error(409)
+
+    monkeypatch.setattr(kubecrd.KubeResourceBase, "install", classmethod(install))
+    LiteLLMKey.install(MagicMock())
+
+    name, crd = apiextensions.replace_custom_resource_definition.call_args.args
+    assert name == "litellmkeys.ops.veitosiander.de"
+    spec = crd.spec.versions[0]["schema"]["openAPIV3Schema"]["properties"]["spec"]["properties"]
+    assert {"key_metadata", "rotation", "applied_rotation"} <= set(spec)
+
+
+def test_other_install_errors_are_raised(monkeypatch, apiextensions):
+    def install(cls, k8s_client, exist_ok=False):
+        raise install_error(422)
+
+    monkeypatch.setattr(kubecrd.KubeResourceBase, "install", classmethod(install))
+    with pytest.raises(utils.FailToCreateError):
+        LiteLLMKey.install(MagicMock())
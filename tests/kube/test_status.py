@@ -0,0 +1,10 @@
+from src.kube.status import RECONCILE_STATUS_SCHEMA
+from src.ollama_model.crd import OllamaModel
+
+
+def test_status_schema_has_reconcile_and_own_fields():
+    schema = OllamaModel.crd_schema_dict()["spec"]["versions"][0]["schema"]["openAPIV3Schema"]["properties"]
+    status = schema["status"]["properties"]
+    assert set(RECONCILE_STATUS_SCHEMA) <= set(status)
+    assert status["pull"]["type"] == "object"
+    assert "status" not in schema["spec"]["properties"]
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.http_client.deadline import Deadline
+from src.litellm_key.batch import KeyDeleteBatcher
+from src.litellm_key.index import KeyIndex
+from src.litellm_key.manager import KeyManagement
+from tests.fakes import FakeHttp
+
+HOST = "http://litellm:4000"
+
+
+class Sender:
+    def __init__(self, errors=None):
+        self.batches = []
+        self.errors = errors or {}
+
+    async def __call__(self, litellm_host, litellm_api_key, aliases, deadline):
+        self.batches.append((litellm_host, litellm_api_key, aliases, deadline))
+        await asyncio.sleep(0)
+        return {alias: self.errors.get(alias) for alias in aliases}
+
+
+async def test_deletions_within_the_window_share_one_request():
+    send = Sender(errors={"b": "404 - not found"})
+    batcher = KeyDeleteBatcher(send, window=0.01, max_size=100)
+
+    results = await asyncio.gather(*[batcher.submit(HOST, "sk-1", alias) for alias in ("a", "b", "c", "a")])
+
+    assert results == [None, "404 - not found", None, None]
+    assert [batch[2] for batch in send.batches] == [["a", "b", "c"]]
+
+
+async def test_batches_are_per_host_and_credential():
+    send = Sender()
+    batcher = KeyDeleteBatcher(send, window=0.01, max_size=100)
+    await asyncio.gather(batcher.submit(HOST, "sk-1", "a"), batcher.submit(HOST, "sk-2", "b"), batcher.submit("http://other:4000", "sk-1", "c"))
+    assert len(send.batches) == 3
+
+
+async def test_full_batches_are_sent_right_away():
+    send = Sender()
+    batcher = KeyDeleteBatcher(send, window=60, max_size=2)
+    await asyncio.wait_for(asyncio.gather(batcher.submit(HOST, "sk-1", "a"), batcher.submit(HOST, "sk-1", "b")), 1)
+    assert [batch[2] for batch in send.batches] == [["a", "b"]]
+
+
+async def test_batch_gets_the_longest_deadline():
+    send = Sender()
+    batcher = KeyDeleteBatcher(send, window=0.01, max_size=100)
+    short, long = Deadline(5), Deadline(50)
+    await asyncio.gather(batcher.submit(HOST, "sk-1", "a", short), batcher.submit(HOST, "sk-1", "b", long))
+    assert send.batches[0][3] is long
+
+
+async def test_errors_reach_every_submitter():
+    async def send(litellm_host, litellm_api_key, aliases, deadline):
+        raise ConnectionError("refused")
+
+    batcher = KeyDeleteBatcher(send, window=0.01, max_size=100)
+    results = await asyncio.gather(batcher.submit(HOST, "sk-1", "a"), batcher.submit(HOST, "sk-1", "b"), return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+async def test_zero_window_sends_immediately():
+    send = Sender()
+    batcher = KeyDeleteBatcher(send, window=0, max_size=100)
+    assert await batcher.submit(HOST, "sk-1", "a") is None
+    assert await batcher.submit(HOST, "sk-1", "b") is None
+    assert len(send.batches) == 2
+
+
+async def test_rejected_batch_falls_back_to_single_deletions(monkeypatch):
+    monkeypatch.setenv("LITELLM_KEY_DELETE_BATCH_WINDOW", "0.01")
+
+    def key_delete(kwargs):
+        aliases = kwargs["json"]["key_aliases"]
+        return (404, {"error": "not found"}) if "missing" in aliases else {"deleted_keys": aliases}
+
+    http = FakeHttp({("POST", "/key/delete"): key_delete})
+    management = KeyManagement(http, KeyIndex(http))
+
+    results = await asyncio.gather(management.delete_key(HOST, "sk-1", "a"), management.delete_key(HOST, "sk-1", "missing"),
+                                   return_exceptions=True)
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+    assert [call["json"]["key_aliases"] for call in http.calls_to("POST", "/key/delete")] == [["a", "missing"], ["a"], ["missing"]]
+
+
+async def test_generations_are_bounded(monkeypatch):
+    monkeypatch.setenv("LITELLM_KEY_GENERATE_CONCURRENCY", "2")
+    in_flight, peak = 0, 0
+
+    class SlowHttp(FakeHttp):
+        async def post(self, url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await super().post(url, **kwargs)
+
+    def key_generate(kwargs):
+        return {"key": f"sk-{kwargs['json']['key_alias']}", "token": f"t-{kwargs['json']['key_alias']}"}
+
+    http = SlowHttp({("POST", "/key/generate"): key_generate})
+    management = KeyManagement(http, KeyIndex(http))
+
+    results = await asyncio.gather(*[management.generate_key(HOST, "sk-1", f"u{i}", f"k{i}", f"k{i}", "") for i in range(6)])
+
+    assert results == [f"sk-k{i}" for i in range(6)]
+    assert peak == 2
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from src.litellm_key.index import HostKeys, KeyIndex, LiteLLMKeyIndexException
+from tests.fakes import FakeHttp
+
+HOST = "http://litellm:4000"
+
+
+def test_host_keys_merge_updates_and_follow_alias_changes():
+    keys = HostKeys()
+    keys.add({"token": "t1", "key_alias": "alice", "models": []})
+    keys.add({"token": "t1", "key_alias": "alice-2"})
+    assert keys.by_token["t1"] == {"token": "t1", "key_alias": "alice-2", "models": []}
+    assert set(keys.by_alias) == {"alice-2"}
+
+    keys.add({"key_alias": "no-token"})
+    assert len(keys) == 1
+
+    keys.remove("t1")
+    assert (keys.by_token, keys.by_alias) == ({}, {})
+
+
+def paged(keys, page_size):
+    def key_list(kwargs):
+        page, size = kwargs["params"]["page"], kwargs["params"]["size"]
+        return {"keys": keys[(page - 1) * size:page * size], "total_pages": -(-len(keys) // page_size)}
+    return key_list
+
+
+@pytest.fixture
+def keys():
+    return [{"token": f"t{i}", "key_alias": f"user-{i}"} for i in range(25)]
+
+
+@pytest.fixture
+def http(keys):
+    return FakeHttp({("GET", "/key/list"): paged(keys, 10)})
+
+
+@pytest.fixture
+def index(http, monkeypatch):
+    monkeypatch.setenv("LITELLM_KEY_INDEX_TTL", "300")
+    monkeypatch.setenv("LITELLM_KEY_INDEX_PAGE_SIZE", "10")
+    return KeyIndex(http)
+
+
+async def test_walks_every_page_once(index, http):
+    results = await asyncio.gather(*[index.get_by_alias(HOST, "sk-1", f"user-{i}") for i in (0, 12, 24)])
+    assert [key["token"] for key in results] == ["t0", "t12", "t24"]
+    assert sorted(call["params"]["page"] for call in http.calls_to("GET", "/key/list")) == [1, 2, 3]
+
+
+async def test_recorded_keys_are_found_without_a_new_walk(index, http):
+    await index.snapshot(HOST, "sk-1")
+    index.record(HOST + "/", {"token": "t99", "key_alias": "new", "key": "sk-secret"})
+
+    key = await index.get_by_alias(HOST, "sk-1", "new")
+    assert key == {"token": "t99", "key_alias": "new"}
+    assert len(http.calls_to("GET", "/key/list")) == 3
+
+
+async def test_recording_a_key_without_token_drops_the_index(index, http):
+    await index.snapshot(HOST, "sk-1")
+    index.record(HOST, {"key_alias": "new", "key": "sk-secret"})
+    await index.snapshot(HOST, "sk-1")
+    assert len(http.calls_to("GET", "/key/list")) == 6
+
+
+async def test_forgotten_keys_are_gone(index):
+    await index.snapshot(HOST, "sk-1")
+    index.forget(HOST, "user-3")
+    assert await index.get_by_alias(HOST, "sk-1", "user-3") is None
+
+
+async def test_failed_walk_raises(index, http):
+    http.routes[("GET", "/key/list")] = (401, {"error": "bad key"})
+    with pytest.raises(LiteLLMKeyIndexException):
+        await index.snapshot(HOST, "sk-1")
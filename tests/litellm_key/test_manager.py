@@ -0,0 +1,44 @@
+import pytest
+
+from src.litellm_key.index import KeyIndex
+from src.litellm_key.manager import KeyManagement
+from tests.fakes import FakeHttp
+
+HOST = "http://litellm:4000"
+KEY = {"token": "t1", "key_alias": "alice", "user_id": "alice", "team_id": "team-a", "models": ["gpt-4o", "llama3"],
+       "metadata": {"owner": "alice", "litellm_budget": "x"}}
+
+
+def test_key_in_sync_has_no_changes():
+    assert KeyManagement.key_changes(KEY, "alice", "team-a", ["llama3", "gpt-4o"], {"owner": "alice"}) == {}
+
+
+def test_key_changes_lists_only_differing_fields():
+    changes = KeyManagement.key_changes(KEY, "alice", "", ["llama3"], {"owner": "bob"})
+    assert changes == {"team_id": None, "models": ["llama3"], "metadata": {"owner": "bob", "litellm_budget": "x"}}
+
+
+def test_unset_fields_compare_equal_to_empty_ones():
+    key = {"token": "t1", "user_id": None, "team_id": None, "models": None}
+    assert KeyManagement.key_changes(key, "", "", [], {}) == {}
+
+
+async def test_update_key_sends_only_the_changes_and_updates_the_index(monkeypatch):
+    monkeypatch.setenv("LITELLM_KEY_INDEX_TTL", "300")
+    http = FakeHttp({("POST", "/key/update"): {}, ("GET", "/key/list"): {"keys": [KEY], "total_pages": 1}})
+    index = KeyIndex(http)
+    management = KeyManagement(http, index)
+    await index.snapshot(HOST, "sk-1")
+
+    await management.update_key(HOST, "sk-1", "t1", {"models": ["llama3"]})
+
+    assert http.calls_to("POST", "/key/update")[0]["json"] == {"key": "t1", "models": ["llama3"]}
+    assert (await index.get_by_alias(HOST, "sk-1", "alice"))["models"] == ["llama3"]
+    assert len(http.calls_to("GET", "/key/list")) == 1
+
+
+async def test_failed_update_raises(monkeypatch):
+    http = FakeHttp({("POST", "/key/update"): (400, {"error": "invalid team"})})
+    management = KeyManagement(http, KeyIndex(http))
+    with pytest.raises(ValueError, match="invalid team"):
+        await management.update_key(HOST, "sk-1", "t1", {"team_id": "nope"})
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.litellm_model.inventory import HostInventory, LiteLLMModelInventoryException, ModelInventory
+from tests.fakes import FakeHttp
+
+HOST = "http://litellm:4000"
+MODELS = [
+    {"model_name": "gpt-4o", "model_info": {"id": "m1"}},
+    {"model_name": "gpt-4o", "model_info": {"id": "m2"}},
+    {"model_name": "llama3", "model_info": {"id": "m3"}},
+]
+
+
+def test_host_inventory_indexes_by_name_and_id():
+    inventory = HostInventory(MODELS)
+    assert inventory.by_name["gpt-4o"]["model_info"]["id"] == "m1"
+    assert set(inventory.by_id) == {"m1", "m2", "m3"}
+    assert len(inventory) == 3
+
+
+@pytest.fixture
+def http():
+    return FakeHttp({("GET", "/model/info"): {"data": MODELS}})
+
+
+@pytest.fixture
+def inventory(http, monkeypatch):
+    monkeypatch.setenv("LITELLM_MODEL_INVENTORY_TTL", "600")
+    return ModelInventory(http)
+
+
+async def test_concurrent_lookups_share_one_download(inventory, http):
+    results = await asyncio.gather(
+        inventory.get_by_name(HOST, "sk-1", "llama3"),
+        inventory.get_by_id(HOST, "sk-1", "m2"),
+        inventory.get_by_name(HOST, "sk-1", "missing"),
+    )
+    assert [r and r["model_info"]["id"] for r in results] == ["m3", "m2", None]
+    assert len(http.calls_to("GET", "/model/info")) == 1
+
+
+async def test_snapshots_are_per_credential(inventory, http):
+    await inventory.snapshot(HOST, "sk-1")
+    await inventory.snapshot(HOST, "sk-2")
+    assert len(http.calls_to("GET", "/model/info")) == 2
+
+
+async def test_invalidate_forces_a_new_download(inventory, http):
+    await inventory.snapshot(HOST, "sk-1")
+    inventory.invalidate(HOST + "/")
+    await inventory.snapshot(HOST, "sk-1")
+    assert len(http.calls_to("GET", "/model/info")) == 2
+
+
+async def test_failed_download_raises(inventory, http):
+    http.routes[("GET", "/model/info")] = (500, {"error": "db down"})
+    with pytest.raises(LiteLLMModelInventoryException):
+        await inventory.snapshot(HOST, "sk-1")
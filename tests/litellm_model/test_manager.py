@@ -0,0 +1,80 @@
+import pytest
+
+from src.litellm_model.manager import LiteLLMModelException, ModelManagement, created_model_id, model_fingerprint, model_payload
+from tests.fakes import FakeHttp
+
+HOST = "http://litellm:4000"
+SPEC = {
+    "litellm_host": HOST,
+    "litellm_api_key": "sk-1",
+    "is_installed": True,
+    "model_id": "m1",
+    "model_name": "llama3",
+    "litellm_params": {"model": "ollama/llama3", "api_base": "http://ollama:11434"},
+    "model_info": {"mode": "chat"},
+}
+
+
+def test_fingerprint_covers_only_what_is_pushed():
+    bookkeeping = {**SPEC, "litellm_api_key": "sk-2", "model_id": "m2", "is_installed": False}
+    assert model_fingerprint(bookkeeping) == model_fingerprint(SPEC)
+
+
+def test_fingerprint_ignores_managed_model_info_and_unset_values():
+    managed = {**SPEC, "model_info": {"mode": "chat", "id": "m1", "created_at": "2026-01-01T00:00:00Z", "base_model": None},
+               "litellm_params": {**SPEC["litellm_params"], "rpm": None, "tags": []}}
+    assert model_fingerprint(managed) == model_fingerprint(SPEC)
+
+
+def test_fingerprint_changes_with_the_spec():
+    changed = {**SPEC, "litellm_params": {**SPEC["litellm_params"], "api_base": "http://ollama-2:11434"}}
+    assert model_fingerprint(changed) != model_fingerprint(SPEC)
+    assert model_fingerprint({**SPEC, "model_name": "llama3.1"}) != model_fingerprint(SPEC)
+
+
+def test_payload_drops_bookkeeping_fields():
+    assert model_payload(SPEC) == {"model_name": "llama3", "litellm_params": SPEC["litellm_params"], "model_info": {"mode": "chat"}}
+    assert model_payload(SPEC)["model_info"] is not SPEC["model_info"]
+
+
+def test_created_model_id():
+    assert created_model_id({"model_id": "m1"}) == "m1"
+    assert created_model_id({"model_info": {"id": "m2"}}) == "m2"
+    assert created_model_id(None) is None
+
+
+async def test_update_identifies_the_model_by_model_info_id():
+    http = FakeHttp({("POST", "/model/update"): {}})
+    management = ModelManagement(http)
+
+    await management.update_model(HOST, "sk-1", "m1", model_payload(SPEC))
+
+    payload = http.calls_to("POST", "/model/update")[0]["json"]
+    assert payload["model_info"] == {"mode": "chat", "id": "m1"}
+    assert "litellm_api_key" not in payload
+
+
+async def test_get_model_returns_the_matching_entry():
+    http = FakeHttp({("GET", "/model/info"): {"data": [{"model_name": "llama3", "model_info": {"id": "m1"}}]}})
+    management = ModelManagement(http)
+    assert (await management.get_model(HOST, "sk-1", "m1"))["model_name"] == "llama3"
+    assert await management.get_model(HOST, "sk-1", "m9") is None
+
+
+async def test_lookup_failures_are_not_reported_as_missing():
+    http = FakeHttp({("GET", "/model/info"): (503, {"error": "db down"})})
+    management = ModelManagement(http)
+    with pytest.raises(LiteLLMModelException):
+        await management.get_model(HOST, "sk-1", "m1")
+    with pytest.raises(LiteLLMModelException):
+        await management.find_model(HOST, "sk-1", None, "llama3")
+
+
+async def test_create_leaves_the_callers_model_info_alone():
+    http = FakeHttp({("POST", "/model/new"): {"model_id": "m1"}})
+    payload = model_payload(SPEC)
+
+    await ModelManagement(http).create_model(HOST, "sk-1", payload)
+
+    assert payload["model_info"] == {"mode": "chat"}
+    assert http.calls_to("POST", "/model/new")[0]["json"]["model_info"]["created_by"] == "genai-operator"
@@ -0,0 +1,113 @@
+import kopf
+import kr8s.asyncio
+import pytest
+from injector import Injector, InstanceProvider
+
+from src.litellm_model import operator
+from src.litellm_model.inventory import ModelInventory
+from src.litellm_model.manager import ModelManagement
+from src.litellm_model.reconciler import HostReconciler
+from tests.fakes import FakeCR, FakeHttp, fake_get
+
+HOST = "http://litellm:4000"
+SPEC = {"litellm_host": HOST, "litellm_api_key": "sk-1", "is_installed": True, "model_id": "m1", "model_name": "llama3",
+        "litellm_params": {"model": "ollama/llama3"}, "model_info": {}}
+
+
+@pytest.fixture
+def http():
+    return FakeHttp({("POST", "/model/new"): {"model_id": "m2"}})
+
+
+@pytest.fixture
+def cr(monkeypatch):
+    cr = FakeCR("llama3", spec=SPEC)
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(cr))
+    return cr
+
+
+@pytest.fixture(autouse=True)
+def injector(http, monkeypatch):
+    monkeypatch.setenv("LITELLM_MODEL_BATCH_RECONCILE", "false")
+    management, inventory = ModelManagement(http), ModelInventory(http)
+
+    def configure(binder):
+        binder.bind(ModelManagement, to=InstanceProvider(management))
+        binder.bind(ModelInventory, to=InstanceProvider(inventory))
+        binder.bind(HostReconciler, to=InstanceProvider(HostReconciler(management, inventory)))
+
+    monkeypatch.setattr(operator, "injector", Injector([configure]))
+
+
+def serve(http, *models):
+    def model_info(kwargs):
+        model_id = (kwargs.get("params") or {}).get("litellm_model_id")
+        return {"data": [m for m in models if model_id is None or m["model_info"]["id"] == model_id]}
+    http.routes[("GET", "/model/info")] = model_info
+
+
+async def test_stored_id_is_resolved_from_the_inventory(http, cr):
+    serve(http, {"model_name": "llama3-renamed", "model_info": {"id": "m1"}})
+
+    assert await operator.reconcile_fn(spec=SPEC, name="llama3", namespace="default") is True
+
+    # One inventory download, no per-resource /model/info?litellm_model_id= lookup
+    assert [call.get("params") for call in http.calls_to("GET", "/model/info")] == [None]
+    cr.patch.assert_not_awaited()
+
+
+async def test_model_found_by_name_gets_its_id_stored(http, cr):
+    serve(http, {"model_name": "llama3", "model_info": {"id": "m7"}})
+
+    assert await operator.reconcile_fn(spec=SPEC, name="llama3", namespace="default") is True
+
+    cr.patch.assert_awaited_once_with({"spec": {"model_id": "m7"}})
+
+
+async def test_missing_model_is_confirmed_then_recreated(http, cr):
+    serve(http)
+
+    assert await operator.reconcile_fn(spec=SPEC, name="llama3", namespace="default") is False
+
+    assert {"litellm_model_id": "m1"} in [call.get("params") for call in http.calls_to("GET", "/model/info")]
+    created = http.calls_to("POST", "/model/new")[0]["json"]
+    assert "model_id" not in created and "litellm_api_key" not in created
+    cr.patch.assert_awaited_once_with({"spec": {"model_id": "m2"}})
+
+
+async def test_failed_confirmation_does_not_recreate(http, cr):
+    def model_info(kwargs):
+        if (kwargs.get("params") or {}).get("litellm_model_id"):
+            return 503, {"error": "db down"}
+        return {"data": []}
+    http.routes[("GET", "/model/info")] = model_info
+
+    assert await operator.reconcile_fn(spec=SPEC, name="llama3", namespace="default") is False
+
+    assert http.calls_to("POST", "/model/new") == []
+    cr.patch.assert_not_awaited()
+
+
+async def test_create_sends_only_the_model_payload(http, cr):
+    serve(http)
+    spec = {**SPEC, "model_id": None, "spec_hash": "old"}
+
+    await operator.create_fn(spec=spec, name="llama3", namespace="default")
+
+    created = http.calls_to("POST", "/model/new")[0]["json"]
+    assert set(created) == {"model_name", "litellm_params", "model_info"}
+    assert spec["model_info"] == {}
+
+
+async def test_failed_delete_keeps_the_finalizer(http, cr):
+    http.routes[("GET", "/model/info")] = (503, {"error": "db down"})
+    with pytest.raises(kopf.TemporaryError):
+        await operator.delete_fn(spec=SPEC, name="llama3", namespace="default")
+    assert http.calls_to("POST", "/model/delete") == []
+
+
+async def test_batch_mode_reports_the_pass_result(http, cr):
+    serve(http, {"model_name": "llama3", "model_info": {"id": "m1"}, "litellm_params": {"model": "ollama/llama3"}})
+    operator.injector.get(HostReconciler).enabled = True
+
+    assert await operator.reconcile_fn(spec=SPEC, name="llama3", namespace="default") is True
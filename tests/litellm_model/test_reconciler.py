@@ -0,0 +1,111 @@
+from unittest.mock import create_autospec
+
+import kr8s.asyncio
+import pytest
+
+from src.http_client.deadline import Deadline
+from src.litellm_model.inventory import ModelInventory
+from src.litellm_model.manager import ModelManagement
+from src.litellm_model.reconciler import HostReconciler
+from tests.fakes import FakeCR, FakeHttp, fake_get
+
+HOST = "http://litellm:4000"
+
+
+def model_cr(name, model_id=None, api_base="http://ollama:11434"):
+    spec = {"litellm_host": HOST, "litellm_api_key": "sk-1", "is_installed": True, "model_name": name,
+            "litellm_params": {"model": f"ollama/{name}", "api_base": api_base}, "model_info": {}}
+    if model_id:
+        spec["model_id"] = model_id
+    return FakeCR(name, spec=spec)
+
+
+@pytest.fixture
+def management():
+    management = create_autospec(ModelManagement, instance=True)
+    management.create_model.return_value = {"model_id": "new-id"}
+    management.update_model.return_value = {}
+    return management
+
+
+def reconciler(management, models):
+    inventory = ModelInventory(FakeHttp({("GET", "/model/info"): {"data": models}}))
+    return HostReconciler(management, inventory)
+
+
+async def test_creates_missing_models_and_stores_their_id(management, monkeypatch):
+    cr = model_cr("llama3")
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(cr))
+
+    result = await reconciler(management, [])._reconcile(HOST, "sk-1", Deadline(60))
+
+    assert result.missing == ["llama3"]
+    payload = management.create_model.await_args.args[2]
+    assert payload == {"model_name": "llama3", "litellm_params": {"model": "ollama/llama3", "api_base": "http://ollama:11434"}, "model_info": {}}
+    cr.patch.assert_awaited_once_with({"spec": {"model_id": "new-id"}})
+
+
+async def test_updates_changed_models_matched_by_id(management, monkeypatch):
+    cr = model_cr("llama3", model_id="m1", api_base="http://ollama-2:11434")
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(cr))
+    # Renamed in LiteLLM, still found by its stored id
+    live = [{"model_name": "renamed", "model_info": {"id": "m1"}, "litellm_params": {"model": "ollama/llama3", "api_base": "http://ollama:11434"}}]
+
+    result = await reconciler(management, live)._reconcile(HOST, "sk-1", Deadline(60))
+
+    assert (result.missing, result.changed, result.orphaned) == ([], ["llama3"], [])
+    _, _, model_id, payload = management.update_model.await_args.args
+    assert model_id == "m1"
+    assert set(payload) == {"model_name", "litellm_params", "model_info"}
+    cr.patch.assert_not_awaited()
+
+
+async def test_reports_operator_models_without_a_resource_as_orphaned(management, monkeypatch):
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get())
+    live = [
+        {"model_name": "left-behind", "model_info": {"id": "m1", "created_by": "genai-operator"}},
+        {"model_name": "manual", "model_info": {"id": "m2"}},
+    ]
+
+    result = await reconciler(management, live)._reconcile(HOST, "sk-1", Deadline(60))
+
+    assert result.orphaned == ["left-behind"]
+    management.create_model.assert_not_awaited()
+
+
+async def test_runs_once_per_interval(management, monkeypatch):
+    http = FakeHttp({("GET", "/model/info"): {"data": []}})
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get())
+    host_reconciler = HostReconciler(management, ModelInventory(http))
+    await host_reconciler.reconcile_host(HOST, "sk-1", Deadline(60))
+    await host_reconciler.reconcile_host(HOST, "sk-1", Deadline(60))
+    assert len(http.calls_to("GET", "/model/info")) == 1
+
+
+async def test_failed_pass_is_not_repeated_by_every_timer(management, monkeypatch):
+    lists = []
+
+    async def get(resource, name=None, namespace=None, **kwargs):
+        lists.append(resource)
+        raise ConnectionError("apiserver unavailable")
+        yield
+
+    monkeypatch.setattr(kr8s.asyncio, "get", get)
+    host_reconciler = reconciler(management, [])
+
+    results = [await host_reconciler.reconcile_host(HOST, "sk-1", Deadline(60)) for _ in range(3)]
+
+    assert results == [None, None, None]
+    assert len(lists) == 1
+
+
+async def test_pass_result_per_model(management, monkeypatch):
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(model_cr("llama3"), model_cr("qwen", model_id="m2")))
+    host_reconciler = reconciler(management, [{"model_name": "qwen", "model_info": {"id": "m2"},
+                                                    "litellm_params": {"model": "ollama/qwen", "api_base": "http://ollama:11434"}}])
+
+    result = await host_reconciler.reconcile_host(HOST, "sk-1", Deadline(60))
+
+    assert (result.in_sync("llama3"), result.in_sync("qwen"), result.in_sync("other")) == (False, True, None)
+    # Later timers of the host get the same result without a new pass
+    assert await host_reconciler.reconcile_host(HOST, "sk-1", Deadline(60)) is result
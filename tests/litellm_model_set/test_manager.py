@@ -0,0 +1,86 @@
+from unittest.mock import create_autospec
+
+import pytest
+
+from src.litellm_model.inventory import ModelInventory
+from src.litellm_model.manager import ModelManagement, model_fingerprint
+from src.litellm_model_set.manager import LiteLLMModelSetException, ModelSetManagement, expand_models, set_fingerprint
+from tests.fakes import FakeHttp
+
+HOST = "http://litellm:4000"
+SPEC = {
+    "template": {
+        "model_name": "{name}-{size}",
+        "litellm_params": {"model": "ollama/{name}:{size}", "api_base": "http://ollama:11434"},
+        "model_info": {"mode": "chat"},
+    },
+    "items": [{"name": "llama3"}, {"name": "qwen"}],
+    "matrix": {"size": ["8b", "70b"]},
+}
+
+
+def test_expand_models_renders_items_times_matrix():
+    models = expand_models(SPEC)
+    assert sorted(models) == ["llama3-70b", "llama3-8b", "qwen-70b", "qwen-8b"]
+    assert models["qwen-8b"] == {"model_name": "qwen-8b", "litellm_params": {"model": "ollama/qwen:8b", "api_base": "http://ollama:11434"},
+                                 "model_info": {"mode": "chat"}}
+
+
+def test_expand_models_without_matrix():
+    models = expand_models({"template": {"model_name": "{name}"}, "items": [{"name": "a"}, {"name": "b"}]})
+    assert sorted(models) == ["a", "b"]
+
+
+def test_expand_models_rejects_undefined_variables():
+    with pytest.raises(LiteLLMModelSetException, match="size"):
+        expand_models({"template": {"model_name": "{name}-{size}"}, "items": [{"name": "a"}]})
+
+
+def test_expand_models_rejects_duplicate_names():
+    with pytest.raises(LiteLLMModelSetException, match="more than once"):
+        expand_models({"template": {"model_name": "{name}"}, "items": [{"name": "a"}, {"name": "a"}]})
+
+
+def test_set_fingerprint_follows_the_rendered_models():
+    reordered = {**SPEC, "items": list(reversed(SPEC["items"]))}
+    assert set_fingerprint(expand_models(reordered)) == set_fingerprint(expand_models(SPEC))
+    changed = {**SPEC, "matrix": {"size": ["8b"]}}
+    assert set_fingerprint(expand_models(changed)) != set_fingerprint(expand_models(SPEC))
+
+
+@pytest.fixture
+def management():
+    management = create_autospec(ModelManagement, instance=True)
+    management.create_model.return_value = {"model_id": "new"}
+    return management
+
+
+def model_set(management, *live):
+    return ModelSetManagement(management, ModelInventory(FakeHttp({("GET", "/model/info"): {"data": list(live)}})))
+
+
+async def test_reconcile_creates_updates_keeps_and_removes(management):
+    models = expand_models({"template": {"model_name": "{name}"}, "items": [{"name": "new"}, {"name": "changed"}, {"name": "same"}]})
+    item_status = {
+        "changed": {"state": "ready", "model_id": "m1", "hash": "outdated", "error": ""},
+        "same": {"state": "ready", "model_id": "m2", "hash": model_fingerprint(models["same"]), "error": ""},
+        "gone": {"state": "ready", "model_id": "m3", "hash": "x", "error": ""},
+    }
+    live = [{"model_name": "changed", "model_info": {"id": "m1"}}, {"model_name": "same", "model_info": {"id": "m2"}}]
+
+    status = await model_set(management, *live).reconcile(HOST, "sk-1", models, item_status)
+
+    assert {name: s and (s["state"], s["model_id"]) for name, s in status.items()} == {
+        "new": ("created", "new"), "changed": ("updated", "m1"), "same": ("ready", "m2"), "gone": None,
+    }
+    management.update_model.assert_awaited_once()
+    management.delete_model_by_name.assert_awaited_once_with(HOST, "sk-1", "gone", model_id="m3", deadline=None)
+
+
+async def test_reconcile_records_failures_per_item(management):
+    management.create_model.side_effect = ValueError("quota exceeded")
+    models = expand_models({"template": {"model_name": "{name}"}, "items": [{"name": "a"}]})
+
+    status = await model_set(management).reconcile(HOST, "sk-1", models, {})
+
+    assert status["a"] == {"state": "failed", "model_id": "", "hash": "", "error": "quota exceeded"}
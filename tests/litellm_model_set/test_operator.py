@@ -0,0 +1,43 @@
+from unittest.mock import create_autospec
+
+import kr8s.asyncio
+import pytest
+from injector import Injector, InstanceProvider
+
+from src.litellm_model_set import operator
+from src.litellm_model_set.manager import ModelSetManagement, expand_models, set_fingerprint
+from tests.fakes import FakeCR, fake_get
+
+SPEC = {"litellm_host": "http://litellm:4000", "litellm_api_key": "sk-1",
+        "template": {"model_name": "{name}"}, "items": [{"name": "a"}]}
+READY = {"a": {"state": "ready", "model_id": "m1", "hash": "h", "error": ""}}
+
+
+@pytest.fixture
+def management(monkeypatch):
+    management = create_autospec(ModelSetManagement, instance=True)
+    management.reconcile.return_value = READY
+    monkeypatch.setattr(operator, "injector", Injector([lambda binder: binder.bind(ModelSetManagement, to=InstanceProvider(management))]))
+    return management
+
+
+async def test_results_are_written_to_status(management, monkeypatch):
+    cr = FakeCR("set")
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(cr))
+
+    await operator.create_fn(spec=SPEC, status={}, name="set", namespace="default")
+
+    cr.patch.assert_awaited_once_with({"status": {"item_status": READY, "spec_hash": set_fingerprint(expand_models(SPEC))}})
+
+
+async def test_unchanged_set_is_not_reconciled_again(management):
+    status = {"item_status": READY, "spec_hash": set_fingerprint(expand_models(SPEC))}
+
+    await operator.create_fn(spec=SPEC, status=status, name="set", namespace="default")
+
+    management.reconcile.assert_not_awaited()
+
+
+async def test_timer_skips_sets_that_were_never_created(management):
+    await operator.reconcile_fn(spec=SPEC, status={}, name="set", namespace="default")
+    management.reconcile.assert_not_awaited()
@@ -0,0 +1,67 @@
+import pytest
+
+from src.litellm_key.index import KeyIndex
+from src.litellm_team.index import HostTeams, TeamIndex
+from src.litellm_team.manager import TeamManagement
+from tests.fakes import FakeHttp
+
+HOST = "http://litellm:4000"
+TEAMS = [{"team_id": "t1", "team_alias": "research"}, {"team_id": "t2", "team_alias": "ops"}]
+
+
+def test_host_teams_merge_updates_and_follow_alias_changes():
+    teams = HostTeams()
+    teams.add({"team_id": "t1", "team_alias": "research", "models": []})
+    teams.add({"team_id": "t1", "team_alias": "science"})
+    assert teams.by_id["t1"] == {"team_id": "t1", "team_alias": "science", "models": []}
+    assert set(teams.by_alias) == {"science"}
+
+    teams.remove("t1")
+    assert (teams.by_id, teams.by_alias) == ({}, {})
+
+
+@pytest.fixture
+def http():
+    return FakeHttp({("GET", "/team/list"): TEAMS, ("GET", "/team/info"): {"team_info": {"team_alias": "ops"}}})
+
+
+@pytest.fixture
+def index(http, monkeypatch):
+    monkeypatch.setenv("LITELLM_TEAM_INDEX_TTL", "300")
+    return TeamIndex(http)
+
+
+async def test_index_accepts_both_list_shapes(index, http):
+    http.routes[("GET", "/team/list")] = {"teams": TEAMS}
+    assert (await index.get_by_alias(HOST, "sk-1", "ops"))["team_id"] == "t2"
+
+
+async def test_cached_never_fetches(index, http):
+    assert index.cached(HOST, "sk-1", "t1") is None
+    await index.snapshot(HOST, "sk-1")
+    assert index.cached(HOST, "sk-1", "t1")["team_alias"] == "research"
+    assert len(http.calls) == 1
+
+
+async def test_record_and_forget_apply_in_place(index, http):
+    await index.snapshot(HOST, "sk-1")
+    index.record(HOST, {"team_id": "t3", "team_alias": "new"})
+    index.forget(HOST + "/", ["t1"])
+    snapshot = await index.snapshot(HOST, "sk-1")
+    assert set(snapshot.by_alias) == {"ops", "new"}
+    assert len(http.calls) == 1
+
+
+async def test_team_by_id_uses_the_loaded_index(index, http):
+    management = TeamManagement(http, KeyIndex(http), index)
+    await index.snapshot(HOST, "sk-1")
+    assert (await management.get_team_by_id(HOST, "sk-1", "t2"))["team_alias"] == "ops"
+    assert http.calls_to("GET", "/team/info") == []
+
+
+async def test_team_by_id_falls_back_to_team_info(index, http):
+    management = TeamManagement(http, KeyIndex(http), index)
+    team = await management.get_team_by_id(HOST, "sk-1", "t2")
+    assert team == {"team_id": "t2", "team_alias": "ops"}
+    assert http.calls_to("GET", "/team/info")[0]["params"] == {"team_id": "t2"}
+    assert http.calls_to("GET", "/team/list") == []
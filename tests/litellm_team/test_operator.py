@@ -0,0 +1,73 @@
+from unittest.mock import create_autospec
+
+import kr8s.asyncio
+import pytest
+from injector import Injector, InstanceProvider
+
+from src.litellm_key.manager import KeyManagement
+from src.litellm_team import operator
+from src.litellm_team.manager import TeamManagement
+from tests.fakes import FakeCR, fake_get
+
+HOST = "http://litellm:4000"
+SPEC = {"litellm_host": HOST, "litellm_api_key": "sk-1", "team_name": "research", "models": ["llama3"], "max_budget": 100.0}
+TEAM = {"team_id": "t1", "team_alias": "research", "models": ["llama3"], "max_budget": 100}
+
+
+def test_team_in_sync_has_no_changes():
+    assert TeamManagement.team_changes(TEAM, "research", ["llama3"], 100.0) == []
+    # Unset budgets are not managed
+    assert TeamManagement.team_changes({**TEAM, "budget_duration": "30d"}, "research", ["llama3"]) == []
+
+
+def test_team_changes_lists_differing_fields():
+    changes = TeamManagement.team_changes(TEAM, "research-2", ["llama3", "gpt-4o"], 50, "7d")
+    assert changes == ["team_alias", "models", "max_budget", "budget_duration"]
+
+
+@pytest.fixture
+def managers(monkeypatch):
+    team_management = create_autospec(TeamManagement, instance=True)
+    team_management.team_changes.side_effect = TeamManagement.team_changes
+    key_management = create_autospec(KeyManagement, instance=True)
+
+    def configure(binder):
+        binder.bind(TeamManagement, to=InstanceProvider(team_management))
+        binder.bind(KeyManagement, to=InstanceProvider(key_management))
+
+    monkeypatch.setattr(operator, "injector", Injector([configure]))
+    return team_management, key_management
+
+
+@pytest.fixture
+def cr(monkeypatch):
+    cr = FakeCR("research", spec=SPEC)
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(cr))
+    return cr
+
+
+async def test_known_team_in_sync_sends_no_writes(managers, cr):
+    team_management, key_management = managers
+    team_management.get_team_by_id.return_value = TEAM
+    key_management.get_key_by_alias.return_value = {"token": "k1", "key_alias": "research"}
+
+    await operator.create_fn(spec={**SPEC, "team_id": "t1"}, name="research", namespace="default")
+
+    team_management.get_team_by_name.assert_not_awaited()
+    team_management.update_team.assert_not_awaited()
+    team_management.generate_team_key.assert_not_awaited()
+    cr.patch.assert_not_awaited()
+
+
+async def test_new_team_is_created_with_its_key(managers, cr):
+    team_management, key_management = managers
+    team_management.get_team_by_name.return_value = None
+    team_management.create_team.return_value = {**TEAM, "models": []}
+    team_management.generate_team_key.return_value = "sk-team"
+    key_management.get_key_by_alias.return_value = None
+
+    await operator.create_fn(spec=SPEC, name="research", namespace="default")
+
+    team_management.update_team.assert_awaited_once()
+    team_management.add_models_to_team.assert_awaited_once()
+    cr.patch.assert_awaited_once_with({"spec": {"team_id": "t1", "key_value": "sk-team"}})
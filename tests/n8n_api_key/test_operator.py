@@ -0,0 +1,63 @@
+from unittest.mock import create_autospec
+
+import kr8s.asyncio
+import pytest
+from injector import Injector, InstanceProvider
+
+from src.n8n_api_key import operator
+from src.n8n_api_key.manager import ApiKeyManagement
+from tests.fakes import FakeCR, fake_get
+
+SPEC = {
+    "api_key_name": "ci",
+    "n8n_domain": "http://n8n:5678",
+    "email": "admin@example.com",
+    "password": "secret",
+    "secret_name": "n8n-api-key",
+    "secret_namespace": "default",
+}
+
+
+@pytest.fixture
+def management(monkeypatch):
+    # Autospec keeps the real signatures, so a call with an unexpected keyword fails like it would in the cluster
+    management = create_autospec(ApiKeyManagement, instance=True)
+    management.generate_unique_key_name.return_value = "ci-1234"
+    management.login.return_value = "cookie"
+    management.create_api_key.return_value = {"api_key": "n8n_api_x", "unique_key_name": "ci-1234", "user_id": "u1", "id": "k1"}
+    management.create_k8s_secret.return_value = True
+    management.delete_api_key.return_value = True
+    management.delete_k8s_secret.return_value = True
+    monkeypatch.setattr(operator, "injector", Injector([lambda binder: binder.bind(ApiKeyManagement, to=InstanceProvider(management))]))
+    return management
+
+
+@pytest.fixture
+def cr(monkeypatch):
+    cr = FakeCR("ci", spec=SPEC)
+    # Only the N8nApiKey is found, so the secret lookups see a missing secret
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(cr, resource="N8nApiKey.ops.veitosiander.de"))
+    return cr
+
+
+async def test_create_writes_the_secret_and_records_the_key(management, cr):
+    assert await operator.create_fn(spec=dict(SPEC), name="ci", namespace="default") == {"status": "created"}
+
+    management.create_k8s_secret.assert_awaited_once_with(
+        secret_name="n8n-api-key", namespace="default", api_key="n8n_api_x", api_key_name="ci-1234", api_key_id="k1", user_id="u1"
+    )
+    cr.patch.assert_awaited_once_with({"spec": {"n8n_api_key_name": "ci-1234", "user_id": "u1", "api_key_id": "k1"}})
+
+
+async def test_delete_removes_the_key_and_the_secret(management, cr):
+    await operator.delete_fn(spec={**SPEC, "api_key_id": "k1"}, name="ci", namespace="default")
+
+    management.delete_api_key.assert_awaited_once()
+    management.delete_k8s_secret.assert_awaited_once_with(secret_name="n8n-api-key", namespace="default")
+
+
+async def test_reconcile_recreates_a_missing_secret(management, cr):
+    assert await operator.reconcile_fn(spec={**SPEC, "n8n_api_key_name": "ci-0001"}, name="ci", namespace="default") is False
+
+    management.create_k8s_secret.assert_awaited_once()
+    cr.patch.assert_awaited_once()
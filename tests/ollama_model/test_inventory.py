@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from src.ollama_model.inventory import HostModels, ModelInventory, OllamaModelInventoryException
+from src.ollama_model.manager import ModelManagement
+from tests.fakes import FakeHttp
+
+HOST = "http://ollama:11434"
+TAGS = {"models": [
+    {"name": "llama3:8b", "digest": "d1"},
+    {"name": "llama3:latest", "digest": "d1"},
+    {"model": "qwen:7b", "digest": "d2"},
+]}
+
+
+def test_host_models_index_by_name_and_digest():
+    models = HostModels(TAGS["models"] + [{"digest": "d3"}])
+    assert set(models.by_name) == {"llama3:8b", "llama3:latest", "qwen:7b"}
+    assert [m["name"] for m in models.by_digest["d1"]] == ["llama3:8b", "llama3:latest"]
+    assert len(models) == 3
+
+
+@pytest.fixture
+def http():
+    return FakeHttp({("GET", "/api/tags"): TAGS, ("POST", "/api/show"): (404, {"error": "model not found"})})
+
+
+@pytest.fixture
+def inventory(http, monkeypatch):
+    monkeypatch.setenv("OLLAMA_INVENTORY_TTL", "600")
+    return ModelInventory(http)
+
+
+async def test_concurrent_lookups_share_one_download(inventory, http):
+    found = await asyncio.gather(inventory.get_by_name(HOST, "llama3", "8b"), inventory.get_by_name(HOST + "/", "qwen", "7b"),
+                                 inventory.get_by_digest(HOST, "d1"))
+    assert found[0]["digest"] == "d1" and found[1]["digest"] == "d2" and len(found[2]) == 2
+    assert len(http.calls_to("GET", "/api/tags")) == 1
+
+
+async def test_invalidate_forces_a_new_download(inventory, http):
+    await inventory.snapshot(HOST)
+    inventory.invalidate(HOST)
+    await inventory.snapshot(HOST)
+    assert len(http.calls_to("GET", "/api/tags")) == 2
+
+
+async def test_failed_download_raises(inventory, http):
+    http.routes[("GET", "/api/tags")] = (500, {"error": "boom"})
+    with pytest.raises(OllamaModelInventoryException):
+        await inventory.snapshot(HOST)
+
+
+async def test_has_model_answers_hits_from_the_inventory(inventory, http):
+    management = ModelManagement(http, inventory)
+    assert await management.has_model(HOST, "llama3", "8b")
+    assert http.calls_to("POST", "/api/show") == []
+
+
+async def test_has_model_confirms_misses(inventory, http):
+    management = ModelManagement(http, inventory)
+    assert not await management.has_model(HOST, "phi", "3")
+    http.routes[("POST", "/api/show")] = {"modelfile": "FROM phi:3"}
+    assert await management.has_model(HOST, "phi", "3")
+    assert [call["json"] for call in http.calls_to("POST", "/api/show")] == [{"model": "phi:3"}] * 2
+
+
+async def test_has_model_survives_a_failed_inventory(inventory, http):
+    http.routes[("GET", "/api/tags")] = (500, {"error": "boom"})
+    http.routes[("POST", "/api/show")] = {"modelfile": "FROM llama3:8b"}
+    assert await ModelManagement(http, inventory).has_model(HOST, "llama3", "8b")
@@ -0,0 +1,51 @@
+import pytest
+
+from src.ollama_model.inventory import ModelInventory
+from src.ollama_model.manager import ModelManagement
+from tests.fakes import FakeHttp
+
+HOST = "http://ollama:11434"
+PROGRESS = [
+    {"status": "pulling manifest"},
+    {"status": "pulling abc", "digest": "sha256:abc", "total": 100, "completed": 40},
+    {"status": "pulling abc", "digest": "sha256:abc", "total": 100, "completed": 100},
+    {"status": "success"},
+]
+
+
+@pytest.fixture
+def http():
+    return FakeHttp({("GET", "/api/tags"): {"models": []}, ("POST", "/api/pull"): PROGRESS})
+
+
+@pytest.fixture
+def management(http, monkeypatch):
+    monkeypatch.setenv("OLLAMA_PULL_TIMEOUT", "120")
+    return ModelManagement(http, ModelInventory(http))
+
+
+async def test_pull_streams_progress_and_refreshes_the_inventory(management, http):
+    await management.inventory.snapshot(HOST)
+    seen = []
+
+    async def on_progress(item):
+        seen.append(item)
+
+    assert await management.pull_model(HOST, "llama3", "8b", on_progress=on_progress) is True
+
+    assert seen == PROGRESS
+    pull = http.calls_to("POST", "/api/pull")[0]
+    assert pull["json"] == {"model": "llama3:8b", "stream": True}
+    assert pull["idle_timeout"] == 120
+    await management.inventory.snapshot(HOST)
+    assert len(http.calls_to("GET", "/api/tags")) == 2
+
+
+async def test_pull_reported_as_failed_in_the_stream(management, http):
+    http.routes[("POST", "/api/pull")] = [{"status": "pulling manifest"}, {"error": "pull model manifest: file does not exist"}]
+    assert await management.pull_model(HOST, "nope", "latest") is False
+
+
+async def test_pull_rejected_by_ollama(management, http):
+    http.routes[("POST", "/api/pull")] = (500, {"error": "disk full"})
+    assert await management.pull_model(HOST, "llama3", "8b") is False
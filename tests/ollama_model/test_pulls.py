@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import create_autospec
+
+import kr8s.asyncio
+import pytest
+
+from src.ollama_model.manager import ModelManagement
+from src.ollama_model.pulls import PullTracker
+from tests.fakes import FakeCR, fake_get
+
+HOST = "http://ollama:11434"
+
+
+class Ollama:
+    """Pulls that finish when the test releases them."""
+
+    def __init__(self):
+        self.pulls = []
+        self.results = {}
+
+    async def pull_model(self, ollama_host, name, tag, on_progress=None):
+        model = f"{name}:{tag}"
+        self.pulls.append(model)
+        self.results[model] = asyncio.get_running_loop().create_future()
+        await on_progress({"status": "pulling", "digest": "sha256:abc", "total": 10, "completed": 5})
+        return await self.results[model]
+
+    def finish(self, model, success=True):
+        self.results[model].set_result(success)
+
+
+@pytest.fixture
+def ollama():
+    return Ollama()
+
+
+@pytest.fixture
+def crs(monkeypatch):
+    crs = {name: FakeCR(name) for name in ("a", "b", "c")}
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(*crs.values()))
+    return crs
+
+
+@pytest.fixture
+def tracker(ollama, monkeypatch):
+    monkeypatch.setenv("OLLAMA_PULL_CONCURRENCY", "1")
+    monkeypatch.setenv("OLLAMA_PULL_STATUS_INTERVAL", "0")
+    management = create_autospec(ModelManagement, instance=True)
+    management.pull_model.side_effect = ollama.pull_model
+    return PullTracker(management)
+
+
+def last_pull_status(cr):
+    return cr.patch.await_args.args[0]["status"]["pull"]
+
+
+async def settle():
+    """Let the background pulls and their status writes run."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+async def test_identical_pulls_are_shared(tracker, ollama, crs):
+    assert await tracker.start("uid-a", "a", "default", HOST, "llama3", "8b")
+    assert await tracker.start("uid-b", "b", "other", HOST + "/", "llama3", "8b")
+    await settle()
+
+    assert ollama.pulls == ["llama3:8b"]
+    ollama.finish("llama3:8b")
+    await settle()
+
+    for name in ("a", "b"):
+        assert last_pull_status(crs[name])["state"] == "succeeded"
+    assert not tracker.running("uid-a") and not tracker.running("uid-b")
+
+
+async def test_pulls_wait_in_the_host_queue(tracker, ollama, crs):
+    await tracker.start("uid-a", "a", "default", HOST, "llama3", "8b")
+    await tracker.start("uid-b", "b", "default", HOST, "qwen", "7b")
+    await settle()
+
+    assert ollama.pulls == ["llama3:8b"]
+    assert last_pull_status(crs["a"])["state"] == "pulling"
+    assert last_pull_status(crs["a"])["completed"] == 5
+    assert (last_pull_status(crs["b"])["state"], last_pull_status(crs["b"])["queue_position"]) == ("queued", 1)
+
+    ollama.finish("llama3:8b")
+    await settle()
+    assert ollama.pulls == ["llama3:8b", "qwen:7b"]
+    assert last_pull_status(crs["b"])["state"] == "pulling"
+
+
+async def test_repeated_start_keeps_the_pull(tracker, ollama, crs):
+    assert await tracker.start("uid-a", "a", "default", HOST, "llama3", "8b")
+    assert not await tracker.start("uid-a", "a", "default", HOST, "llama3", "8b")
+    assert tracker.running("uid-a")
+
+
+async def test_cancelled_waiting_pull_leaves_the_queue(tracker, ollama, crs):
+    await tracker.start("uid-a", "a", "default", HOST, "llama3", "8b")
+    await tracker.start("uid-b", "b", "default", HOST, "qwen", "7b")
+    await tracker.start("uid-c", "c", "default", HOST, "phi", "3")
+    tracker.cancel("uid-b")
+    await settle()
+
+    assert last_pull_status(crs["c"])["queue_position"] == 1
+    ollama.finish("llama3:8b")
+    await settle()
+    assert ollama.pulls == ["llama3:8b", "phi:3"]
+
+
+async def test_running_pull_is_cancelled_once_nobody_waits(tracker, ollama, crs):
+    await tracker.start("uid-a", "a", "default", HOST, "llama3", "8b")
+    await tracker.start("uid-b", "b", "default", HOST, "llama3", "8b")
+    await settle()
+
+    tracker.cancel("uid-a")
+    await settle()
+    assert not ollama.results["llama3:8b"].cancelled()
+
+    tracker.cancel("uid-b")
+    await settle()
+    assert ollama.results["llama3:8b"].cancelled()
+
+
+async def test_failed_pull_is_reported(tracker, ollama, crs):
+    await tracker.start("uid-a", "a", "default", HOST, "llama3", "8b")
+    await settle()
+    ollama.finish("llama3:8b", success=False)
+    await settle()
+
+    status = last_pull_status(crs["a"])
+    assert (status["state"], status["error"]) == ("failed", "Failed to pull model llama3:8b")
+    assert not tracker.running("uid-a")
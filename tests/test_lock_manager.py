@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from redis.lock import Lock as RedisLock
+
+from src.lock_manager import LockManager
+
+
+class FakeRedis:
+    """Just enough of a Redis client for redis.lock.Lock: SET NX and the compare-and-delete release script."""
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, name, value, nx=False, px=None):
+        if nx and name in self.values:
+            return False
+        self.values[name] = value
+        return True
+
+    def register_script(self, script):
+        return ReleaseScript(self)
+
+
+class ReleaseScript:
+    """Compare-and-delete, the effect of the release script; an object so the Lock class does not bind it."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    def __call__(self, keys, args, client=None):
+        if self.redis.values.get(keys[0]) != args[0]:
+            return 0
+        del self.redis.values[keys[0]]
+        return 1
+
+
+@pytest.fixture
+def redis_lock_manager(monkeypatch):
+    monkeypatch.setenv("LOCK_PROVIDER", "memory")
+    manager = LockManager()
+    manager.provider = "redis"
+    manager._redis_client = FakeRedis()
+    # Scripts are registered once per Lock class, make them use this test's client
+    for script in ("lua_release", "lua_extend", "lua_reacquire"):
+        monkeypatch.setattr(RedisLock, script, None)
+
+    # Run every to_thread call on a fresh thread, so acquire and release never share one
+    threads = []
+
+    def call(fn, args, kwargs):
+        threads.append(threading.current_thread().name)
+        return fn(*args, **kwargs)
+
+    async def to_thread(fn, *args, **kwargs):
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"to-thread-{len(threads)}") as executor:
+            return await asyncio.get_running_loop().run_in_executor(executor, call, fn, args, kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", to_thread)
+    manager.threads = threads
+    return manager
+
+
+async def test_redis_lock_is_released_from_another_thread(redis_lock_manager):
+    async with redis_lock_manager.acquire_lock_async("model") as acquired:
+        assert acquired
+        assert "lock:model" in redis_lock_manager._redis_client.values
+
+    assert redis_lock_manager._redis_client.values == {}
+    # Acquired and released on different threads
+    assert len(set(redis_lock_manager.threads)) == 2
+
+
+async def test_redis_lock_is_not_acquired_twice(redis_lock_manager):
+    async with redis_lock_manager.acquire_lock_async("model") as acquired:
+        assert acquired
+        async with redis_lock_manager.acquire_lock_async("model", blocking=False) as acquired_again:
+            assert not acquired_again
+
+    assert redis_lock_manager._redis_client.values == {}
+
+
+async def test_memory_lock_without_blocking(monkeypatch):
+    monkeypatch.setenv("LOCK_PROVIDER", "memory")
+    manager = LockManager()
+
+    async with manager.acquire_lock_async("model") as acquired:
+        assert acquired
+        async with manager.acquire_lock_async("model", blocking=False) as acquired_again:
+            assert not acquired_again
+
+    async with manager.acquire_lock_async("model", blocking=False) as acquired:
+        assert acquired
@@ -0,0 +1,117 @@
+import asyncio
+
+import kr8s.asyncio
+import pytest
+
+from src.scheduler import ReconcileScheduler
+from tests.fakes import FakeCR, fake_get
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setenv("LLM_OPERATOR_RECONCILE_INTERVAL", "600")
+    monkeypatch.setenv("LLM_OPERATOR_RECONCILE_JITTER", "0")
+    monkeypatch.setenv("LLM_OPERATOR_RECONCILE_ADAPTIVE", "false")
+    return ReconcileScheduler()
+
+
+def test_offset_is_stable_and_within_the_interval(scheduler):
+    offsets = [scheduler.offset(f"uid-{i}") for i in range(200)]
+    assert all(0 <= offset < 600 for offset in offsets)
+    assert scheduler.offset("uid-1") == ReconcileScheduler().offset("uid-1")
+    # Spread over the interval instead of clustering
+    assert len({int(offset // 60) for offset in offsets}) == 10
+
+
+def test_next_tick_keeps_the_phase(scheduler):
+    offset = scheduler.offset("uid-1")
+    now = 1_800_000_000.0
+    tick = scheduler.next_tick("uid-1", now)
+    assert now < tick <= now + 600
+    assert tick % 600 == pytest.approx(offset)
+    assert scheduler.next_tick("uid-1", tick) == pytest.approx(tick + 600)
+
+
+class Stopped:
+    """Minimal kopf daemon stop flag."""
+
+    def __init__(self):
+        self.event = asyncio.Event()
+
+    def __bool__(self):
+        return self.event.is_set()
+
+    async def wait(self, timeout):
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def test_run_survives_failing_ticks(scheduler, monkeypatch):
+    monkeypatch.setattr(scheduler, "next_tick", lambda uid, now: now)
+    stopped = Stopped()
+    ticks = []
+
+    async def reconcile():
+        ticks.append(len(ticks))
+        if len(ticks) == 1:
+            raise ValueError("upstream down")
+        if len(ticks) == 3:
+            stopped.event.set()
+        return True
+
+    await asyncio.wait_for(scheduler.run("test", "uid-1", stopped, reconcile), 1)
+    assert ticks == [0, 1, 2]
+
+
+@pytest.fixture
+def adaptive(monkeypatch):
+    monkeypatch.setenv("LLM_OPERATOR_RECONCILE_INTERVAL", "600")
+    monkeypatch.setenv("LLM_OPERATOR_RECONCILE_ADAPTIVE", "true")
+    monkeypatch.setenv("LLM_OPERATOR_RECONCILE_MIN_INTERVAL", "60")
+    monkeypatch.setenv("LLM_OPERATOR_RECONCILE_MAX_INTERVAL", "3600")
+    return ReconcileScheduler()
+
+
+def test_in_sync_doubles_up_to_the_maximum(adaptive):
+    assert [adaptive.adapt("uid-1", True) for _ in range(4)] == [1200, 2400, 3600, 3600]
+    assert adaptive.interval_of("uid-1") == 3600
+    assert adaptive.interval_of("uid-2") == 600
+
+
+def test_drift_resets_to_the_minimum(adaptive):
+    adaptive.adapt("uid-1", True)
+    assert adaptive.adapt("uid-1", False) == 60
+    assert adaptive.adapt("uid-1", None) == 60
+    assert adaptive.adapt("uid-1", True) == 120
+
+
+def test_fixed_interval_without_adaptation(scheduler):
+    assert scheduler.adapt("uid-1", True) == 600
+    assert scheduler.adapt("uid-1", False) == 600
+
+
+def test_next_tick_follows_the_adapted_interval(adaptive):
+    adaptive.adapt("uid-1", False)
+    now = 1_800_000_000.0
+    assert now < adaptive.next_tick("uid-1", now) <= now + 60
+
+
+async def test_interval_changes_are_written_to_status(adaptive, monkeypatch):
+    cr = FakeCR("model")
+    monkeypatch.setattr(kr8s.asyncio, "get", fake_get(cr))
+    monkeypatch.setattr(adaptive, "next_tick", lambda uid, now: now)
+    stopped = Stopped()
+
+    async def reconcile():
+        stopped.event.set()
+        return False
+
+    await asyncio.wait_for(adaptive.run("litellm_model", "uid-1", stopped, reconcile, resource="LiteLLMModel.ops.veitosiander.de",
+                                        name="model", namespace="default"), 1)
+
+    status = cr.patch.await_args.args[0]["status"]
+    assert (status["reconcile_interval"], status["in_sync"]) == (60, False)
+    # The loop forgets the resource once its daemon stops
+    assert adaptive.interval_of("uid-1") == 600